@@ -80,6 +80,7 @@ INSTALLED_APPS = [
     # Local
     "store_project.cardio.apps.CardioConfig",
     "store_project.exercises.apps.ExercisesConfig",
+    "store_project.meals.apps.MealsConfig",
     "store_project.notifications.apps.NotificationsConfig",
     "store_project.pages.apps.PagesConfig",
     "store_project.payments.apps.PaymentsConfig",
@@ -256,6 +257,8 @@ STRIPE_PUBLISHABLE_KEY = os.environ.get(
     "STRIPE_PUBLISHABLE_KEY", "stripenotgoingtowork"
 )
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY", "stripenotsosecretsecret")
+STRIPE_CACHE_TIMEOUT = 86400  # one day
+STRIPE_SLOW_CALL_MS = int(os.environ.get("STRIPE_SLOW_CALL_MS", 1000))
 
 # Cache
 
@@ -3,11 +3,10 @@ import os
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap
 from django.urls import path, include
 from django.views.decorators.csrf import csrf_exempt
 
-from config.sitemaps import StaticViewSitemap
+from config.sitemaps import index, sitemap, StaticViewSitemap
 from store_project.exercises.sitemaps import ExerciseSitemap
 from store_project.pages.sitemaps import PageSitemap
 from store_project.products.sitemaps import BookSitemap, ProgramSitemap
@@ -22,8 +21,9 @@ sitemaps = {
 }
 
 urlpatterns = [
+    path("sitemap.xml", index, {"sitemaps": sitemaps}, name="sitemap_index"),
     path(
-        "sitemap.xml",
+        "sitemap-<section>.xml",
         sitemap,
         {"sitemaps": sitemaps},
         name="django.contrib.sitemaps.views.sitemap",
@@ -5,3 +5,9 @@ from django.utils.translation import gettext_lazy as _
 class ExercisesConfig(AppConfig):
     name = "store_project.exercises"
     verbose_name = _("Exercises")
+
+    def ready(self):
+        from store_project.exercises import graph, search
+
+        graph.connect_signals()
+        search.connect_signals()
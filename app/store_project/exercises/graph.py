@@ -0,0 +1,157 @@
+"""
+The exercise substitution graph.
+
+Every Alternative is an edge from its original exercise to its alternate.
+Following edges for more than one hop finds replacements that aren't linked
+directly, e.g. an alternative to an alternative.
+
+The edges and each exercise's categories are kept as one entry in the default
+cache, under the graph's current version. Signal receivers below set a new
+version once a change to an Alternative, an exercise's categories or a
+Category is committed, and the next `get_graph()` loads the graph again.
+Entries of old versions are never read again and simply expire. Each process
+keeps its own adjacency lists built from the cached entry, and rebuilds them
+when the version changes.
+"""
+
+from collections import defaultdict
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from store_project.exercises.models import Alternative, Category, Exercise
+
+
+GRAPH_KEY = "exercises:graph"
+GRAPH_VERSION_KEY = "exercises:graph:version"
+MAX_HOPS = 4
+
+
+class SubstitutionGraph:
+    def __init__(self, alternatives: dict, categories: dict):
+        """
+        `alternatives` maps Alternative IDs to (original, alternate, problem)
+        and `categories` maps exercise IDs to sets of Category IDs, all IDs as
+        strings.
+        """
+        self.categories = categories
+        self.adjacency = defaultdict(list)
+        for original, alternate, problem in alternatives.values():
+            self.adjacency[original].append((alternate, problem.lower()))
+
+    def within(self, exercise_id, hops=1, category_id=None, exclude_problem=""):
+        """
+        Exercises that can replace `exercise_id` in at most `hops` steps, as
+        (exercise ID, hops) pairs, nearest first.
+
+        Only exercises in `category_id` are returned, though the search may
+        pass through other categories. Substitutions whose problem mentions
+        `exclude_problem` are not followed.
+        """
+        exercise_id = str(exercise_id)
+        exclude_problem = exclude_problem.lower()
+        distances = {exercise_id: 0}
+        frontier = [exercise_id]
+        for distance in range(1, hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for alternate, problem in self.adjacency.get(node, ()):
+                    if alternate in distances:
+                        continue
+                    if exclude_problem and exclude_problem in problem:
+                        continue
+                    distances[alternate] = distance
+                    next_frontier.append(alternate)
+            frontier = next_frontier
+
+        del distances[exercise_id]
+        if category_id:
+            category_id = str(category_id)
+            return [
+                (alternate, distance)
+                for alternate, distance in distances.items()
+                if category_id in self.categories.get(alternate, ())
+            ]
+        return list(distances.items())
+
+
+def _load_data() -> dict:
+    alternatives = {
+        str(pk): (str(original), str(alternate), problem)
+        for pk, original, alternate, problem in Alternative.objects.values_list(
+            "pk", "original_id", "alternate_id", "problem"
+        )
+    }
+    categories = defaultdict(set)
+    for exercise_id, category_id in Exercise.categories.through.objects.values_list(
+        "exercise_id", "category_id"
+    ):
+        categories[str(exercise_id)].add(str(category_id))
+    return {
+        "alternatives": alternatives,
+        "categories": dict(categories),
+    }
+
+
+def _data_key(version):
+    return f"{GRAPH_KEY}:{version}"
+
+
+_graph = None
+_graph_version = None
+
+
+def get_graph() -> SubstitutionGraph:
+    global _graph, _graph_version
+    version = cache.get_or_set(GRAPH_VERSION_KEY, uuid.uuid4().hex, None)
+    if _graph is None or version != _graph_version:
+        data = cache.get(_data_key(version))
+        if data is None:
+            data = _load_data()
+            cache.set(_data_key(version), data, settings.DEFAULT_CACHE_TIMEOUT)
+        _graph = SubstitutionGraph(data["alternatives"], data["categories"])
+        _graph_version = version
+    return _graph
+
+
+def invalidate_graph():
+    cache.set(GRAPH_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def graph_changed(sender, **kwargs):
+    """
+    Load the graph again once the change is committed, so that a change
+    that's rolled back never reaches the cache.
+    """
+    transaction.on_commit(invalidate_graph)
+
+
+def exercise_categories_changed(sender, action, **kwargs):
+    if action in {"post_add", "post_remove", "post_clear"}:
+        graph_changed(sender)
+
+
+def connect_signals():
+    from django.db.models.signals import m2m_changed, post_delete, post_save
+
+    post_save.connect(
+        graph_changed, sender=Alternative, dispatch_uid="graph_alternative_saved"
+    )
+    post_delete.connect(
+        graph_changed,
+        sender=Alternative,
+        dispatch_uid="graph_alternative_deleted",
+    )
+    m2m_changed.connect(
+        exercise_categories_changed,
+        sender=Exercise.categories.through,
+        dispatch_uid="graph_exercise_categories",
+    )
+    post_delete.connect(
+        graph_changed, sender=Exercise, dispatch_uid="graph_exercise_deleted"
+    )
+    post_delete.connect(
+        graph_changed, sender=Category, dispatch_uid="graph_category_deleted"
+    )
@@ -0,0 +1,67 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from store_project.exercises.graph import SubstitutionGraph
+
+
+PROBLEMS = ["", "knee pain", "low back pain", "shoulder pain", "no equipment"]
+
+
+class Command(BaseCommand):
+    help = "Times the exercise substitution graph on a random graph, in memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exercises", type=int, default=10_000)
+        parser.add_argument("--alternatives-per-exercise", type=int, default=5)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--queries", type=int, default=1_000)
+        parser.add_argument("--hops", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        exercises = [
+            str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(options["exercises"])
+        ]
+        category_ids = [str(n) for n in range(options["categories"])]
+        categories = {
+            exercise: {rng.choice(category_ids)} for exercise in exercises
+        }
+        alternatives = {}
+        for original in exercises:
+            for _ in range(options["alternatives_per_exercise"]):
+                alternatives[str(len(alternatives))] = (
+                    original,
+                    rng.choice(exercises),
+                    rng.choice(PROBLEMS),
+                )
+
+        start = time.perf_counter()
+        graph = SubstitutionGraph(alternatives, categories)
+        build_ms = (time.perf_counter() - start) * 1000
+        self.stdout.write(
+            f"Built graph of {len(exercises)} exercises and {len(alternatives)} "
+            f"alternatives in {build_ms:.1f}ms"
+        )
+
+        for label, kwargs in [
+            ("unfiltered", {}),
+            ("category", {"category_id": category_ids[0]}),
+            ("exclude problem", {"exclude_problem": "knee"}),
+        ]:
+            timings = []
+            for _ in range(options["queries"]):
+                exercise = rng.choice(exercises)
+                start = time.perf_counter()
+                graph.within(exercise, hops=options["hops"], **kwargs)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f"{label}, {options['hops']} hops: "
+                f"median {statistics.median(timings):.3f}ms, "
+                f"p95 {timings[int(len(timings) * 0.95)]:.3f}ms"
+            )
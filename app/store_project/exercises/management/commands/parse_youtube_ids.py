@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from store_project.exercises.models import Exercise
+from store_project.exercises.youtube import parse_video_id
+
+
+BATCH_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = "Stores the YouTube video IDs of every exercise's links"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        links = {
+            "demonstration": "demonstration_video_id",
+            "explanation": "explanation_video_id",
+        }
+        fields = list(links.values())
+        changed = []
+        unparsed = []
+        exercises = Exercise.objects.only(
+            "name", *links, *fields
+        ).order_by("name")
+        for exercise in exercises.iterator(chunk_size=options["batch_size"]):
+            ids = {}
+            for link, field in links.items():
+                url = getattr(exercise, link)
+                ids[field] = parse_video_id(url)
+                if url and not ids[field]:
+                    unparsed.append((exercise.name, link, url))
+            if any(getattr(exercise, field) != ids[field] for field in fields):
+                for field, video_id in ids.items():
+                    setattr(exercise, field, video_id)
+                changed.append(exercise)
+
+        # bulk_update skips save(), so `modified` and the search signals are
+        # left alone
+        Exercise.objects.bulk_update(changed, fields, batch_size=options["batch_size"])
+        self.stdout.write(f"Updated video IDs for {len(changed)} exercises.")
+
+        for name, link, url in unparsed:
+            self.stdout.write(
+                self.style.WARNING(f"Could not parse {link} link of {name}: {url}")
+            )
+        if unparsed:
+            self.stdout.write(f"{len(unparsed)} links could not be parsed.")
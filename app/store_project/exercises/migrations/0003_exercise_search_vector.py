@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 19:21
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import CharField, Value
+
+
+def fill_search_vectors(apps, schema_editor):
+    Exercise = apps.get_model("exercises", "Exercise")
+    for exercise in Exercise.objects.prefetch_related("categories"):
+        category_names = " ".join(c.name for c in exercise.categories.all())
+        Exercise.objects.filter(pk=exercise.pk).update(
+            search_vector=SearchVector(
+                Value(exercise.name, output_field=CharField()),
+                weight="A",
+                config="english",
+            )
+            + SearchVector(
+                Value(category_names, output_field=CharField()),
+                weight="B",
+                config="english",
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0002_auto_20201204_2000'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='exercises_e_search__10ae3d_gin'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2 on 2026-10-18 19:23
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0003_exercise_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='exercise_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
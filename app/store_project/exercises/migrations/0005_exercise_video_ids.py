@@ -0,0 +1,23 @@
+# Generated by Django 3.2 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0004_exercise_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='demonstration_video_id',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=11, verbose_name='Demonstration YouTube video ID'),
+        ),
+        migrations.AddField(
+            model_name='exercise',
+            name='explanation_video_id',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=11, verbose_name='Explanation YouTube video ID'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+from store_project.exercises.youtube import parse_video_id
+
+
+BATCH_SIZE = 200
+
+
+def parse_video_ids(apps, schema_editor):
+    """
+    Store the video IDs of existing exercises, whose videos would otherwise
+    be missing until they're next saved.
+    """
+    Exercise = apps.get_model("exercises", "Exercise")
+    fields = ["demonstration_video_id", "explanation_video_id"]
+    batch = []
+    exercises = Exercise.objects.only("pk", "demonstration", "explanation")
+    for exercise in exercises.iterator(chunk_size=BATCH_SIZE):
+        exercise.demonstration_video_id = parse_video_id(exercise.demonstration)
+        exercise.explanation_video_id = parse_video_id(exercise.explanation)
+        batch.append(exercise)
+        if len(batch) >= BATCH_SIZE:
+            Exercise.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Exercise.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exercises", "0005_exercise_video_ids"),
+    ]
+
+    operations = [
+        migrations.RunPython(parse_video_ids, migrations.RunPython.noop),
+    ]
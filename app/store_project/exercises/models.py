@@ -1,11 +1,14 @@
-import re
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+from store_project.exercises.youtube import parse_video_id, thumbnail_url
+
 
 class Alternative(models.Model):
     """An alternative exercise."""
@@ -74,11 +77,40 @@ class Exercise(models.Model):
     explanation = models.URLField(
         _("Explanation link"), max_length=200, default="", blank=True
     )
+    # Parsed from the links above on save
+    demonstration_video_id = models.CharField(
+        _("Demonstration YouTube video ID"),
+        max_length=11,
+        default="",
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    explanation_video_id = models.CharField(
+        _("Explanation YouTube video ID"),
+        max_length=11,
+        default="",
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
     categories = models.ManyToManyField(
         "Category",
         verbose_name=_("Exercise categories"),
         blank=True,
     )
+    # Kept up to date by store_project.exercises.search
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            GinIndex(
+                name="exercise_name_trgm",
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -86,38 +118,26 @@ class Exercise(models.Model):
     def get_absolute_url(self):
         return reverse("exercises:detail", kwargs={"slug": self.slug})
 
-    def get_yt_demo_id(self):
-        """Returns the 11-character video ID from a link of one of these styles:
-            - youtu.be/###########
-            - youtube.com/watch?v=###########
-            - youtube.com/watch?v=###########&list=...
-
-        Returns `None` if there is no demonstration URL in the database.
-        """
+    def save(self, *args, **kwargs):
+        self.demonstration_video_id = parse_video_id(self.demonstration)
+        self.explanation_video_id = parse_video_id(self.explanation)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "demonstration_video_id",
+                "explanation_video_id",
+            }
+        super().save(*args, **kwargs)
 
-        url = self.demonstration
-
-        if not url:
-            return None
-        m = re.search(r"\?v\=([a-zA-Z0-9\-\_]{11})", url)
-        if not m:
-            m = re.search(r"youtu.be/([a-zA-Z0-9\-\_]{11})", url)
-        return m.group(1)
+    def get_yt_demo_id(self):
+        """The YouTube video ID of the demonstration, or `None` if it has none."""
+        return self.demonstration_video_id or None
 
     def get_yt_explan_id(self):
-        """Returns the 11-character video ID from a link of one of these styles:
-            - youtu.be/###########
-            - youtube.com/watch?v=###########
-            - youtube.com/watch?v=###########&list=...
-
-        Returns `None` if there is no explanation URL in the database.
-        """
-
-        url = self.explanation
-
-        if not url:
-            return None
-        m = re.search(r"\?v\=([a-zA-Z0-9\-\_]{11})", url)
-        if not m:
-            m = re.search(r"youtu.be/([a-zA-Z0-9\-\_]{11})", url)
-        return m.group(1)
+        """The YouTube video ID of the explanation, or `None` if it has none."""
+        return self.explanation_video_id or None
+
+    @property
+    def demonstration_thumbnail_url(self):
+        return thumbnail_url(self.demonstration_video_id)
@@ -0,0 +1,239 @@
+"""
+Full-text search over exercises.
+
+Each Exercise stores its own `search_vector`, built from its name (weight A)
+and its category names (weight B), so searching is a GIN index lookup instead
+of running `to_tsvector` over the whole table. The signal receivers below keep
+the vector up to date when an exercise, its categories or a category's name
+change.
+
+Misspelled searches that full-text search can't match fall back to trigram
+similarity on the name, which has its own `gin_trgm_ops` index.
+
+Autocomplete is answered from a sorted list of exercise names held in memory
+by each process, and rebuilt once a saved or deleted exercise is committed.
+"""
+
+from bisect import bisect_left
+import re
+import uuid
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import CharField, F, Value
+
+from store_project.exercises.models import Category, Exercise
+
+
+SEARCH_CONFIG = "english"
+SEARCH_RESULTS_LIMIT = 50
+AUTOCOMPLETE_LIMIT = 10
+NAME_INDEX_VERSION_KEY = "exercises:name_index:version"
+
+
+def exercise_search_vector(name: str, category_names) -> SearchVector:
+    return SearchVector(
+        Value(name, output_field=CharField()), weight="A", config=SEARCH_CONFIG
+    ) + SearchVector(
+        Value(" ".join(category_names), output_field=CharField()),
+        weight="B",
+        config=SEARCH_CONFIG,
+    )
+
+
+def update_search_vectors(exercise_ids):
+    exercises = Exercise.objects.filter(pk__in=exercise_ids).prefetch_related(
+        "categories"
+    )
+    for exercise in exercises:
+        category_names = [category.name for category in exercise.categories.all()]
+        # A queryset update, so `modified` and post_save are not touched
+        Exercise.objects.filter(pk=exercise.pk).update(
+            search_vector=exercise_search_vector(exercise.name, category_names)
+        )
+
+
+def prefix_query(text: str):
+    """
+    Turn what has been typed so far into a query that matches the start of
+    every word, e.g. "bulg split sq" -> "bulg:* & split:* & sq:*".
+    Returns `None` if there is nothing to search for.
+    """
+    # Only letters and digits, so nothing typed can break the tsquery syntax
+    words = re.findall(r"[^\W_]+", text)
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def search_exercises(queryset, text: str):
+    """
+    The best matches for `text` in `queryset`, or the first exercises by name
+    if there is nothing to search for. At most SEARCH_RESULTS_LIMIT are
+    returned.
+
+    If no exercise contains every word, exercises with a name similar to
+    `text` are returned instead, so typos still find something.
+    """
+    queryset = queryset.defer("search_vector")
+    query = prefix_query(text)
+    if query is None:
+        return queryset.order_by("name")[:SEARCH_RESULTS_LIMIT]
+    results = list(
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "name")[:SEARCH_RESULTS_LIMIT]
+    )
+    if results:
+        return results
+    return list(
+        # The % operator (trigram_similar) is the one the trigram index serves
+        queryset.filter(name__trigram_similar=text)
+        .annotate(similarity=TrigramSimilarity("name", text))
+        .order_by("-similarity", "name")[:SEARCH_RESULTS_LIMIT]
+    )
+
+
+class _NameIndex:
+    """
+    Every exercise name, sorted once under each of its words, e.g. "Goblet
+    Squat" is stored as "goblet squat" and "squat". Typing the start of any
+    word is then a binary search.
+    """
+
+    def __init__(self, exercises):
+        self.entries = sorted(
+            (name.lower()[match.start():], name, slug)
+            for name, slug in exercises
+            for match in re.finditer(r"[^\W_]+", name)
+        )
+        self.keys = [key for key, name, slug in self.entries]
+
+    def matches(self, prefix: str, limit: int):
+        prefix = prefix.lower()
+        results = []
+        seen = set()
+        for i in range(bisect_left(self.keys, prefix), len(self.entries)):
+            key, name, slug = self.entries[i]
+            if not key.startswith(prefix) or len(results) >= limit:
+                break
+            if slug not in seen:
+                seen.add(slug)
+                results.append({"name": name, "slug": slug})
+        return results
+
+
+_name_index = None
+_name_index_version = None
+
+
+def get_name_index() -> _NameIndex:
+    global _name_index, _name_index_version
+    # A random token rather than a counter, so a flushed cache can't hand out
+    # a version number this process has already seen
+    version = cache.get_or_set(
+        NAME_INDEX_VERSION_KEY, lambda: uuid.uuid4().hex, None
+    )
+    if _name_index is None or _name_index_version != version:
+        _name_index = _NameIndex(Exercise.objects.values_list("name", "slug"))
+        _name_index_version = version
+    return _name_index
+
+
+def invalidate_name_index():
+    # Every process rebuilds its own copy when it next sees the new version
+    cache.set(NAME_INDEX_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def autocomplete(text: str, limit: int = AUTOCOMPLETE_LIMIT):
+    """
+    Up to `limit` exercises with a word in their name starting with `text`,
+    as {"name", "slug"} dicts in alphabetical order of the matched word.
+    """
+    text = " ".join(text.split())
+    if not text:
+        return []
+    return get_name_index().matches(text, limit)
+
+
+def exercise_saved(sender, instance, **kwargs):
+    update_search_vectors([instance.pk])
+    # After commit, so no process rebuilds the index from the old names
+    # under the new version
+    transaction.on_commit(invalidate_name_index)
+
+
+def exercise_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_name_index)
+
+
+def exercise_categories_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            update_search_vectors([instance.pk])
+        return
+
+    # Changed from the Category side, `instance` is a Category
+    if action == "pre_clear":
+        instance._search_exercise_ids = list(
+            instance.exercise_set.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        update_search_vectors(getattr(instance, "_search_exercise_ids", []))
+    elif action in {"post_add", "post_remove"}:
+        update_search_vectors(pk_set)
+
+
+def category_saved(sender, instance, created, **kwargs):
+    if not created:
+        update_search_vectors(instance.exercise_set.values_list("pk", flat=True))
+
+
+def category_deleting(sender, instance, **kwargs):
+    instance._search_exercise_ids = list(
+        instance.exercise_set.values_list("pk", flat=True)
+    )
+
+
+def category_deleted(sender, instance, **kwargs):
+    update_search_vectors(getattr(instance, "_search_exercise_ids", []))
+
+
+def connect_signals():
+    from django.db.models.signals import (
+        m2m_changed,
+        post_delete,
+        post_save,
+        pre_delete,
+    )
+
+    post_save.connect(
+        exercise_saved, sender=Exercise, dispatch_uid="search_exercise_saved"
+    )
+    post_delete.connect(
+        exercise_deleted, sender=Exercise, dispatch_uid="search_exercise_deleted"
+    )
+    m2m_changed.connect(
+        exercise_categories_changed,
+        sender=Exercise.categories.through,
+        dispatch_uid="search_exercise_categories",
+    )
+    post_save.connect(
+        category_saved, sender=Category, dispatch_uid="search_category_saved"
+    )
+    pre_delete.connect(
+        category_deleting, sender=Category, dispatch_uid="search_category_deleting"
+    )
+    post_delete.connect(
+        category_deleted, sender=Category, dispatch_uid="search_category_deleted"
+    )
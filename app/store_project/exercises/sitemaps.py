@@ -8,7 +8,7 @@ class ExerciseSitemap(Sitemap):
     changefreq = "weekly"
 
     def items(self):
-        return Exercise.objects.all()
+        return Exercise.objects.order_by("slug").only("slug", "modified")
 
     def lastmod(self, obj):
         return obj.modified
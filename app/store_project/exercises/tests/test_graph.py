@@ -0,0 +1,105 @@
+from io import StringIO
+
+import pytest
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client
+
+from store_project.exercises.factories import (
+    AlternativeFactory,
+    CategoryFactory,
+    ExerciseFactory,
+)
+from store_project.exercises.graph import get_graph, SubstitutionGraph
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_within_hops():
+    graph = SubstitutionGraph(
+        {
+            "1": ("a", "b", ""),
+            "2": ("b", "c", "Knee pain"),
+            "3": ("c", "d", ""),
+            "4": ("c", "a", ""),
+        },
+        {"c": {"x"}, "d": {"x"}},
+    )
+
+    assert graph.within("a") == [("b", 1)]
+    assert graph.within("a", hops=3) == [("b", 1), ("c", 2), ("d", 3)]
+    assert graph.within("a", hops=3, category_id="x") == [("c", 2), ("d", 3)]
+    assert graph.within("a", hops=3, exclude_problem="knee") == [("b", 1)]
+
+
+def test_graph_reloads_after_commit(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    squat, split_squat, lunge = ExerciseFactory.create_batch(3)
+    AlternativeFactory(original=squat, alternate=split_squat)
+    assert get_graph().within(squat.pk, hops=2) == [(str(split_squat.pk), 1)]
+    with django_assert_num_queries(0):
+        get_graph()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second = AlternativeFactory(original=split_squat, alternate=lunge)
+        category = CategoryFactory()
+        lunge.categories.add(category)
+    assert get_graph().within(squat.pk, hops=2, category_id=category.pk) == [
+        (str(lunge.pk), 2)
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert get_graph().within(squat.pk, hops=2) == [(str(split_squat.pk), 1)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        category.delete()
+    assert get_graph().categories.get(str(lunge.pk), set()) == set()
+
+
+def test_uncommitted_changes_keep_the_graph(django_capture_on_commit_callbacks):
+    squat, split_squat = ExerciseFactory.create_batch(2)
+    assert get_graph().within(squat.pk) == []
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        AlternativeFactory(original=squat, alternate=split_squat)
+
+    # Until the transaction commits, nothing else should see the new edge
+    assert callbacks
+    assert get_graph().within(squat.pk) == []
+
+
+def test_alternatives_view():
+    squat, split_squat, lunge = ExerciseFactory.create_batch(3)
+    AlternativeFactory(original=squat, alternate=split_squat, problem="")
+    AlternativeFactory(original=split_squat, alternate=lunge, problem="Knee pain")
+
+    url = f"/exercises/{squat.slug}/alternatives/"
+    response = Client().get(url, {"hops": 2})
+    assert [r["name"] for r in response.json()["results"]] == [
+        split_squat.name,
+        lunge.name,
+    ]
+    assert response.json()["results"][1] == {
+        "name": lunge.name,
+        "url": lunge.get_absolute_url(),
+        "hops": 2,
+    }
+
+    response = Client().get(url, {"hops": 2, "exclude": "knee"})
+    assert len(response.json()["results"]) == 1
+
+
+def test_benchmark_command():
+    out = StringIO()
+    call_command("benchmark_exercise_graph", exercises=100, queries=10, stdout=out)
+    assert "Built graph of 100 exercises" in out.getvalue()
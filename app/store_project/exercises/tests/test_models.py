@@ -1,5 +1,11 @@
+import importlib
+from io import StringIO
+
 import pytest
 
+from django.apps import apps
+from django.core.management import call_command
+
 from store_project.exercises.models import Category, Exercise
 from store_project.exercises.factories import (
     AlternativeFactory,
@@ -28,6 +34,49 @@ def test_exercise_ytexplanid(explanation):
     assert exercise.get_yt_explan_id() == "rTLSGke1AuA"
 
 
+def test_exercise_unparseable_link():
+    exercise = ExerciseFactory(demonstration="https://vimeo.com/123456", explanation="")
+    assert exercise.get_yt_demo_id() is None
+    assert exercise.get_yt_explan_id() is None
+    assert exercise.demonstration_thumbnail_url == ""
+
+
+def test_exercise_thumbnail_url(exercise: Exercise):
+    assert exercise.demonstration_thumbnail_url == (
+        "https://i.ytimg.com/vi/5DQgXXkNMOk/mqdefault.jpg"
+    )
+
+
+def test_parse_youtube_ids_command():
+    exercise = ExerciseFactory(demonstration="https://vimeo.com/123456")
+    Exercise.objects.filter(pk=exercise.pk).update(
+        demonstration_video_id="", explanation_video_id=""
+    )
+    out = StringIO()
+
+    call_command("parse_youtube_ids", stdout=out)
+
+    exercise.refresh_from_db()
+    assert exercise.explanation_video_id == "7NCF7hS3CCE"
+    assert "Updated video IDs for 1 exercises." in out.getvalue()
+    assert "https://vimeo.com/123456" in out.getvalue()
+
+
+def test_parse_video_ids_migration(exercise: Exercise):
+    migration = importlib.import_module(
+        "store_project.exercises.migrations.0006_parse_video_ids"
+    )
+    Exercise.objects.filter(pk=exercise.pk).update(
+        demonstration_video_id="", explanation_video_id=""
+    )
+
+    migration.parse_video_ids(apps, None)
+
+    exercise.refresh_from_db()
+    assert exercise.demonstration_video_id == "5DQgXXkNMOk"
+    assert exercise.explanation_video_id == "7NCF7hS3CCE"
+
+
 def test_exercise_get_absolute_url(exercise: Exercise):
     assert exercise.get_absolute_url() == f"/exercises/{exercise.slug}/"
 
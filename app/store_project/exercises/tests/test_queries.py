@@ -0,0 +1,78 @@
+"""
+The exercise pages must run the same number of queries however many
+exercises, categories and alternatives there are.
+"""
+
+import pytest
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from store_project.exercises.factories import (
+    AlternativeFactory,
+    CategoryFactory,
+    ExerciseFactory,
+)
+from store_project.exercises.views import (
+    ExerciseDetailView,
+    ExerciseFilteredListView,
+    ExerciseListView,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def count_queries(view, rf: RequestFactory, path: str, **kwargs) -> int:
+    request = rf.get(path)
+    request.user = AnonymousUser()
+    with CaptureQueriesContext(connection) as queries:
+        response = view(request, **kwargs)
+        response.render()
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize("size", [1, 20])
+def test_list_view(rf: RequestFactory, size: int):
+    categories = CategoryFactory.create_batch(size)
+    ExerciseFactory.create_batch(size, categories=categories)
+
+    # Exercises, categories
+    assert count_queries(ExerciseListView.as_view(), rf, "/exercises/") == 2
+
+
+@pytest.mark.parametrize("size", [1, 20])
+def test_filtered_list_view(rf: RequestFactory, size: int):
+    categories = CategoryFactory.create_batch(size)
+    ExerciseFactory.create_batch(size, categories=categories)
+    slug = categories[0].slug
+
+    # Category, exercises, categories
+    assert (
+        count_queries(
+            ExerciseFilteredListView.as_view(),
+            rf,
+            f"/exercises/category/{slug}/",
+            category=slug,
+        )
+        == 3
+    )
+
+
+@pytest.mark.parametrize("size", [0, 1, 20])
+def test_detail_view(rf: RequestFactory, size: int):
+    exercise = ExerciseFactory()
+    AlternativeFactory.create_batch(size, original=exercise)
+
+    # Exercise, alternatives with their alternate exercises
+    assert (
+        count_queries(
+            ExerciseDetailView.as_view(),
+            rf,
+            f"/exercises/{exercise.slug}/",
+            slug=exercise.slug,
+        )
+        == 2
+    )
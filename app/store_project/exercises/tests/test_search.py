@@ -0,0 +1,125 @@
+import pytest
+
+from django.core.cache import cache
+from django.test import Client, RequestFactory
+
+from store_project.exercises.factories import CategoryFactory, ExerciseFactory
+from store_project.exercises.models import Category, Exercise
+from store_project.exercises.search import (
+    autocomplete,
+    prefix_query,
+    search_exercises,
+    SEARCH_RESULTS_LIMIT,
+)
+from store_project.exercises.views import search
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_prefix_query():
+    assert prefix_query("  ") is None
+    assert prefix_query("bulg split sq") == prefix_query("bulg, split & sq")
+
+
+def test_search_matches_prefix():
+    squat = ExerciseFactory(name="Goblet Squat")
+    ExerciseFactory(name="Push Up")
+
+    assert list(search_exercises(Exercise.objects.all(), "gob sq")) == [squat]
+
+
+def test_search_ranks_name_above_category(category: Category):
+    category.name = "Lunge"
+    category.save()
+    in_category = ExerciseFactory(name="Split Squat", categories=[category])
+    in_name = ExerciseFactory(name="Walking Lunge")
+
+    results = list(search_exercises(Exercise.objects.all(), "lunge"))
+
+    assert results == [in_name, in_category]
+
+
+def test_search_vector_follows_category_changes(exercise: Exercise):
+    category = CategoryFactory(name="Hinge")
+    qs = Exercise.objects.all()
+    assert list(search_exercises(qs, "hinge")) == []
+
+    exercise.categories.add(category)
+    assert list(search_exercises(qs, "hinge")) == [exercise]
+
+    category.name = "Deadlift"
+    category.save()
+    assert list(search_exercises(qs, "hinge")) == []
+    assert list(search_exercises(qs, "deadlift")) == [exercise]
+
+
+def test_search_falls_back_to_similar_names():
+    rdl = ExerciseFactory(name="Romanian Deadlift")
+    ExerciseFactory(name="Push Up")
+
+    results = search_exercises(Exercise.objects.all(), "romainian deadlift")
+
+    assert results == [rdl]
+
+
+def test_search_results_are_bounded():
+    ExerciseFactory.create_batch(SEARCH_RESULTS_LIMIT + 1)
+    assert len(search_exercises(Exercise.objects.all(), "")) == SEARCH_RESULTS_LIMIT
+
+
+def test_search_view(rf: RequestFactory):
+    ExerciseFactory(name="Goblet Squat")
+    request = rf.post("/exercises/search/", {"search": "gobl"})
+    request.user = None
+
+    response = search(request)
+
+    assert response.status_code == 200
+    assert "Goblet Squat" in response.content.decode()
+
+
+def test_autocomplete_matches_start_of_any_word(django_assert_num_queries):
+    ExerciseFactory(name="Goblet Squat")
+    ExerciseFactory(name="Split Squat")
+    ExerciseFactory(name="Push Up")
+
+    assert [m["name"] for m in autocomplete("squ")] == ["Goblet Squat", "Split Squat"]
+    assert [m["name"] for m in autocomplete("gob")] == ["Goblet Squat"]
+    assert autocomplete(" ") == []
+    with django_assert_num_queries(0):
+        assert len(autocomplete("s", limit=1)) == 1
+
+
+def test_autocomplete_rebuilt_after_save(
+    exercise: Exercise, django_capture_on_commit_callbacks
+):
+    assert autocomplete("renamed") == []
+    exercise.name = "Renamed Exercise"
+    with django_capture_on_commit_callbacks(execute=True):
+        exercise.save()
+    assert autocomplete("renamed")[0]["slug"] == exercise.slug
+
+
+def test_autocomplete_kept_until_commit(exercise: Exercise):
+    assert autocomplete("renamed") == []
+    # The test's transaction is never committed
+    exercise.name = "Renamed Exercise"
+    exercise.save()
+    assert autocomplete("renamed") == []
+
+
+def test_autocomplete_view():
+    exercise = ExerciseFactory(name="Goblet Squat")
+
+    response = Client().get("/exercises/autocomplete/", {"q": "gobl"})
+
+    assert response.json() == {
+        "results": [{"name": "Goblet Squat", "url": exercise.get_absolute_url()}]
+    }
@@ -1,6 +1,8 @@
 from django.urls import path
 
 from store_project.exercises.views import (
+    alternatives_view,
+    autocomplete_view,
     ExerciseDetailView,
     ExerciseFilteredListView,
     ExerciseListView,
@@ -16,5 +18,11 @@ urlpatterns = [
         name="filtered_list"
     ),
     path("search/", search, name="search"),
+    path("autocomplete/", autocomplete_view, name="autocomplete"),
     path("<str:slug>/", ExerciseDetailView.as_view(), name="detail"),
+    path(
+        "<str:slug>/alternatives/",
+        alternatives_view,
+        name="alternatives"
+    ),
 ]
@@ -1,23 +1,37 @@
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
-from django.views.decorators.http import require_http_methods
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_http_methods
 from django.views.generic import DetailView, ListView
 
+from store_project.exercises.graph import get_graph, MAX_HOPS
 from store_project.exercises.models import Alternative, Category, Exercise
+from store_project.exercises.search import autocomplete, search_exercises
+
+
+# The fields exercises/exercises.html shows for each exercise in a list
+LIST_FIELDS = ["name", "slug", "demonstration", "demonstration_video_id"]
 
 
 class ExerciseDetailView(DetailView):
     model = Exercise
+    queryset = Exercise.objects.defer("search_vector")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["yt_demo_id"] = self.object.get_yt_demo_id()
         context["yt_explan_id"] = self.object.get_yt_explan_id()
-        context["alternatives"] = Alternative.objects.filter(original=self.get_object())
+        context["alternatives"] = (
+            Alternative.objects.filter(original=self.object)
+            .select_related("alternate")
+            .only("problem", "alternate__name", "alternate__slug")
+        )
         return context
 
 
 class ExerciseListView(ListView):
     model = Exercise
+    queryset = Exercise.objects.only(*LIST_FIELDS)
     context_object_name = "exercises"
     ordering = "name"
     template_name = "exercises/index.html"
@@ -36,11 +50,10 @@ class ExerciseFilteredListView(ListView):
 
     def get_queryset(self):
         self.category = get_object_or_404(Category, slug=self.kwargs["category"])
-        return Exercise.objects.filter(categories=self.category)
+        return Exercise.objects.filter(categories=self.category).only(*LIST_FIELDS)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        self.category = get_object_or_404(Category, slug=self.kwargs["category"])
         context["category"] = self.category.name
         context["categories"] = Category.objects.all()
         return context
@@ -56,17 +69,63 @@ def search(request):
     else:
         exercises = Exercise.objects.all()
 
-    if len(search) == 0:
-        return render(
-            request,
-            "exercises/exercises.html",
-            {
-                "exercises": exercises.order_by("name"),
-            })
-
     return render(
         request,
         "exercises/exercises.html",
         {
-            "exercises": exercises.filter(name__search=search),
+            "exercises": search_exercises(exercises.only(*LIST_FIELDS), search),
         })
+
+
+@require_GET
+def autocomplete_view(request):
+    results = [
+        {
+            "name": match["name"],
+            "url": reverse("exercises:detail", kwargs={"slug": match["slug"]}),
+        }
+        for match in autocomplete(request.GET.get("q", ""))
+    ]
+    return JsonResponse({"results": results})
+
+
+@require_GET
+def alternatives_view(request, slug):
+    """
+    Replacements for an exercise within `hops` substitutions, optionally only
+    in one `category` (a slug) and skipping substitutions for an `exclude`d
+    problem.
+    """
+    exercise = get_object_or_404(Exercise.objects.only("pk"), slug=slug)
+    try:
+        hops = min(max(int(request.GET.get("hops", 2)), 1), MAX_HOPS)
+    except ValueError:
+        hops = 2
+    category_id = None
+    if request.GET.get("category"):
+        category_id = get_object_or_404(
+            Category.objects.only("pk"), slug=request.GET["category"]
+        ).pk
+
+    found = get_graph().within(
+        exercise.pk,
+        hops=hops,
+        category_id=category_id,
+        exclude_problem=request.GET.get("exclude", ""),
+    )
+    exercises = {
+        str(pk): (name, exercise_slug)
+        for pk, name, exercise_slug in Exercise.objects.filter(
+            pk__in=[pk for pk, distance in found]
+        ).values_list("pk", "name", "slug")
+    }
+    results = [
+        {
+            "name": exercises[pk][0],
+            "url": reverse("exercises:detail", kwargs={"slug": exercises[pk][1]}),
+            "hops": distance,
+        }
+        for pk, distance in found
+        if pk in exercises
+    ]
+    return JsonResponse({"results": results})
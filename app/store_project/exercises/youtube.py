@@ -0,0 +1,40 @@
+"""
+YouTube video IDs and thumbnails for exercise links.
+
+Links are parsed once when an Exercise is saved and the IDs are stored on the
+model, so pages only ever format strings.
+"""
+
+import re
+
+
+VIDEO_ID_PATTERNS = [
+    # youtube.com/watch?v=###########, with or without more parameters
+    re.compile(r"[?&]v=([a-zA-Z0-9\-_]{11})"),
+    # youtu.be/###########
+    re.compile(r"youtu\.be/([a-zA-Z0-9\-_]{11})"),
+    # youtube.com/embed/########### and youtube.com/shorts/###########
+    re.compile(r"youtube\.com/(?:embed|shorts)/([a-zA-Z0-9\-_]{11})"),
+]
+THUMBNAIL_URL = "https://i.ytimg.com/vi/{video_id}/{quality}.jpg"
+
+
+def parse_video_id(url: str) -> str:
+    """
+    The 11-character video ID in a YouTube link, or "" if there is none.
+    """
+    for pattern in VIDEO_ID_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return m.group(1)
+    return ""
+
+
+def thumbnail_url(video_id: str, quality: str = "mqdefault") -> str:
+    """
+    URL of a video's thumbnail image, or "" without a video. `quality` is one
+    of YouTube's thumbnail names, e.g. "default", "mqdefault", "hqdefault".
+    """
+    if not video_id:
+        return ""
+    return THUMBNAIL_URL.format(video_id=video_id, quality=quality)
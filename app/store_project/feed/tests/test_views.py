@@ -0,0 +1,85 @@
+import pytest
+
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import Client
+
+from store_project.products.factories import ProgramFactory
+from store_project.products.models import Category, Program
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_feed_queries_do_not_grow_with_items(django_assert_num_queries):
+    for program in ProgramFactory.create_batch(5):
+        program.categories.add(Category.objects.create(name=program.name[:30]))
+
+    Site.objects.clear_cache()
+    # The current Site, programs with authors and their categories
+    with django_assert_num_queries(3):
+        response = Client().get("/feed/products/")
+    assert response.status_code == 200
+
+
+def test_feed_is_cached(program: Program, django_assert_num_queries):
+    client = Client()
+    first = client.get("/feed/products/")
+    assert program.name in first.content.decode()
+
+    with django_assert_num_queries(0):
+        second = client.get("/feed/products/")
+    assert second.content == first.content
+
+
+def test_feed_conditional_get(program: Program, django_capture_on_commit_callbacks):
+    client = Client()
+    response = client.get("/feed/products/")
+    etag = response["ETag"]
+
+    assert client.get("/feed/products/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert not response.has_header("Last-Modified")
+
+    program.name = "Renamed Program"
+    with django_capture_on_commit_callbacks(execute=True):
+        program.save()
+
+    response = client.get("/feed/products/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert "Renamed Program" in response.content.decode()
+
+
+def test_unpublishing_changes_the_feed(
+    program: Program, django_capture_on_commit_callbacks
+):
+    client = Client()
+    etag = client.get("/feed/products/")["ETag"]
+
+    program.status = Program.DRAFT
+    with django_capture_on_commit_callbacks(execute=True):
+        program.save()
+
+    response = client.get("/feed/products/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert program.name not in response.content.decode()
+
+
+def test_author_rename_changes_the_feed(
+    program: Program, django_capture_on_commit_callbacks
+):
+    client = Client()
+    etag = client.get("/feed/products/")["ETag"]
+    author = program.author
+    author.name = "Renamed Author"
+    with django_capture_on_commit_callbacks(execute=True):
+        author.save()
+
+    response = client.get("/feed/products/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert "Renamed Author" in response.content.decode()
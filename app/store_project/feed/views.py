@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.contrib.syndication.views import Feed
-from django.urls import reverse
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.utils.translation import gettext_lazy as _
 
 from store_project.products.models import Program
+from store_project.products.storefront import storefront_version
 
 
 class LatestProductsFeed(Feed):
@@ -10,8 +15,40 @@ class LatestProductsFeed(Feed):
     link = "/"
     description = _("Updates on changes and additions to Mastering Fitness.")
 
+    def __call__(self, request, *args, **kwargs):
+        """
+        Serve the rendered feed from the cache. It is stored under the
+        storefront version, which changes whenever a Program or its author
+        does, and that version is also the ETag, so polling an unchanged feed
+        answers 304 without touching the database.
+
+        There's no Last-Modified: the newest Program's time doesn't move when
+        one is unpublished or deleted, so it would answer 304 for a feed that
+        has changed.
+        """
+        version = storefront_version()
+        key = f"feed:{version}:products:{request.build_absolute_uri()}"
+        cached = cache.get(key)
+        if cached is None:
+            response = super().__call__(request, *args, **kwargs)
+            cached = (response.content, response["Content-Type"])
+            cache.set(key, cached, settings.DEFAULT_CACHE_TIMEOUT)
+        content, content_type = cached
+
+        etag = quote_etag(f"products-{version}")
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        response.headers["ETag"] = etag
+        return response
+
     def items(self):
-        return Program.objects.filter(status=Program.PUBLIC).order_by("-created")[:5]
+        return (
+            Program.objects.filter(status=Program.PUBLIC)
+            .select_related("author")
+            .prefetch_related("categories")
+            .order_by("-created")[:5]
+        )
 
     def item_title(self, item):
         """Title of the product."""
@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class MealsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'meals'
+    name = 'store_project.meals'
@@ -46,11 +46,12 @@ class MacroForm(forms.Form):
         (MUSCLE_GAIN, _("Muscle gain")),
     ]
 
-    height = forms.FloatField()
+    # Bounds wide enough for either unit
+    height = forms.FloatField(min_value=20, max_value=275)
     height_unit = forms.ChoiceField(choices=HEIGHT_UNIT_CHOICES)
-    weight = forms.FloatField()
+    weight = forms.FloatField(min_value=20, max_value=700)
     weight_unit = forms.ChoiceField(choices=WEIGHT_UNIT_CHOICES)
-    age = forms.IntegerField()
+    age = forms.IntegerField(min_value=13, max_value=120)
     sex = forms.ChoiceField(choices=SEX_CHOICES)
     activity_level = forms.ChoiceField(choices=ACTIVITY_LEVEL_CHOICES)
     goal = forms.ChoiceField(choices=GOAL_CHOICES)
@@ -1,8 +1,140 @@
-from decimal import Decimal
+"""
+Daily calorie and macronutrient targets.
+
+`calculate()` works out one client's targets, and `calculate_batch()` a
+whole roster's at once with NumPy. Both look units, sex, activity level and
+goal up in the tables below, keyed by MacroForm's choices.
+
+`cached_targets()` serves the JSON API, rounding clients' details to a
+Profile and caching the targets for each one.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import cache
 
 from store_project.meals.forms import MacroForm
 
 
+KG_PER_WEIGHT_UNIT = {
+    MacroForm.WEIGHT_METRIC: 1,
+    MacroForm.WEIGHT_IMPERIAL: 1 / 2.2046,
+}
+CM_PER_HEIGHT_UNIT = {
+    MacroForm.HEIGHT_METRIC: 1,
+    MacroForm.HEIGHT_IMPERIAL: 2.54,
+}
+# 1 gram of protein per pound of bodyweight or 2.2g/kg
+PROTEIN_PER_WEIGHT_UNIT = {
+    MacroForm.WEIGHT_METRIC: 2.2,
+    MacroForm.WEIGHT_IMPERIAL: 1.0,
+}
+SEX_KCALS = {
+    MacroForm.SEX_M: 5,
+    MacroForm.SEX_F: -161,
+}
+ACTIVITY_MULTIPLIERS = {
+    MacroForm.SEDENTARY: 1.1,
+    MacroForm.LOWACTIVE: 1.375,
+    MacroForm.ACTIVE: 1.65,
+    MacroForm.HIGHACTIVE: 1.9,
+}
+GOAL_KCALS = {
+    MacroForm.MAINTENANCE: 0,
+    MacroForm.FAT_LOSS: -500,
+    MacroForm.MUSCLE_GAIN: 500,
+}
+
+KCALS_PER_GRAM_PROTEIN = 4
+KCALS_PER_GRAM_CARBS = 4
+KCALS_PER_GRAM_FAT = 9
+
+# Bump to drop cached targets after changing the calculation
+CACHE_VERSION = 1
+
+
+class MacroResult(NamedTuple):
+    """Daily targets, in kcals and grams. Arrays from calculate_batch()."""
+
+    kcals: float
+    protein: float
+    fat: float
+    carbs: float
+
+
+def _lookup(table, key, name):
+    try:
+        return table[key]
+    except KeyError:
+        raise ValueError(f"Unknown {name}: {key!r}")
+
+
+def _macros(kcals, protein):
+    # One-third of calories from fat, and the remainder from carbs
+    fat = kcals / 3 / KCALS_PER_GRAM_FAT
+    carbs = (
+        kcals - protein * KCALS_PER_GRAM_PROTEIN - fat * KCALS_PER_GRAM_FAT
+    ) / KCALS_PER_GRAM_CARBS
+    return MacroResult(kcals, protein, fat, carbs)
+
+
+def calculate(
+    weight, weight_unit, height, height_unit, age, sex, activity_level, goal
+) -> MacroResult:
+    """Calories from the Mifflin-St. Jeor equation, and the macros of them."""
+    weight_kg = weight * _lookup(KG_PER_WEIGHT_UNIT, weight_unit, "weight unit")
+    height_cm = height * _lookup(CM_PER_HEIGHT_UNIT, height_unit, "height unit")
+    kcals = (10 * weight_kg) + (6.25 * height_cm) - (5 * age)
+    kcals += _lookup(SEX_KCALS, sex, "sex")
+    kcals *= _lookup(ACTIVITY_MULTIPLIERS, activity_level, "activity level")
+    kcals += _lookup(GOAL_KCALS, goal, "goal")
+    protein = weight * _lookup(PROTEIN_PER_WEIGHT_UNIT, weight_unit, "weight unit")
+    return _macros(kcals, protein)
+
+
+def _lookup_array(table, keys, name):
+    """`table`'s value for each of `keys`, as an array."""
+    keys = np.asarray(keys)
+    values = np.empty(keys.shape, dtype=float)
+    found = np.zeros(keys.shape, dtype=bool)
+    # The tables are tiny, so a pass per entry beats hashing every key
+    for key, value in table.items():
+        matches = keys == key
+        values[matches] = value
+        found |= matches
+    if not found.all():
+        _lookup(table, keys[~found][0].item(), name)
+    return values
+
+
+def calculate_batch(
+    weight, weight_unit, height, height_unit, age, sex, activity_level, goal
+) -> MacroResult:
+    """
+    calculate() for many clients at once. Each argument is a sequence or
+    array with one item per client, and the result holds arrays in the same
+    order.
+    """
+    weight = np.asarray(weight, dtype=float)
+    kcals = (
+        10 * weight * _lookup_array(KG_PER_WEIGHT_UNIT, weight_unit, "weight unit")
+        + 6.25
+        * np.asarray(height, dtype=float)
+        * _lookup_array(CM_PER_HEIGHT_UNIT, height_unit, "height unit")
+        - 5 * np.asarray(age, dtype=float)
+        + _lookup_array(SEX_KCALS, sex, "sex")
+    )
+    kcals *= _lookup_array(ACTIVITY_MULTIPLIERS, activity_level, "activity level")
+    kcals += _lookup_array(GOAL_KCALS, goal, "goal")
+    protein = weight * _lookup_array(
+        PROTEIN_PER_WEIGHT_UNIT, weight_unit, "weight unit"
+    )
+    return _macros(kcals, protein)
+
+
 class Macros:
     def __init__(
         self, weight, weight_unit, height, height_unit, age, sex, activity_level, goal
@@ -15,76 +147,105 @@ class Macros:
         self.sex = sex
         self.activity_level = activity_level
         self.goal = goal
+        self._result = None
+
+    @property
+    def result(self) -> MacroResult:
+        """Every target, calculated once."""
+        if self._result is None:
+            self._result = calculate(
+                self.weight,
+                self.weight_unit,
+                self.height,
+                self.height_unit,
+                self.age,
+                self.sex,
+                self.activity_level,
+                self.goal,
+            )
+        return self._result
 
     def kcals(self):
         """The Mifflin-St. Jeor equation"""
-
-        # base
-        if self.weight_unit == MacroForm.WEIGHT_METRIC:
-            weight_kg = self.weight
-        elif self.weight_unit == MacroForm.WEIGHT_IMPERIAL:
-            weight_kg = self.weight / 2.2046  # convert lbs to kg
-        else:
-            raise Exception("Could not find an appropriate weight unit")
-
-        if self.height_unit == MacroForm.HEIGHT_METRIC:
-            height_cm = self.height
-        elif self.height_unit == MacroForm.HEIGHT_IMPERIAL:
-            height_cm = self.height * 2.54  # convert in to cm
-        else:
-            raise Exception("Could not find a height unit")
-
-        kcals = (10 * weight_kg) + (6.25 * height_cm) - (5 * self.age)
-
-        # sex modification
-        if self.sex == MacroForm.SEX_M:
-            kcals += 5
-        elif self.sex == MacroForm.SEX_F:
-            kcals -= 161
-        else:
-            raise Exception("Could not find a hormonal sex")
-
-        # activity
-        if self.activity_level == MacroForm.SEDENTARY:
-            kcals *= 1.1
-        elif self.activity_level == MacroForm.LOWACTIVE:
-            kcals *= 1.375
-        elif self.activity_level == MacroForm.ACTIVE:
-            kcals *= 1.65
-        elif self.activity_level == MacroForm.HIGHACTIVE:
-            kcals *= 1.9
-        else:
-            raise Exception("Could not find an activity level")
-
-        # goal
-        if self.goal == MacroForm.MAINTENANCE:
-            pass
-        elif self.goal == MacroForm.FAT_LOSS:
-            kcals -= 500
-        elif self.goal == MacroForm.MUSCLE_GAIN:
-            kcals += 500
-        else:
-            raise Exception("Could not find a goal")
-
-        return kcals
+        return self.result.kcals
 
     def carbs(self):
         """Remainder of calories"""
-
-        carb_kcals = self.kcals() - (self.protein() * 4) - (self.fat() * 9)
-        return carb_kcals / 4  # 4 kcal/g of carb
+        return self.result.carbs
 
     def fat(self):
         """One-third of total calories"""
-
-        return self.kcals() / 3 / 9  # one-third of kcals, 9 kcal/g of fat
+        return self.result.fat
 
     def protein(self):
         """1 gram of protein per pound of bodyweight or 2.2g/kg"""
-
-        if self.weight_unit == MacroForm.WEIGHT_METRIC:
-            return self.weight * 2.2
-        elif self.weight_unit == MacroForm.WEIGHT_IMPERIAL:
-            return self.weight * 1.0
-        else:
-            raise Exception("Could not find a weight unit")
+        return self.result.protein
+
+
+class Profile(NamedTuple):
+    """A client's details in kg and cm, rounded so that near repeats match."""
+
+    weight: float
+    height: float
+    age: int
+    sex: str
+    activity_level: str
+    goal: str
+
+    @property
+    def cache_key(self):
+        return f"meals:macros:{CACHE_VERSION}:" + ":".join(str(value) for value in self)
+
+
+def normalize(
+    weight, weight_unit, height, height_unit, age, sex, activity_level, goal
+) -> Profile:
+    """
+    The Profile to calculate targets for. Weights are rounded to 0.1kg and
+    heights to 0.1cm, a few kcals a day at most.
+    """
+    weight_kg = weight * _lookup(KG_PER_WEIGHT_UNIT, weight_unit, "weight unit")
+    height_cm = height * _lookup(CM_PER_HEIGHT_UNIT, height_unit, "height unit")
+    for table, key, name in [
+        (SEX_KCALS, sex, "sex"),
+        (ACTIVITY_MULTIPLIERS, activity_level, "activity level"),
+        (GOAL_KCALS, goal, "goal"),
+    ]:
+        _lookup(table, key, name)
+    return Profile(
+        round(weight_kg, 1), round(height_cm, 1), int(age), sex, activity_level, goal
+    )
+
+
+def _rounded(result):
+    return {name: round(float(value)) for name, value in zip(result._fields, result)}
+
+
+def cached_targets(profiles):
+    """
+    Whole kcals and grams of each macro for each Profile, reusing those
+    already worked out. Misses are calculated together with
+    calculate_batch() and cached for DEFAULT_CACHE_TIMEOUT.
+    """
+    keys = {profile.cache_key: profile for profile in profiles}
+    targets = cache.get_many(list(keys))
+    missing = [profile for key, profile in keys.items() if key not in targets]
+    if missing:
+        weight, height, age, sex, activity_level, goal = zip(*missing)
+        batch = calculate_batch(
+            weight,
+            [MacroForm.WEIGHT_METRIC] * len(missing),
+            height,
+            [MacroForm.HEIGHT_METRIC] * len(missing),
+            age,
+            sex,
+            activity_level,
+            goal,
+        )
+        calculated = {
+            profile.cache_key: _rounded(MacroResult(*(values[i] for values in batch)))
+            for i, profile in enumerate(missing)
+        }
+        cache.set_many(calculated, settings.DEFAULT_CACHE_TIMEOUT)
+        targets.update(calculated)
+    return [targets[profile.cache_key] for profile in profiles]
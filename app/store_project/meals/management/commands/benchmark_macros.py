@@ -0,0 +1,62 @@
+import random
+import time
+
+import numpy as np
+
+from django.core.management.base import BaseCommand
+
+from store_project.meals.forms import MacroForm
+from store_project.meals.macros import calculate, calculate_batch
+
+
+def _choices(choices):
+    return [value for value, _ in choices]
+
+
+class Command(BaseCommand):
+    help = "Times the macro calculator for random clients, one at a time and in a batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        count = options["clients"]
+        clients = {
+            "weight": [rng.uniform(45, 140) for _ in range(count)],
+            "weight_unit": [
+                rng.choice(_choices(MacroForm.WEIGHT_UNIT_CHOICES)) for _ in range(count)
+            ],
+            "height": [rng.uniform(60, 200) for _ in range(count)],
+            "height_unit": [
+                rng.choice(_choices(MacroForm.HEIGHT_UNIT_CHOICES)) for _ in range(count)
+            ],
+            "age": [rng.randint(16, 80) for _ in range(count)],
+            "sex": [rng.choice(_choices(MacroForm.SEX_CHOICES)) for _ in range(count)],
+            "activity_level": [
+                rng.choice(_choices(MacroForm.ACTIVITY_LEVEL_CHOICES))
+                for _ in range(count)
+            ],
+            "goal": [rng.choice(_choices(MacroForm.GOAL_CHOICES)) for _ in range(count)],
+        }
+
+        start = time.perf_counter()
+        for values in zip(*clients.values()):
+            calculate(*values)
+        scalar_s = time.perf_counter() - start
+        self.stdout.write(
+            f"calculate(): {count} clients in {scalar_s * 1000:.1f}ms, "
+            f"{count / scalar_s:,.0f} clients/s"
+        )
+
+        arrays = {name: np.asarray(values) for name, values in clients.items()}
+        for label, batch in [("lists", clients), ("arrays", arrays)]:
+            start = time.perf_counter()
+            calculate_batch(**batch)
+            batch_s = time.perf_counter() - start
+            self.stdout.write(
+                f"calculate_batch() of {label}: {count} clients in "
+                f"{batch_s * 1000:.1f}ms, {count / batch_s:,.0f} clients/s, "
+                f"{scalar_s / batch_s:.1f}x faster"
+            )
@@ -0,0 +1,91 @@
+import io
+
+import numpy as np
+import pytest
+
+from django.core.management import call_command
+
+from store_project.meals.macros import Macros, calculate, calculate_batch
+
+
+CLIENTS = [
+    # weight, weight_unit, height, height_unit, age, sex, activity_level, goal
+    (80, "kg", 180, "cm", 30, "M", "mid", "keep"),
+    (176, "lbs", 70, "in", 30, "M", "mid", "keep"),
+    (60, "kg", 165, "cm", 45, "F", "sed", "lose"),
+    (200, "lbs", 72, "in", 22, "M", "hi", "gain"),
+    (55.5, "kg", 158.5, "cm", 61, "F", "low", "keep"),
+]
+
+
+def test_calculate():
+    kcals, protein, fat, carbs = calculate(80, "kg", 180, "cm", 30, "M", "mid", "keep")
+
+    assert kcals == pytest.approx((800 + 1125 - 150 + 5) * 1.65)
+    assert protein == pytest.approx(176)
+    assert fat == pytest.approx(kcals / 27)
+    assert carbs == pytest.approx((kcals - 176 * 4 - fat * 9) / 4)
+
+
+def test_imperial_units():
+    metric = calculate(79.83, "kg", 177.8, "cm", 30, "M", "mid", "keep")
+    imperial = calculate(176, "lbs", 70, "in", 30, "M", "mid", "keep")
+
+    assert imperial.kcals == pytest.approx(metric.kcals, abs=0.1)
+    assert imperial.protein == 176
+
+
+def test_unknown_choice():
+    with pytest.raises(ValueError, match="Unknown activity level: 'couch'"):
+        calculate(80, "kg", 180, "cm", 30, "M", "couch", "keep")
+
+    with pytest.raises(ValueError, match="Unknown goal: 'bulk'"):
+        calculate_batch([80], ["kg"], [180], ["cm"], [30], ["M"], ["mid"], ["bulk"])
+
+
+def test_macros_calculates_once(monkeypatch):
+    macros = Macros(*CLIENTS[0])
+    calls = []
+    monkeypatch.setattr(
+        "store_project.meals.macros.calculate",
+        lambda *args: calls.append(args) or calculate(*args),
+    )
+
+    targets = [macros.kcals(), macros.protein(), macros.fat(), macros.carbs()]
+
+    assert len(calls) == 1
+    assert targets == list(calculate(*CLIENTS[0]))
+
+
+def test_calculate_batch_matches_calculate():
+    batch = calculate_batch(*zip(*CLIENTS))
+
+    for i, client in enumerate(CLIENTS):
+        scalar = calculate(*client)
+        for name in scalar._fields:
+            assert getattr(batch, name)[i] == pytest.approx(getattr(scalar, name))
+
+
+def test_calculate_batch_arrays():
+    batch = calculate_batch(
+        weight=np.array([80.0, 60.0]),
+        weight_unit=np.array(["kg", "kg"]),
+        height=np.array([180.0, 165.0]),
+        height_unit=np.array(["cm", "cm"]),
+        age=np.array([30, 45]),
+        sex=np.array(["M", "F"]),
+        activity_level=np.array(["mid", "sed"]),
+        goal=np.array(["keep", "lose"]),
+    )
+
+    assert batch.kcals.shape == (2,)
+    assert batch.kcals[1] == pytest.approx(calculate(*CLIENTS[2]).kcals)
+
+
+def test_benchmark_command():
+    out = io.StringIO()
+
+    call_command("benchmark_macros", "--clients", "100", stdout=out)
+
+    assert "calculate(): 100 clients" in out.getvalue()
+    assert "calculate_batch() of arrays: 100 clients" in out.getvalue()
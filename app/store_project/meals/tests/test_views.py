@@ -0,0 +1,140 @@
+import json
+
+import pytest
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client
+
+from store_project.meals import macros, views
+from store_project.meals.macros import calculate
+
+
+URL = "/meals/api/macros/"
+PROFILE = {
+    "weight": 80,
+    "weight_unit": "kg",
+    "height": 180,
+    "height_unit": "cm",
+    "age": 30,
+    "sex": "M",
+    "activity_level": "mid",
+    "goal": "keep",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def batch_sizes(monkeypatch):
+    """The number of profiles in each call to calculate_batch()."""
+    sizes = []
+    calculate_batch = macros.calculate_batch
+    monkeypatch.setattr(
+        macros,
+        "calculate_batch",
+        lambda *args: sizes.append(len(args[0])) or calculate_batch(*args),
+    )
+    return sizes
+
+
+def post(client, data):
+    return client.post(URL, json.dumps(data), content_type="application/json")
+
+
+def test_macros_api(client: Client):
+    response = client.get(URL, PROFILE)
+
+    assert response.status_code == 200
+    result = calculate(**PROFILE)._asdict()
+    assert response.json() == {name: round(value) for name, value in result.items()}
+
+
+def test_macros_api_errors(client: Client):
+    response = client.get(URL, {**PROFILE, "goal": "bulk"})
+
+    assert response.status_code == 400
+    assert response.json()["errors"]["goal"][0]["code"] == "invalid_choice"
+
+
+def test_macros_api_caches_normalized_profiles(client: Client, batch_sizes):
+    first = client.get(URL, PROFILE).json()
+    # The same client in pounds and inches
+    second = client.get(
+        URL,
+        {
+            **PROFILE,
+            "weight": 176.37,
+            "weight_unit": "lbs",
+            "height": 70.866,
+            "height_unit": "in",
+        },
+    ).json()
+
+    assert batch_sizes == [1]
+    assert first == second
+
+
+def test_macros_api_batch(client: Client, batch_sizes):
+    client.get(URL, PROFILE)
+    female = {**PROFILE, "sex": "F", "goal": "lose"}
+
+    response = post(
+        client, {"profiles": [PROFILE, female, {**PROFILE, "age": "old"}, female]}
+    )
+
+    results = response.json()["results"]
+    # Only the new profile is calculated
+    assert batch_sizes == [1, 1]
+    assert results[0] == client.get(URL, PROFILE).json()
+    assert results[1]["kcals"] == round(calculate(**female).kcals)
+    assert "age" in results[2]["errors"]
+    assert results[3] == results[1]
+
+
+def test_macros_api_bad_batch(client: Client):
+    assert post(client, {"profile": PROFILE}).status_code == 400
+    assert post(client, {"profiles": [1]}).status_code == 400
+    assert post(client, {"profiles": [PROFILE] * 1001}).status_code == 400
+    assert client.post(URL, "{", content_type="application/json").status_code == 400
+
+
+def test_macros_api_bounds(client: Client):
+    response = client.get(URL, {**PROFILE, "weight": 1e300, "age": 0})
+
+    assert response.status_code == 400
+    errors = response.json()["errors"]
+    assert errors["weight"][0]["code"] == "max_value"
+    assert errors["age"][0]["code"] == "min_value"
+
+
+def test_macros_api_targets_expire(client: Client, monkeypatch):
+    timeouts = []
+    set_many = cache.set_many
+    monkeypatch.setattr(
+        cache,
+        "set_many",
+        lambda data, timeout: timeouts.append(timeout) or set_many(data, timeout),
+    )
+
+    client.get(URL, PROFILE)
+
+    assert timeouts == [settings.DEFAULT_CACHE_TIMEOUT]
+
+
+def test_macros_api_throttle(client: Client, monkeypatch):
+    monkeypatch.setattr(views, "THROTTLE_PROFILES", 3)
+
+    assert post(client, {"profiles": [PROFILE] * 2}).status_code == 200
+    assert client.get(URL, PROFILE).status_code == 200
+    response = client.get(URL, PROFILE)
+    assert response.status_code == 429
+    assert 0 < int(response["Retry-After"]) <= views.THROTTLE_SECONDS
+    # Other clients have their own allowance
+    other = client.get(URL, PROFILE, HTTP_X_FORWARDED_FOR="10.0.0.1, 192.0.2.7")
+    assert other.status_code == 200
@@ -6,4 +6,5 @@ from store_project.meals import views
 app_name = "meals"
 urlpatterns = [
     path("macro-calculator/", views.macro_calculator, name="macro_calculator"),
+    path("api/macros/", views.macros_api, name="macros_api"),
 ]
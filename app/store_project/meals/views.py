@@ -1,8 +1,21 @@
+import json
+import time
+
 from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
 
 from store_project.meals.forms import MacroForm
-from store_project.meals.macros import Macros
+from store_project.meals.macros import Macros, cached_targets, normalize
+
+
+MAX_PROFILES = 1000
+# Profiles each client can look up in the API per THROTTLE_SECONDS
+THROTTLE_PROFILES = 5000
+THROTTLE_SECONDS = 60
 
 
 def macro_calculator(request):
@@ -33,3 +46,94 @@ def macro_calculator(request):
     }
 
     return render(request, "meals/macro_calculator.html", context)
+
+
+def _profile(data):
+    """A Profile from MacroForm's fields in `data`, or the form's errors."""
+    form = MacroForm(data)
+    if not form.is_valid():
+        return None, form.errors.get_json_data()
+    return normalize(**form.cleaned_data), None
+
+
+def _client_ip(request):
+    # Heroku's router and our nginx both append the address they saw
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+    if forwarded:
+        return forwarded.split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _throttled(request, count):
+    """
+    A 429 response if looking up `count` more profiles takes the client past
+    THROTTLE_PROFILES in the current window, otherwise None.
+    """
+    now = time.time()
+    window = int(now // THROTTLE_SECONDS)
+    key = f"meals:macros:throttle:{_client_ip(request)}:{window}"
+    cache.add(key, 0, THROTTLE_SECONDS)
+    try:
+        used = cache.incr(key, count)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(key, count, THROTTLE_SECONDS)
+        used = count
+    if used <= THROTTLE_PROFILES:
+        return None
+    retry_after = int((window + 1) * THROTTLE_SECONDS - now) + 1
+    return HttpResponse(
+        f"At most {THROTTLE_PROFILES} profiles per {THROTTLE_SECONDS} seconds",
+        status=429,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+# Changes nothing, so mobile clients can POST without a CSRF token
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def macros_api(request):
+    """
+    Daily requirements as JSON. A GET takes one client's details as
+    MacroForm's fields. A POST takes a JSON object whose `profiles` are a
+    list of up to MAX_PROFILES clients' details, and returns a result for
+    each in order, either its requirements or its `errors`.
+
+    Each client's lookups are throttled to THROTTLE_PROFILES profiles per
+    THROTTLE_SECONDS.
+    """
+    if request.method == "GET":
+        throttled = _throttled(request, 1)
+        if throttled:
+            return throttled
+        profile, errors = _profile(request.GET)
+        if errors:
+            return JsonResponse({"errors": errors}, status=400)
+        return JsonResponse(cached_targets([profile])[0])
+
+    try:
+        profiles = json.loads(request.body)["profiles"]
+    except (ValueError, KeyError, TypeError):
+        return HttpResponseBadRequest('Expected a JSON object with a "profiles" list')
+    if not isinstance(profiles, list) or not all(
+        isinstance(data, dict) for data in profiles
+    ):
+        return HttpResponseBadRequest('"profiles" should be a list of objects')
+    if len(profiles) > MAX_PROFILES:
+        return HttpResponseBadRequest(f"At most {MAX_PROFILES} profiles per request")
+    throttled = _throttled(request, len(profiles))
+    if throttled:
+        return throttled
+
+    results = [_profile(data) for data in profiles]
+    targets = iter(
+        cached_targets([profile for profile, errors in results if errors is None])
+    )
+    return JsonResponse(
+        {
+            "results": [
+                {"errors": errors} if errors else next(targets)
+                for profile, errors in results
+            ]
+        }
+    )
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+from markdownx.utils import markdownify
+
+
+BATCH_SIZE = 100
+
+
+def render_content(apps, schema_editor):
+    """
+    Fill content_html for existing pages, which would otherwise show an
+    empty body until they're next saved.
+    """
+    Page = apps.get_model("pages", "Page")
+    batch = []
+    for page in Page.objects.only("pk", "content").iterator(chunk_size=BATCH_SIZE):
+        page.content_html = markdownify(page.content)
+        batch.append(page)
+        if len(batch) >= BATCH_SIZE:
+            Page.objects.bulk_update(batch, ["content_html"])
+            batch = []
+    if batch:
+        Page.objects.bulk_update(batch, ["content_html"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "0003_rendered_markdown"),
+    ]
+
+    operations = [
+        migrations.RunPython(render_content, migrations.RunPython.noop),
+    ]
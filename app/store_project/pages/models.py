@@ -4,10 +4,12 @@ from django.db import models
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from django_lifecycle import BEFORE_CREATE, BEFORE_UPDATE, hook, LifecycleModelMixin
 from markdownx.models import MarkdownxField
+from markdownx.utils import markdownify
 
 
-class Page(models.Model):
+class Page(LifecycleModelMixin, models.Model):
     PUBLIC = "pb"
     PRIVATE = "pr"
     DRAFT = "dr"
@@ -25,6 +27,9 @@ class Page(models.Model):
         _("Page title"), max_length=settings.PRODUCT_NAME_MAX_LENGTH
     )
     content = MarkdownxField(_("Page content, in markdown"), default="")
+    content_html = models.TextField(
+        _("Page content, rendered to HTML"), default="", blank=True, editable=False
+    )
     slug = models.SlugField(
         _("Slug for page"),
         default="",
@@ -41,3 +46,20 @@ class Page(models.Model):
 
     def get_absolute_url(self):
         return reverse("pages:single", kwargs={"slug": self.slug})
+
+    def render_content(self):
+        self.content_html = markdownify(self.content)
+
+    def get_content_html(self):
+        """The stored HTML, or the Markdown rendered now if none is stored."""
+        if not self.content_html and self.content:
+            return markdownify(self.content)
+        return self.content_html
+
+    @hook(BEFORE_CREATE)
+    @hook(BEFORE_UPDATE, when="content", has_changed=True)
+    def update_content_html(self):
+        """
+        Render the Markdown once on save so the page view doesn't have to.
+        """
+        self.render_content()
@@ -8,4 +8,9 @@ class PageSitemap(Sitemap):
     priority = 0.5
 
     def items(self):
-        return Page.objects.filter(status=Page.PUBLIC)
+        return Page.objects.filter(status=Page.PUBLIC).order_by("slug").only(
+            "slug", "modified"
+        )
+
+    def lastmod(self, obj):
+        return obj.modified
@@ -1,5 +1,9 @@
+import importlib
+
 import pytest
 
+from django.apps import apps
+
 from store_project.pages.models import Page
 from store_project.pages.factories import PageFactory
 
@@ -12,3 +16,26 @@ def test_str(page: Page):
 
 def test_get_absolute_url(page: Page):
     assert page.get_absolute_url() == f"/{page.slug}/"
+
+
+def test_content_rendered_on_save(page: Page):
+    page.content = "## Subtitle"
+    page.save()
+    page.refresh_from_db()
+    assert page.content_html == "<h2>Subtitle</h2>"
+
+
+def test_unrendered_content_falls_back_to_markdown(page: Page):
+    Page.objects.filter(pk=page.pk).update(content="## Subtitle", content_html="")
+    page.refresh_from_db()
+    assert page.get_content_html() == "<h2>Subtitle</h2>"
+
+
+def test_render_markdown_migration(page: Page):
+    migration = importlib.import_module(
+        "store_project.pages.migrations.0004_render_markdown"
+    )
+    Page.objects.filter(pk=page.pk).update(content="## Subtitle", content_html="")
+    migration.render_content(apps, None)
+    page.refresh_from_db()
+    assert page.content_html == "<h2>Subtitle</h2>"
@@ -0,0 +1,81 @@
+import pytest
+
+from django.core.cache import cache
+from django.test import Client
+
+from store_project.exercises.factories import ExerciseFactory
+from store_project.products.models import Book
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_sitemap_index_lists_sections():
+    response = Client().get("/sitemap.xml")
+
+    assert response.status_code == 200
+    for section in ["books", "programs", "pages", "exercises", "static"]:
+        assert f"/sitemap-{section}.xml" in response.content.decode()
+
+
+def test_section_is_cached(django_assert_num_queries):
+    exercise = ExerciseFactory()
+    client = Client()
+    first = client.get("/sitemap-exercises.xml")
+    assert exercise.get_absolute_url() in first.content.decode()
+
+    # Only the fingerprint query
+    with django_assert_num_queries(1):
+        second = client.get("/sitemap-exercises.xml")
+    assert second.content == first.content
+
+
+def test_section_changes_with_items():
+    exercise = ExerciseFactory()
+    client = Client()
+    etag = client.get("/sitemap-exercises.xml")["ETag"]
+
+    exercise.delete()
+
+    response = client.get("/sitemap-exercises.xml")
+    assert response["ETag"] != etag
+    assert exercise.get_absolute_url() not in response.content.decode()
+
+
+def test_section_conditional_get(book: Book):
+    client = Client()
+    response = client.get("/sitemap-books.xml")
+    assert not response.has_header("Last-Modified")
+
+    etag = response["ETag"]
+
+    not_modified = client.get("/sitemap-books.xml", HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+
+    Book.objects.filter(pk=book.pk).update(status=Book.DRAFT)
+    modified = client.get("/sitemap-books.xml", HTTP_IF_NONE_MATCH=etag)
+    assert modified.status_code == 200
+    assert book.get_absolute_url() not in modified.content.decode()
+
+
+def test_if_modified_since_is_ignored(book: Book):
+    client = Client()
+    client.get("/sitemap-books.xml")
+
+    book.delete()
+
+    response = client.get(
+        "/sitemap-books.xml", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+    )
+    assert response.status_code == 200
+    assert book.get_absolute_url() not in response.content.decode()
+
+
+def test_unknown_section():
+    assert Client().get("/sitemap-nope.xml").status_code == 404
@@ -8,7 +8,6 @@ from django.views.decorators.http import require_GET
 from django.views.generic.base import TemplateView
 from django.views.generic.detail import DetailView
 
-from markdownx.utils import markdownify
 import requests
 
 from store_project.notifications.emails import send_contact_emails
@@ -27,7 +26,7 @@ class SinglePageView(DetailView):
 
     def get_context_data(self, **kwargs):
         context = super(SinglePageView, self).get_context_data(**kwargs)
-        context["content"] = markdownify(self.object.content)
+        context["content"] = self.object.get_content_html()
         return context
 
 
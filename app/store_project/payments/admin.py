@@ -1,3 +1,48 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils import timezone
+from django.utils.translation import ngettext
 
-# Register your models here.
+from store_project.payments.models import FulfilledCheckout, StripeEvent
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = [
+        "event_id",
+        "type",
+        "status",
+        "attempts",
+        "received",
+        "processed",
+        "processing_time",
+    ]
+    list_filter = ["status", "type"]
+    search_fields = ["event_id"]
+    readonly_fields = ["event_id", "type", "payload", "last_error"]
+    ordering = ["-received"]
+    actions = ["retry"]
+
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=StripeEvent.PROCESSED).update(
+            status=StripeEvent.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(
+            request,
+            ngettext(
+                f"{updated} event was queued to retry.",
+                f"{updated} events were queued to retry.",
+                updated,
+            ),
+            messages.SUCCESS,
+        )
+
+    retry.short_description = "Retry selected Stripe events"
+
+
+@admin.register(FulfilledCheckout)
+class FulfilledCheckoutAdmin(admin.ModelAdmin):
+    list_display = ["session_id", "fulfilled"]
+    search_fields = ["session_id"]
+    ordering = ["-fulfilled"]
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from store_project.payments import workers
+from store_project.payments.models import StripeEvent
+
+
+BATCH_SIZE = 50
+POLL_INTERVAL = 2  # seconds
+
+
+class Command(BaseCommand):
+    help = "Fulfills Stripe webhook events stored by the webhook view"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process pending events once and exit instead of polling forever.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            processed = workers.drain(
+                StripeEvent.objects.all(),
+                "received",
+                options["batch_size"],
+                StripeEvent.process,
+            )
+            if processed:
+                self.stdout.write(f"Processed {processed} Stripe events.")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from store_project.payments import stripe_client
+
+
+class Command(BaseCommand):
+    help = "Shows call counts, error rates and latency of Stripe API calls"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Clear the collected metrics after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        metrics = stripe_client.get_metrics()
+        if not metrics:
+            self.stdout.write("No Stripe calls recorded.")
+
+        for endpoint, m in metrics.items():
+            self.stdout.write(
+                f"{endpoint}: {m['count']} calls, {m['errors']} errors "
+                f"({m['error_rate']:.1%}), mean {m['mean_ms']:.0f}ms"
+            )
+            for bucket, count in m["histogram_ms"].items():
+                self.stdout.write(f"  <= {bucket}ms: {count}")
+
+        if options["reset"]:
+            stripe_client.reset_metrics()
+            self.stdout.write("Stripe metrics reset.")
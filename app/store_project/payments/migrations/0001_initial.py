@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-18 19:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripeEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=255, unique=True, verbose_name='Stripe Event ID')),
+                ('type', models.CharField(max_length=100, verbose_name='Stripe Event type')),
+                ('payload', models.JSONField(verbose_name='Stripe Event data')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('received', models.DateTimeField(auto_now_add=True, verbose_name='Time received')),
+                ('processed', models.DateTimeField(blank=True, null=True, verbose_name='Time processed')),
+                ('processing_time', models.DurationField(blank=True, null=True, verbose_name='Time spent fulfilling the event')),
+            ],
+            options={
+                'ordering': ['received'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stripeevent',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='payments_st_status_8d04fd_idx'),
+        ),
+    ]
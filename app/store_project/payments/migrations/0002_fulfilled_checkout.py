@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FulfilledCheckout',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_id', models.CharField(max_length=255, unique=True, verbose_name='Stripe Checkout Session ID')),
+                ('fulfilled', models.DateTimeField(auto_now_add=True, verbose_name='Time fulfilled')),
+            ],
+        ),
+    ]
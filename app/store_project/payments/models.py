@@ -1,3 +1,122 @@
-from django.db import models
+from datetime import timedelta
+import logging
+import time
 
-# Create your models here.
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+logger = logging.getLogger(__name__)
+
+
+class StripeEvent(models.Model):
+    """
+    A verified Stripe webhook event, stored so the webhook can acknowledge it
+    immediately. Events are fulfilled later by the `process_stripe_events`
+    management command.
+
+    Stripe delivers events at least once, so `event_id` is unique and repeat
+    deliveries of the same event are ignored.
+    """
+
+    PENDING = "pending"
+    PROCESSED = "processed"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (PROCESSED, "Processed"),
+        (FAILED, "Failed"),
+    ]
+
+    MAX_ATTEMPTS = 8
+    BACKOFF_SECONDS = 30
+    MAX_BACKOFF_SECONDS = 60 * 60
+
+    event_id = models.CharField(_("Stripe Event ID"), max_length=255, unique=True)
+    type = models.CharField(_("Stripe Event type"), max_length=100)
+    payload = models.JSONField(_("Stripe Event data"))
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    received = models.DateTimeField(_("Time received"), auto_now_add=True)
+    processed = models.DateTimeField(_("Time processed"), null=True, blank=True)
+    processing_time = models.DurationField(
+        _("Time spent fulfilling the event"), null=True, blank=True
+    )
+
+    class Meta:
+        ordering = ["received"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.type} {self.event_id} ({self.status})"
+
+    @property
+    def latency(self):
+        """Time from Stripe delivering the event until it was fulfilled."""
+        if self.processed is None:
+            return None
+        return self.processed - self.received
+
+    def process(self):
+        """
+        Fulfill this event. Errors are recorded on the event and it is
+        rescheduled with a backoff, just like Stripe would retry a failing
+        webhook.
+        """
+        from store_project.payments.utils import handle_stripe_event
+
+        self.attempts += 1
+        start = time.perf_counter()
+        try:
+            # A failed fulfillment is rolled back on its own, so the failure
+            # can still be recorded on this event.
+            with transaction.atomic():
+                handle_stripe_event(self.type, self.payload)
+        except Exception as e:
+            self.last_error = str(e)
+            if self.attempts >= self.MAX_ATTEMPTS:
+                self.status = self.FAILED
+                logger.error(f"Stripe event {self} gave up: {e}")
+            else:
+                backoff = min(
+                    self.BACKOFF_SECONDS * 2 ** (self.attempts - 1),
+                    self.MAX_BACKOFF_SECONDS,
+                )
+                self.next_attempt_at = timezone.now() + timedelta(seconds=backoff)
+                logger.warning(f"Stripe event {self} failed, retrying in {backoff}s: {e}")
+        else:
+            self.status = self.PROCESSED
+            self.last_error = ""
+            self.processed = timezone.now()
+            self.processing_time = timedelta(seconds=time.perf_counter() - start)
+            logger.info(f"Stripe event {self} processed in {self.latency}.")
+        self.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "last_error",
+                "next_attempt_at",
+                "processed",
+                "processing_time",
+            ]
+        )
+
+
+class FulfilledCheckout(models.Model):
+    """
+    A Stripe Checkout Session that has been fulfilled, so that another event
+    for the same session doesn't email the customer a second receipt.
+    """
+
+    session_id = models.CharField(
+        _("Stripe Checkout Session ID"), max_length=255, unique=True
+    )
+    fulfilled = models.DateTimeField(_("Time fulfilled"), auto_now_add=True)
+
+    def __str__(self):
+        return self.session_id
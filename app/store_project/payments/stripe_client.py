@@ -0,0 +1,143 @@
+"""
+The one place this project talks to the Stripe API.
+
+Use it like the `stripe` module itself::
+
+    from store_project.payments import stripe_client
+
+    stripe_client.Price.create(currency="usd", ...)
+    stripe_client.checkout.Session.create(...)
+
+Every call gets the secret key from settings and is timed. Call counts, error
+counts and a latency histogram are kept per Stripe resource and method in the
+default cache, so all web and worker processes report into the same numbers.
+Calls slower than `settings.STRIPE_SLOW_CALL_MS` are logged as warnings.
+
+Errors are not wrapped, so callers still catch `stripe.error.*`.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+import stripe
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, float("inf")]
+METRICS_KEY_PREFIX = "stripe:metrics"
+ENDPOINTS_KEY = f"{METRICS_KEY_PREFIX}:endpoints"
+METRICS_TIMEOUT = None  # keep until reset
+
+
+def _metric_key(endpoint: str, name: str) -> str:
+    return f"{METRICS_KEY_PREFIX}:{endpoint}:{name}"
+
+
+def _incr(key: str, delta: int = 1):
+    # add() is a no-op if the key exists, so concurrent processes can't
+    # reset each other's counters.
+    cache.add(key, 0, METRICS_TIMEOUT)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Key expired or was evicted between add() and incr()
+        cache.set(key, delta, METRICS_TIMEOUT)
+
+
+def _register_endpoint(endpoint: str):
+    endpoints = cache.get(ENDPOINTS_KEY, [])
+    if endpoint not in endpoints:
+        cache.set(ENDPOINTS_KEY, sorted([*endpoints, endpoint]), METRICS_TIMEOUT)
+
+
+def record_call(endpoint: str, duration_ms: float, error: bool = False):
+    """Add one Stripe API call to the metrics for `endpoint`."""
+    _register_endpoint(endpoint)
+    _incr(_metric_key(endpoint, "count"))
+    _incr(_metric_key(endpoint, "total_ms"), round(duration_ms))
+    if error:
+        _incr(_metric_key(endpoint, "errors"))
+    bucket = next(b for b in LATENCY_BUCKETS_MS if duration_ms <= b)
+    _incr(_metric_key(endpoint, f"le_{bucket}"))
+
+    if duration_ms > settings.STRIPE_SLOW_CALL_MS:
+        logger.warning(f"Slow Stripe call: {endpoint} took {duration_ms:.0f}ms")
+
+
+def get_metrics() -> dict:
+    """
+    Metrics for every Stripe endpoint called so far, keyed by endpoint name,
+    e.g. "Price.create".
+    """
+    metrics = {}
+    for endpoint in cache.get(ENDPOINTS_KEY, []):
+        names = ["count", "total_ms", "errors"] + [
+            f"le_{b}" for b in LATENCY_BUCKETS_MS
+        ]
+        values = cache.get_many([_metric_key(endpoint, name) for name in names])
+        value = {name: values.get(_metric_key(endpoint, name), 0) for name in names}
+        count = value["count"]
+        metrics[endpoint] = {
+            "count": count,
+            "errors": value["errors"],
+            "error_rate": value["errors"] / count if count else 0.0,
+            "mean_ms": value["total_ms"] / count if count else 0.0,
+            "histogram_ms": {
+                str(b): value[f"le_{b}"] for b in LATENCY_BUCKETS_MS
+            },
+        }
+    return metrics
+
+
+def reset_metrics():
+    keys = [ENDPOINTS_KEY]
+    for endpoint in cache.get(ENDPOINTS_KEY, []):
+        keys += [
+            _metric_key(endpoint, name)
+            for name in ["count", "total_ms", "errors"]
+            + [f"le_{b}" for b in LATENCY_BUCKETS_MS]
+        ]
+    cache.delete_many(keys)
+
+
+class _StripeProxy:
+    """Stands in for a part of the `stripe` module and times its API calls."""
+
+    def __init__(self, path):
+        self._path = path
+
+    def __getattr__(self, name):
+        target = stripe
+        for part in [*self._path, name]:
+            target = getattr(target, part)
+        if isinstance(target, type) or not callable(target):
+            # A resource class or namespace, e.g. `Price` or `checkout`
+            return _StripeProxy([*self._path, name])
+        return self._instrument(".".join([*self._path, name]), target)
+
+    @staticmethod
+    def _instrument(endpoint, method):
+        def call(*args, **kwargs):
+            kwargs.setdefault("api_key", settings.STRIPE_SECRET_KEY)
+            start = time.perf_counter()
+            error = False
+            try:
+                return method(*args, **kwargs)
+            except stripe.error.StripeError:
+                error = True
+                raise
+            finally:
+                record_call(endpoint, (time.perf_counter() - start) * 1000, error)
+
+        return call
+
+
+Customer = _StripeProxy(["Customer"])
+Price = _StripeProxy(["Price"])
+Product = _StripeProxy(["Product"])
+checkout = _StripeProxy(["checkout"])
@@ -0,0 +1,130 @@
+import smtplib
+from unittest import mock
+
+import pytest
+
+from django.core import mail
+from django.utils import timezone
+
+from store_project.payments.models import FulfilledCheckout, StripeEvent
+from store_project.products.entitlements import user_owns
+from store_project.products.models import Entitlement, Program
+from store_project.users.models import User
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _checkout_event(
+    user: User, program: Program, event_id="evt_123", session_id="cs_123"
+):
+    return StripeEvent.objects.create(
+        event_id=event_id,
+        type="checkout.session.completed",
+        payload={
+            "id": event_id,
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "id": session_id,
+                    "customer": user.stripe_customer_id,
+                    "amount_total": 1000,
+                    "metadata": {
+                        "product_name": program.name,
+                        "product_type": "program",
+                    },
+                },
+            },
+        },
+    )
+
+
+def test_stripe_event_process(
+    user: User, program: Program, django_capture_on_commit_callbacks
+):
+    user.stripe_customer_id = "cus_123"
+    user.save()
+    event = _checkout_event(user, program)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        event.process()
+
+    event.refresh_from_db()
+    user = User.objects.get(pk=user.pk)
+    assert event.status == StripeEvent.PROCESSED
+    assert event.attempts == 1
+    assert event.processing_time is not None
+    assert event.latency is not None
+    assert user_owns(user, program)
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+
+
+def test_checkout_session_is_fulfilled_once(
+    user: User, program: Program, django_capture_on_commit_callbacks
+):
+    user.stripe_customer_id = "cus_123"
+    user.save()
+    first = _checkout_event(user, program)
+    # Another event for the same checkout session
+    repeat = _checkout_event(user, program, event_id="evt_124")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.process()
+        repeat.process()
+
+    assert repeat.status == StripeEvent.PROCESSED
+    assert len(mail.outbox) == 1
+    assert FulfilledCheckout.objects.get().session_id == "cs_123"
+
+
+def test_stripe_event_process_ignores_unhandled_type():
+    event = StripeEvent.objects.create(
+        event_id="evt_456",
+        type="invoice.paid",
+        payload={"data": {"object": {}}},
+    )
+
+    event.process()
+
+    assert event.status == StripeEvent.PROCESSED
+
+
+def test_stripe_event_process_failure_is_retried(user: User, program: Program):
+    user.stripe_customer_id = "cus_123"
+    user.save()
+    event = _checkout_event(user, program)
+
+    with mock.patch.object(
+        Entitlement, "grant", side_effect=Exception("database down")
+    ):
+        event.process()
+
+    event.refresh_from_db()
+    assert event.status == StripeEvent.PENDING
+    assert event.next_attempt_at > timezone.now()
+    assert "database down" in event.last_error
+    # The checkout was rolled back with the failed fulfillment.
+    assert not FulfilledCheckout.objects.exists()
+
+
+def test_email_failure_keeps_the_order(
+    user: User, program: Program, django_capture_on_commit_callbacks
+):
+    user.stripe_customer_id = "cus_123"
+    user.save()
+    event = _checkout_event(user, program)
+
+    with mock.patch(
+        "store_project.payments.utils.order_confirmation_email",
+        side_effect=smtplib.SMTPException("email down"),
+    ), django_capture_on_commit_callbacks() as callbacks:
+        event.process()
+        # The email waits for the fulfillment to commit
+        assert not mail.outbox
+        for callback in callbacks:
+            callback()
+
+    event.refresh_from_db()
+    assert event.status == StripeEvent.PROCESSED
+    assert Entitlement.objects.filter(user=user, product_id=program.pk).exists()
@@ -0,0 +1,70 @@
+from unittest import mock
+
+import pytest
+
+from django.core.cache import cache
+from django.test import Client
+
+import stripe
+
+from store_project.payments import stripe_client
+from store_project.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_stripe_client_records_calls(settings):
+    with mock.patch("stripe.Price.create", return_value=mock.Mock(id="price_123")) as create:
+        price = stripe_client.Price.create(currency="usd")
+
+    assert price.id == "price_123"
+    create.assert_called_once_with(currency="usd", api_key=settings.STRIPE_SECRET_KEY)
+    metrics = stripe_client.get_metrics()["Price.create"]
+    assert metrics["count"] == 1
+    assert metrics["errors"] == 0
+    assert sum(metrics["histogram_ms"].values()) == 1
+
+
+def test_stripe_client_records_errors():
+    with mock.patch(
+        "stripe.checkout.Session.create", side_effect=stripe.error.APIConnectionError("down")
+    ):
+        with pytest.raises(stripe.error.APIConnectionError):
+            stripe_client.checkout.Session.create()
+
+    metrics = stripe_client.get_metrics()["checkout.Session.create"]
+    assert metrics["count"] == 1
+    assert metrics["errors"] == 1
+    assert metrics["error_rate"] == 1.0
+
+
+def test_stripe_client_warns_on_slow_calls(settings, caplog):
+    settings.STRIPE_SLOW_CALL_MS = 100
+    stripe_client.record_call("Customer.retrieve", 250)
+    assert "Slow Stripe call: Customer.retrieve took 250ms" in caplog.text
+    assert stripe_client.get_metrics()["Customer.retrieve"]["histogram_ms"]["250"] == 1
+
+
+def test_stripe_client_reset_metrics():
+    stripe_client.record_call("Customer.retrieve", 10)
+    stripe_client.reset_metrics()
+    assert stripe_client.get_metrics() == {}
+
+
+@pytest.mark.django_db
+def test_stripe_metrics_view(superuser: User, user: User):
+    stripe_client.record_call("Customer.retrieve", 10)
+    client = Client()
+
+    assert client.get("/payments/stripe-metrics/").status_code == 302
+    client.force_login(user)
+    assert client.get("/payments/stripe-metrics/").status_code == 302
+    client.force_login(superuser)
+    response = client.get("/payments/stripe-metrics/")
+    assert response.status_code == 200
+    assert response.json()["endpoints"]["Customer.retrieve"]["count"] == 1
@@ -43,3 +43,8 @@ def test_success():
 def test_webhook():
     assert reverse("payments:webhook") == "/payments/webhook/"
     assert resolve("/payments/webhook/").view_name == "payments:webhook"
+
+
+def test_stripe_metrics():
+    assert reverse("payments:stripe_metrics") == "/payments/stripe-metrics/"
+    assert resolve("/payments/stripe-metrics/").view_name == "payments:stripe_metrics"
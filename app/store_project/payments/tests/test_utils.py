@@ -1,7 +1,68 @@
+from unittest import mock
+
 import pytest
 
-from store_project.payments.utils import int_to_price
+from django.core.cache import cache
+
+from store_project.payments.utils import (
+    handle_stripe_event,
+    int_to_price,
+    stripe_cache_is_verified,
+    stripe_customer_get_or_create,
+    stripe_price_get_or_create,
+)
+from store_project.products.models import Program
+from store_project.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
 
 
 def test_int_to_price():
     assert int_to_price(1000) == "10.00"
+
+
+@pytest.mark.django_db
+def test_stripe_price_get_or_create_is_cached(program: Program):
+    program.stripe_price_id = "price_123"
+    with mock.patch(
+        "stripe.Price.retrieve", return_value=mock.Mock(id="price_123")
+    ) as price_retrieve, mock.patch("stripe.Product.retrieve") as product_retrieve:
+        assert stripe_price_get_or_create(program) == "price_123"
+        assert stripe_price_get_or_create(program) == "price_123"
+
+    price_retrieve.assert_called_once()
+    product_retrieve.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_stripe_price_invalidated_by_webhook(program: Program):
+    program.stripe_price_id = "price_123"
+    with mock.patch("stripe.Price.retrieve", return_value=mock.Mock(id="price_123")), mock.patch(
+        "stripe.Product.retrieve"
+    ):
+        stripe_price_get_or_create(program)
+
+    handle_stripe_event("price.updated", {"data": {"object": {"id": "price_123"}}})
+
+    assert not stripe_cache_is_verified("price", "price_123")
+    assert stripe_cache_is_verified("product", str(program.id))
+
+
+@pytest.mark.django_db
+def test_stripe_customer_get_or_create_is_cached(user: User):
+    user.stripe_customer_id = "cus_123"
+    with mock.patch(
+        "stripe.Customer.retrieve", return_value=mock.Mock(id="cus_123")
+    ) as customer_retrieve:
+        assert stripe_customer_get_or_create(user) == "cus_123"
+        assert stripe_customer_get_or_create(user) == "cus_123"
+
+    customer_retrieve.assert_called_once()
+
+    handle_stripe_event("customer.deleted", {"data": {"object": {"id": "cus_123"}}})
+    assert not stripe_cache_is_verified("customer", "cus_123")
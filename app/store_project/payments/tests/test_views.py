@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from django.contrib.auth.models import AnonymousUser
@@ -5,7 +7,10 @@ from django.contrib.messages import get_messages
 from django.http import HttpResponseRedirect, JsonResponse
 from django.test import Client, RequestFactory
 
+import stripe
+
 from store_project.payments import views
+from store_project.payments.models import StripeEvent
 from store_project.products.models import Program
 from store_project.users.factories import UserFactory
 from store_project.users.models import User
@@ -45,3 +50,39 @@ def test_stripe_webhook_view(rf: RequestFactory):
     request = rf.get("/payments/webhook/")
     with pytest.raises(KeyError):
         views.stripe_webhook(request)
+
+
+def _checkout_event(event_id="evt_123", customer="cus_123", program_name="Test Program"):
+    return stripe.Event.construct_from(
+        {
+            "id": event_id,
+            "type": "checkout.session.completed",
+            "data": {
+                "object": {
+                    "customer": customer,
+                    "amount_total": 1000,
+                    "metadata": {
+                        "product_name": program_name,
+                        "product_type": "program",
+                    },
+                },
+            },
+        },
+        "sk_test",
+    )
+
+
+def test_stripe_webhook_view_stores_event(rf: RequestFactory):
+    request = rf.post("/payments/webhook/", data="{}", content_type="application/json")
+    request.META["HTTP_STRIPE_SIGNATURE"] = "sig"
+    with mock.patch("stripe.Webhook.construct_event", return_value=_checkout_event()):
+        response = views.stripe_webhook(request)
+        duplicate = views.stripe_webhook(request)
+
+    assert response.status_code == 200
+    assert duplicate.status_code == 200
+    event = StripeEvent.objects.get()
+    assert event.event_id == "evt_123"
+    assert event.type == "checkout.session.completed"
+    assert event.status == StripeEvent.PENDING
+    assert event.payload["data"]["object"]["customer"] == "cus_123"
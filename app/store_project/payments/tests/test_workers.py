@@ -0,0 +1,63 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from store_project.payments import workers
+from store_project.payments.models import StripeEvent
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _event(event_id, **kwargs):
+    return StripeEvent.objects.create(
+        event_id=event_id,
+        type="invoice.paid",
+        payload={"data": {"object": {}}},
+        **kwargs,
+    )
+
+
+def test_drain_runs_due_rows_in_batches():
+    due = [_event(f"evt_{i}") for i in range(3)]
+    _event("evt_later", next_attempt_at=timezone.now() + timedelta(hours=1))
+    run = []
+
+    total = workers.drain(StripeEvent.objects.all(), "received", 2, run.append)
+
+    assert total == 3
+    assert run == due
+
+
+def test_drain_leaves_crashed_rows_claimed():
+    first, second = _event("evt_1"), _event("evt_2")
+
+    def run(event):
+        if event.pk == second.pk:
+            raise RuntimeError("bug")
+        event.process()
+
+    workers.drain(StripeEvent.objects.all(), "received", 10, run)
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.status == StripeEvent.PROCESSED
+    assert second.status == StripeEvent.PENDING
+    assert second.next_attempt_at > timezone.now()
+    # Not due again until the claim runs out
+    assert workers.drain(StripeEvent.objects.all(), "received", 10, run) == 0
+
+
+def test_process_stripe_events_command():
+    event = _event("evt_1")
+    stdout = StringIO()
+
+    call_command("process_stripe_events", "--once", stdout=stdout)
+
+    event.refresh_from_db()
+    assert event.status == StripeEvent.PROCESSED
+    assert "Processed 1 Stripe events." in stdout.getvalue()
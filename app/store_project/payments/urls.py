@@ -17,4 +17,5 @@ urlpatterns = [
     ),
     path("success/", views.SuccessView.as_view(), name="success"),
     path("webhook/", views.stripe_webhook, name="webhook"),
+    path("stripe-metrics/", views.stripe_metrics, name="stripe_metrics"),
 ]
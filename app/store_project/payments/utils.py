@@ -1,10 +1,13 @@
 import logging
 import os
+import smtplib
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.mail import send_mail
+from django.db import transaction
 from django.http.response import HttpResponse
 from django.template.loader import render_to_string
 from django.urls import reverse
@@ -12,7 +15,12 @@ from django.urls import reverse
 import botocore
 import stripe
 
-from store_project.products.models import Product
+from store_project.payments import stripe_client
+from store_project.payments.models import FulfilledCheckout
+from store_project.products.models import (
+    Book, Category, Entitlement, Product, Program,
+)
+from store_project.users.factories import UserFactory
 
 
 User = get_user_model()
@@ -59,64 +67,207 @@ def order_confirmation_email(
     logger.info(f"Successful order: {user.email}")
 
 
-def stripe_customer_get_or_create(user: User) -> stripe.Customer:
+def stripe_cache_key(object_type: str, stripe_id: str) -> str:
+    """Cache key marking a Stripe object as known to exist."""
+    return f"stripe:{object_type}:{stripe_id}"
+
+
+def stripe_cache_verified(object_type: str, stripe_id: str):
+    cache.set(
+        stripe_cache_key(object_type, stripe_id),
+        True,
+        settings.STRIPE_CACHE_TIMEOUT,
+    )
+
+
+def stripe_cache_is_verified(object_type: str, stripe_id: str) -> bool:
+    return bool(cache.get(stripe_cache_key(object_type, stripe_id)))
+
+
+def stripe_customer_get_or_create(user: User) -> str:
     """
     A customer might be in our Django database, but not in Stripe.
+
+    Returns the Stripe Customer ID. Customers already seen in Stripe are
+    cached, so a returning customer costs no Stripe requests.
     """
-    stripe.api_key = settings.STRIPE_SECRET_KEY
 
     if user.stripe_customer_id:
+        if stripe_cache_is_verified("customer", user.stripe_customer_id):
+            return user.stripe_customer_id
         try:
-            stripe_customer = stripe.Customer.retrieve(id=user.stripe_customer_id)
+            stripe_customer = stripe_client.Customer.retrieve(id=user.stripe_customer_id)
         except stripe.error.InvalidRequestError:
             logger.info(f"Could not find Stripe Customer with ID={user.stripe_customer_id}. Creating now.")
-            stripe_customer = stripe.Customer.create(
+            stripe_customer = stripe_client.Customer.create(
                 id=user.stripe_customer_id,
                 email=user.email
             )
     else:
-        stripe_customer = stripe.Customer.create(email=user.email)
+        stripe_customer = stripe_client.Customer.create(email=user.email)
         user.stripe_customer_id = stripe_customer.id
         user.save(update_fields=["stripe_customer_id"])
         logger.info(f"New Stripe Customer with ID={user.stripe_customer_id}.")
 
-    return stripe_customer
+    stripe_cache_verified("customer", stripe_customer.id)
+    return stripe_customer.id
 
 
 def stripe_price_get_or_create(product: Product) -> str:
     """
     Because sometimes the Django Postgres database is not synced with the Products
     and Prices in Stripe.
+
+    Prices and Products already seen in Stripe are cached, so a warm checkout
+    costs no Stripe requests here.
     """
-    stripe.api_key = settings.STRIPE_SECRET_KEY
+    product_id = str(product.id)
+
+    if (
+        product.stripe_price_id
+        and stripe_cache_is_verified("price", product.stripe_price_id)
+        and stripe_cache_is_verified("product", product_id)
+    ):
+        return product.stripe_price_id
 
     try:
-        price_object = stripe.Price.retrieve(product.stripe_price_id)
-        try:
-            # Price exists, now find the Product
-            stripe.Product.retrieve(str(product.id))
-        except stripe.error.InvalidRequestError:
-            stripe.Product.create(
-                id=str(product.id),
-                name=product.name,
-                description=product.description,
-                type="good",
-            )
+        price_object = stripe_client.Price.retrieve(product.stripe_price_id)
     except stripe.error.InvalidRequestError:
         # Price does not exist, get Product then Price
+        price_object = None
+
+    if not stripe_cache_is_verified("product", product_id):
         try:
-            stripe.Product.retrieve(str(product.id))
+            stripe_client.Product.retrieve(product_id)
         except stripe.error.InvalidRequestError:
-            stripe.Product.create(
-                id=str(product.id),
+            stripe_client.Product.create(
+                id=product_id,
                 name=product.name,
                 description=product.description,
                 type="good",
             )
-        price_object = stripe.Price.create(
+        stripe_cache_verified("product", product_id)
+
+    if price_object is None:
+        price_object = stripe_client.Price.create(
             currency="USD",
             unit_amount=f"{int(product.price*100)}",
-            product=str(product.id),
+            product=product_id,
         )
 
+    stripe_cache_verified("price", price_object.id)
     return price_object.id
+
+
+def send_order_confirmation(
+    checkout_session: stripe.checkout.Session, product: Product, user: User
+):
+    """
+    Email the receipt for an order that's already been fulfilled. A failure
+    is only logged, since retrying the fulfillment would skip the order.
+    """
+    try:
+        order_confirmation_email(checkout_session, product, user)
+    except smtplib.SMTPException as e:
+        logger.error(f"{e}")
+        logger.error(f"Could not email order of {product} to {user.email}.")
+
+
+def fulfill_checkout_session(checkout_session: dict):
+    """
+    Give the customer access to the product they paid for and email them a
+    receipt. Safe to run more than once for the same checkout session: it's
+    recorded as a FulfilledCheckout in the same transaction, and repeats are
+    skipped. The receipt is sent once that transaction commits, so a slow
+    email server doesn't hold it open.
+    """
+    _, created = FulfilledCheckout.objects.get_or_create(
+        session_id=checkout_session["id"]
+    )
+    if not created:
+        logger.info(
+            f"[payments.utils.fulfill_checkout_session] {checkout_session['id']} "
+            "was already fulfilled"
+        )
+        return
+
+    metadata = checkout_session.get("metadata") or {}  # CLI test: {}
+    try:
+        user = User.objects.get(stripe_customer_id=checkout_session["customer"])
+        # Current bug: if user changes email address in Stripe, it's not
+        # changed in Django. So we're finding User object with
+        # `stripe_customer_id` instead.
+    except User.DoesNotExist:
+        user = UserFactory(
+            username="lancegoyke", email="lancegoyke@gmail.com"
+        )  # user for testing
+
+    logger.info(f"[payments.utils.fulfill_checkout_session] User = {user}")
+
+    # if metadata not supplied, we're testing
+    product_name = metadata.get("product_name", "Test Program")
+    product_type = metadata.get("product_type", "program")
+    # Older checkout sessions only have the product name
+    product_slug = metadata.get("product_slug")
+    lookup = {"slug": product_slug} if product_slug else {"name": product_name}
+
+    if product_type == "program":
+        try:
+            product = Program.objects.get(**lookup)
+        except Program.DoesNotExist:
+            # create new Program for testing
+            product = Program.objects.create(
+                name="Test Program",
+                description="Test description.",
+                slug="test-program",
+                price=1100,
+                author=User.objects.filter(email="lance@lancegoyke.com").first(),
+                duration=1,
+                frequency=3,
+            )
+            test_category, created = Category.objects.get_or_create(
+                name="Test Category"
+            )
+            product.categories.add(test_category)
+    elif product_type == "book":
+        product = Book.objects.get(**lookup)
+
+    logger.info(f"[payments.utils.fulfill_checkout_session] Product = {product_name}")
+
+    # give customer access to purchased product
+    Entitlement.grant(user, product, source=Entitlement.PURCHASE)
+    logger.info(
+        f"[payments.utils.fulfill_checkout_session] {product} given to {user.email}"
+    )
+
+    transaction.on_commit(
+        lambda: send_order_confirmation(checkout_session, product, user)
+    )
+
+
+def stripe_cache_invalidate(object_type: str):
+    """Build an event handler that forgets a cached Stripe object."""
+
+    def invalidate(stripe_object: dict):
+        cache.delete(stripe_cache_key(object_type, stripe_object["id"]))
+
+    return invalidate
+
+
+STRIPE_EVENT_HANDLERS = {
+    "checkout.session.completed": fulfill_checkout_session,
+    "price.updated": stripe_cache_invalidate("price"),
+    "product.updated": stripe_cache_invalidate("product"),
+    "customer.deleted": stripe_cache_invalidate("customer"),
+}
+
+
+def handle_stripe_event(event_type: str, event: dict):
+    """
+    Run the handler for a stored Stripe Event. Events we do not handle are
+    ignored.
+    """
+    handler = STRIPE_EVENT_HANDLERS.get(event_type)
+    if handler is None:
+        return
+    handler(event["data"]["object"])
@@ -1,28 +1,25 @@
 import logging
 import os
-import smtplib
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Permission
-from django.contrib.contenttypes.models import ContentType
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.http.response import HttpResponse, JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse
-from django.utils.text import slugify
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic.base import TemplateView
 
 import stripe
 
+from store_project.payments import stripe_client
+from store_project.payments.models import StripeEvent
 from store_project.payments.utils import (
-    int_to_price, order_confirmation_email, stripe_customer_get_or_create,
-    stripe_price_get_or_create,
+    int_to_price, stripe_customer_get_or_create, stripe_price_get_or_create,
 )
-from store_project.products.models import Book, Category, Program
-from store_project.users.factories import UserFactory
+from store_project.products.models import Book, Program
 
 
 User = get_user_model()
@@ -62,7 +59,6 @@ def create_checkout_session(request):
     """
     if request.method == "GET":
         domain_url = settings.DOMAIN_URL
-        stripe.api_key = settings.STRIPE_SECRET_KEY
         product_type = request.GET.get("product-type")
         product_slug = request.GET.get("product-slug")
         if product_type == "program":
@@ -99,7 +95,7 @@ def create_checkout_session(request):
 
             stripe_customer = stripe_customer_get_or_create(request.user)
 
-            checkout_session = stripe.checkout.Session.create(
+            checkout_session = stripe_client.checkout.Session.create(
                 customer=stripe_customer,
                 client_reference_id=str(request.user.id),
                 success_url=domain_url + "payments/success/?session_id={CHECKOUT_SESSION_ID}",
@@ -122,8 +118,6 @@ def create_checkout_session(request):
 
 @csrf_exempt
 def stripe_webhook(request):
-    print("[payments.views.stripe_webhook] BEGIN HANDLING WEBHOOKS")
-    stripe.api_key = settings.STRIPE_SECRET_KEY
     endpoint_secret = os.environ.get("STRIPE_ENDPOINT_SECRET")
     payload = request.body
     signature_header = request.META["HTTP_STRIPE_SIGNATURE"]
@@ -134,89 +128,30 @@ def stripe_webhook(request):
             payload, signature_header, endpoint_secret
         )
     except ValueError as e:
-        print("ERROR: Invalid payload")
-        print(f"ERROR: {e}")
+        logger.error(f"Invalid Stripe webhook payload: {e}")
         return HttpResponse(status=400)
     except stripe.error.SignatureVerificationError as e:
-        print("ERROR: Invalid signature")
-        print(f"ERROR: {e}")
+        logger.error(f"Invalid Stripe webhook signature: {e}")
         return HttpResponse(status=400)
 
-    if event["type"] == "checkout.session.completed":
-        print("[payments.views.stripe_webhook] Payment was successful.")
-
-        checkout_session = event.data.object
-        metadata = checkout_session.metadata  # CLI test: {}
-        try:
-            user = User.objects.get(stripe_customer_id=checkout_session["customer"])
-            # Current bug: if user changes email address in Stripe, it's not
-            # changed in Django. So we're finding User object with
-            # `stripe_customer_id` instead.
-        except User.DoesNotExist:
-            user = UserFactory(
-                username="lancegoyke", email="lancegoyke@gmail.com"
-            )  # user for testing
-
-        print(f"[payments.views.stripe_webhook] User = {user}")
-
-        try:
-            product_name = metadata["product_name"]
-        except KeyError:
-            # if metadata not supplied, we're testing
-            product_name = "Test Program"
-
-        try:
-            product_type = metadata["product_type"]
-        except KeyError:
-            # if metadata not supplied, we're testing
-            product_type = "program"
-
-        if product_type == "program":
-            try:
-                product = Program.objects.get(name=product_name)
-            except Program.DoesNotExist:
-                # create new Program for testing
-                product = Program.objects.create(
-                    name="Test Program",
-                    description="Test description.",
-                    slug="test-program",
-                    price=1100,
-                    author=User.objects.filter(email="lance@lancegoyke.com").first(),
-                    duration=1,
-                    frequency=3,
-                )
-                test_category, created = Category.objects.get_or_create(
-                    name="Test Category"
-                )
-                product.categories.add(test_category)
-        elif product_type == "book":
-            product = Book.objects.get(name=product_name)
-
-        print(f"[payments.views.stripe_webhook] Product = {product_name}")
-
-        # give customer account permissions for purchased product
-        try:
-            permission = Permission.objects.get(name=f"Can view {product_name}")
-        except Permission.DoesNotExist:
-            permission = Permission.objects.create(
-                codename=f"can_view_{slugify(product_name)}",
-                name=f"Can view {product_name}",
-                content_type=ContentType.objects.get_for_model(product.__class__),
-            )
-        user.user_permissions.add(permission)
-        print(
-            f'[payments.views.stripe_webhook] Permission "{permission.name}" given to {user.email}'
-        )
+    # Store the event and answer Stripe right away. The event is fulfilled
+    # by the `process_stripe_events` management command.
+    stripe_event, created = StripeEvent.objects.get_or_create(
+        event_id=event["id"],
+        defaults={
+            "type": event["type"],
+            "payload": event.to_dict_recursive(),
+        },
+    )
+    if not created:
+        logger.info(f"Duplicate Stripe event {event['id']} ignored.")
+    return HttpResponse(status=200)
 
-        try:
-            order_confirmation_email(checkout_session, product, user)
-        except smtplib.SMTPException as e:
-            logger.error(f"{e}")
-            logger.error("Could not email order of {product_name} to {user.email}.")
-            return HttpResponse(status=500)
 
-        print("[payments.views.stripe_webhook] Successful payment webhook handled properly.")
-    return HttpResponse(status=200)
+@staff_member_required
+def stripe_metrics(request):
+    """Call counts, error rates and latency histograms of our Stripe calls."""
+    return JsonResponse({"endpoints": stripe_client.get_metrics()})
 
 
 class SuccessView(TemplateView):
@@ -224,9 +159,8 @@ class SuccessView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        stripe.api_key = settings.STRIPE_SECRET_KEY
         session_id = self.request.GET.get("session_id", "")
-        line_items = stripe.checkout.Session.list_line_items(session_id)  # dict
+        line_items = stripe_client.checkout.Session.list_line_items(session_id)  # dict
         context["products"] = []
         amount = 0
         for product in line_items.data:
@@ -0,0 +1,62 @@
+"""
+Draining the tables that queue Stripe work in the background: StripeSyncJob
+rows sent by `sync_stripe`, and StripeEvent rows fulfilled by
+`process_stripe_events`.
+
+Both have a `status` and a `next_attempt_at`. A worker claims a batch of due
+rows by pushing their `next_attempt_at` back, then runs and saves each one on
+its own, so several workers can drain the same table.
+"""
+
+from datetime import timedelta
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+# How long a worker has to run the rows it claimed before another may retry them
+CLAIM_SECONDS = 10 * 60
+
+
+def claim(queryset, order_by, batch_size):
+    """
+    Up to `batch_size` due rows of `queryset`, ordered by `order_by`, pushed
+    back by CLAIM_SECONDS so that no other worker picks them up. Rows locked
+    by another worker's claim are skipped.
+    """
+    model = queryset.model
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update(skip_locked=True)
+            .filter(status=model.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by(order_by)[:batch_size]
+        )
+        model.objects.filter(pk__in=[row.pk for row in rows]).update(
+            next_attempt_at=timezone.now() + timedelta(seconds=CLAIM_SECONDS)
+        )
+    return rows
+
+
+def drain(queryset, order_by, batch_size, run):
+    """
+    Claim due rows in batches and call `run` on each, until none are left.
+    Returns how many were run.
+
+    `run` records its own outcome on the row. One that raises instead is
+    logged and left claimed, so it's tried again once the claim runs out,
+    and the rows already run keep their status.
+    """
+    total = 0
+    while True:
+        rows = claim(queryset, order_by, batch_size)
+        for row in rows:
+            try:
+                run(row)
+            except Exception:
+                logger.exception(f"{queryset.model.__name__} {row} crashed")
+        total += len(rows)
+        if len(rows) < batch_size:
+            return total
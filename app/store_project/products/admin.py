@@ -1,8 +1,12 @@
 from django.contrib import admin, messages
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import ngettext
 
-from store_project.products.models import Category, Program, Book
+from store_project.products.models import (
+    Book, Category, Entitlement, Program, StripeSyncJob,
+)
+from store_project.products.storefront import invalidate_storefront
 
 
 User = get_user_model()
@@ -34,7 +38,9 @@ class ProgramAdmin(admin.ModelAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
     def make_public(self, request, queryset):
-        updated = queryset.update(status=Program.PUBLIC)
+        updated = queryset.update(status=Program.PUBLIC, modified=timezone.now())
+        # Bulk updates skip the lifecycle hooks
+        invalidate_storefront()
         self.message_user(
             request,
             ngettext(
@@ -46,7 +52,9 @@ class ProgramAdmin(admin.ModelAdmin):
         )
 
     def make_draft(self, request, queryset):
-        updated = queryset.update(status=Program.DRAFT)
+        updated = queryset.update(status=Program.DRAFT, modified=timezone.now())
+        # Bulk updates skip the lifecycle hooks
+        invalidate_storefront()
         self.message_user(
             request,
             ngettext(
@@ -58,7 +66,9 @@ class ProgramAdmin(admin.ModelAdmin):
         )
 
     def make_private(self, request, queryset):
-        updated = queryset.update(status=Program.PRIVATE)
+        updated = queryset.update(status=Program.PRIVATE, modified=timezone.now())
+        # Bulk updates skip the lifecycle hooks
+        invalidate_storefront()
         self.message_user(
             request,
             ngettext(
@@ -100,7 +110,9 @@ class BookAdmin(admin.ModelAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
     def make_public(self, request, queryset):
-        updated = queryset.update(status=Book.PUBLIC)
+        updated = queryset.update(status=Book.PUBLIC, modified=timezone.now())
+        # Bulk updates skip the lifecycle hooks
+        invalidate_storefront()
         self.message_user(
             request,
             ngettext(
@@ -112,7 +124,9 @@ class BookAdmin(admin.ModelAdmin):
         )
 
     def make_draft(self, request, queryset):
-        updated = queryset.update(status=Book.DRAFT)
+        updated = queryset.update(status=Book.DRAFT, modified=timezone.now())
+        # Bulk updates skip the lifecycle hooks
+        invalidate_storefront()
         self.message_user(
             request,
             ngettext(
@@ -124,7 +138,9 @@ class BookAdmin(admin.ModelAdmin):
         )
 
     def make_private(self, request, queryset):
-        updated = queryset.update(status=Book.PRIVATE)
+        updated = queryset.update(status=Book.PRIVATE, modified=timezone.now())
+        # Bulk updates skip the lifecycle hooks
+        invalidate_storefront()
         self.message_user(
             request,
             ngettext(
@@ -144,3 +160,46 @@ class BookAdmin(admin.ModelAdmin):
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ["name"]
     ordering = ["name"]
+
+
+@admin.register(StripeSyncJob)
+class StripeSyncJobAdmin(admin.ModelAdmin):
+    list_display = [
+        "action",
+        "object_id",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "created",
+    ]
+    list_filter = ["status", "action"]
+    readonly_fields = ["content_type", "object_id", "payload", "last_error"]
+    ordering = ["-created"]
+    actions = ["retry"]
+
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=StripeSyncJob.DONE).update(
+            status=StripeSyncJob.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(
+            request,
+            ngettext(
+                f"{updated} job was queued to retry.",
+                f"{updated} jobs were queued to retry.",
+                updated,
+            ),
+            messages.SUCCESS,
+        )
+
+    retry.short_description = "Retry selected Stripe sync jobs"
+
+
+@admin.register(Entitlement)
+class EntitlementAdmin(admin.ModelAdmin):
+    list_display = ["user", "product_type", "product_id", "source", "granted_at"]
+    list_filter = ["source", "product_type"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user"]
+    ordering = ["-granted_at"]
@@ -5,3 +5,9 @@ from django.utils.translation import gettext_lazy as _
 class ProductsConfig(AppConfig):
     name = "store_project.products"
     verbose_name = _("Products")
+
+    def ready(self):
+        from store_project.products import entitlements, storefront
+
+        entitlements.connect_signals()
+        storefront.connect_signals()
@@ -0,0 +1,128 @@
+"""
+Fast answers to "has this user bought this product?"
+
+Access to a product is an Entitlement row, or membership of the "comped"
+group, which can view every product. The IDs of the products a user owns are
+stored as one small set in the cache and dropped once a change to the user's
+entitlements or groups is committed, so a request in between can't cache the
+old set again.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from store_project.products.models import Book, Entitlement, Product, Program
+
+
+COMPED_GROUP = "comped"
+PRODUCT_MODELS = [Program, Book]
+VERSION_KEY = "entitlements:version"
+
+
+def _version():
+    """Bumped when products are added or removed, which affects comped users."""
+    return cache.get_or_set(VERSION_KEY, 1, None)
+
+
+def _cache_key(user_id):
+    return f"entitlements:{_version()}:{user_id}"
+
+
+def _load_owned_product_ids(user) -> frozenset:
+    if user.groups.filter(name=COMPED_GROUP).exists():
+        owned = set()
+        for model in PRODUCT_MODELS:
+            owned.update(str(pk) for pk in model.objects.values_list("pk", flat=True))
+        return frozenset(owned)
+    pks = Entitlement.objects.filter(user=user).values_list("product_id", flat=True)
+    return frozenset(str(pk) for pk in pks)
+
+
+def owned_product_ids(user) -> frozenset:
+    """IDs, as strings, of every product this user has access to."""
+    if not user.is_authenticated:
+        return frozenset()
+    # Memoized on the user so a page listing many products only asks once
+    if not hasattr(user, "_owned_product_ids"):
+        key = _cache_key(user.pk)
+        owned = cache.get(key)
+        if owned is None:
+            owned = _load_owned_product_ids(user)
+            cache.set(key, owned, settings.DEFAULT_CACHE_TIMEOUT)
+        user._owned_product_ids = owned
+    return user._owned_product_ids
+
+
+def user_owns(user, product: Product) -> bool:
+    """Can this user view the given Program or Book?"""
+    if user.is_active and user.is_superuser:
+        return True
+    return str(product.pk) in owned_product_ids(user)
+
+
+def invalidate_user(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def invalidate_all():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def entitlement_changed(sender, instance, **kwargs):
+    """Receiver for saved and deleted Entitlements."""
+    transaction.on_commit(lambda: invalidate_user(instance.user_id))
+
+
+def user_groups_changed(sender, instance, action, reverse, **kwargs):
+    """Receiver for changes to User.groups, e.g. joining the comped group."""
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # Changed from the Group side, may affect many users
+        transaction.on_commit(invalidate_all)
+    else:
+        transaction.on_commit(lambda: invalidate_user(instance.pk))
+        instance.__dict__.pop("_owned_product_ids", None)
+
+
+def product_created_or_deleted(sender, created=True, **kwargs):
+    """Comped users own every product, so their sets change too."""
+    if created:
+        transaction.on_commit(invalidate_all)
+
+
+def connect_signals():
+    from django.contrib.auth import get_user_model
+    from django.db.models.signals import m2m_changed, post_delete, post_save
+
+    User = get_user_model()
+    post_save.connect(
+        entitlement_changed,
+        sender=Entitlement,
+        dispatch_uid="entitlements_saved",
+    )
+    post_delete.connect(
+        entitlement_changed,
+        sender=Entitlement,
+        dispatch_uid="entitlements_deleted",
+    )
+    m2m_changed.connect(
+        user_groups_changed,
+        sender=User.groups.through,
+        dispatch_uid="entitlements_user_groups",
+    )
+    for model in PRODUCT_MODELS:
+        post_save.connect(
+            product_created_or_deleted,
+            sender=model,
+            dispatch_uid=f"entitlements_{model._meta.model_name}_saved",
+        )
+        post_delete.connect(
+            product_created_or_deleted,
+            sender=model,
+            dispatch_uid=f"entitlements_{model._meta.model_name}_deleted",
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from store_project.products.view_counts import flush_views
+
+
+class Command(BaseCommand):
+    help = "Writes product page views counted in the cache to the database"
+
+    def handle(self, *args, **options):
+        count = flush_views()
+        self.stdout.write(f"Flushed {count} product views.")
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from store_project.pages.models import Page
+from store_project.products.models import Book, Program
+from store_project.products.storefront import invalidate_storefront
+
+
+BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = "Renders stored Markdown to HTML for every Program, Book and Page"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model, source, target, render in [
+            (Program, "page_content", "page_content_html", "render_page_content"),
+            (Book, "page_content", "page_content_html", "render_page_content"),
+            (Page, "content", "content_html", "render_content"),
+        ]:
+            count = self.backfill(model, source, target, render, batch_size)
+            self.stdout.write(
+                f"Rendered {count} {model._meta.verbose_name_plural}."
+            )
+        # The hooks that would drop cached sales pages were skipped
+        invalidate_storefront()
+
+    def backfill(self, model, source, target, render, batch_size):
+        """
+        Re-render every row with `bulk_update`, which skips the lifecycle
+        hooks and leaves `modified` untouched.
+        """
+        count = 0
+        batch = []
+        for obj in model.objects.only("pk", source).iterator(chunk_size=batch_size):
+            getattr(obj, render)()
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, [target])
+                count += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, [target])
+            count += len(batch)
+        return count
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from store_project.payments import workers
+from store_project.products.models import StripeSyncJob
+
+
+BATCH_SIZE = 50
+POLL_INTERVAL = 5  # seconds
+
+
+class Command(BaseCommand):
+    help = "Sends queued Product changes to Stripe"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling forever.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--interval", type=float, default=POLL_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            processed = workers.drain(
+                StripeSyncJob.objects.select_related("content_type"),
+                "created",
+                options["batch_size"],
+                StripeSyncJob.run,
+            )
+            if processed:
+                self.stdout.write(f"Processed {processed} Stripe sync jobs.")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
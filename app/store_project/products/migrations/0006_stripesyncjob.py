@@ -0,0 +1,39 @@
+# Generated by Django 3.2 on 2026-10-18 19:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('products', '0005_auto_20210213_1911'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripeSyncJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('create', 'Create product and price'), ('update', 'Update product'), ('price', 'Replace price'), ('deactivate', 'Deactivate product and price')], max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('object_id', models.UUIDField(verbose_name='Product ID')),
+                ('payload', models.JSONField(default=dict, verbose_name='Product data at time of change')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Time created')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='Time last modified')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ['created'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stripesyncjob',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='products_st_status_40b76c_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 3.2 on 2026-10-18 19:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def permissions_to_entitlements(apps, schema_editor):
+    """
+    Give an Entitlement to every user who was directly given a
+    can_view_{slug} permission. The comped group's permissions are not copied,
+    because its members can view every product.
+    """
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Permission = apps.get_model("auth", "Permission")
+    Entitlement = apps.get_model("products", "Entitlement")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    UserPermission = User.user_permissions.through
+
+    for model_name in ["program", "book"]:
+        content_type = ContentType.objects.filter(
+            app_label="products", model=model_name
+        ).first()
+        if content_type is None:
+            continue
+        Product = apps.get_model("products", model_name)
+        by_codename = {}
+        by_name = {}
+        for product_id, slug, name in Product.objects.values_list("id", "slug", "name"):
+            by_codename[f"can_view_{slug}"] = product_id
+            by_name[f"Can view {name}"] = product_id
+
+        # The webhook matched permissions by name and could create them with
+        # a slugified name as codename, so try both.
+        permissions = Permission.objects.filter(
+            content_type=content_type, codename__startswith="can_view_"
+        )
+        product_for_permission = {}
+        for permission_id, codename, name in permissions.values_list("id", "codename", "name"):
+            product_id = by_codename.get(codename) or by_name.get(name)
+            if product_id is not None:
+                product_for_permission[permission_id] = product_id
+
+        user_permissions = UserPermission.objects.filter(
+            permission_id__in=product_for_permission
+        ).values_list("user_id", "permission_id")
+        Entitlement.objects.bulk_create(
+            [
+                Entitlement(
+                    user_id=user_id,
+                    product_type=content_type,
+                    product_id=product_for_permission[permission_id],
+                    source="migration",
+                )
+                for user_id, permission_id in user_permissions
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('products', '0006_stripesyncjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Entitlement',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.UUIDField(verbose_name='Product ID')),
+                ('source', models.CharField(choices=[('purchase', 'Purchase'), ('comp', 'Complimentary'), ('migration', 'Migrated from permissions')], default='purchase', max_length=10)),
+                ('granted_at', models.DateTimeField(auto_now_add=True, verbose_name='Time granted')),
+                ('product_type', models.ForeignKey(limit_choices_to=models.Q(('app_label', 'products'), ('model__in', ['program', 'book'])), on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entitlements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-granted_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='entitlement',
+            constraint=models.UniqueConstraint(fields=('user', 'product_type', 'product_id'), name='unique_entitlement'),
+        ),
+        migrations.RunPython(permissions_to_entitlements, migrations.RunPython.noop),
+    ]
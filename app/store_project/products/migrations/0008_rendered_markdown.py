@@ -0,0 +1,23 @@
+# Generated by Django 3.2 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_entitlement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='page_content_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Page content, rendered to HTML'),
+        ),
+        migrations.AddField(
+            model_name='program',
+            name='page_content_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Page content, rendered to HTML'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+from markdownx.utils import markdownify
+
+from store_project.products.storefront import invalidate_storefront
+
+
+BATCH_SIZE = 100
+
+
+def render_page_content(apps, schema_editor):
+    """
+    Fill page_content_html for existing products, which would otherwise show
+    an empty sales page until they're next saved.
+    """
+    for model_name in ["program", "book"]:
+        Product = apps.get_model("products", model_name)
+        batch = []
+        for product in Product.objects.only("pk", "page_content").iterator(
+            chunk_size=BATCH_SIZE
+        ):
+            product.page_content_html = markdownify(product.page_content)
+            batch.append(product)
+            if len(batch) >= BATCH_SIZE:
+                Product.objects.bulk_update(batch, ["page_content_html"])
+                batch = []
+        if batch:
+            Product.objects.bulk_update(batch, ["page_content_html"])
+    # Cached sales pages were rendered from the Markdown on each request
+    invalidate_storefront()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0008_rendered_markdown"),
+    ]
+
+    operations = [
+        migrations.RunPython(render_page_content, migrations.RunPython.noop),
+    ]
@@ -1,29 +1,36 @@
+from datetime import timedelta
+from decimal import Decimal
 import itertools
 import logging
 import uuid
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from django_lifecycle import (
-    BEFORE_CREATE,
     AFTER_CREATE,
+    AFTER_DELETE,
     BEFORE_DELETE,
-    BEFORE_UPDATE,
     AFTER_UPDATE,
+    BEFORE_CREATE,
+    BEFORE_UPDATE,
     hook,
     LifecycleModelMixin,
 )
 from markdownx.models import MarkdownxField
+from markdownx.utils import markdownify
 import stripe
 
 from store_project.pages.models import Page
+from store_project.payments import stripe_client
+from store_project.products.storefront import invalidate_storefront
 
 
 User = get_user_model()
@@ -92,6 +99,9 @@ class Product(LifecycleModelMixin, models.Model):
     page_content = MarkdownxField(
         _("Page content, in markdown"), default="", blank=True
     )
+    page_content_html = models.TextField(
+        _("Page content, rendered to HTML"), default="", blank=True, editable=False
+    )
 
     class Meta:
         abstract = True
@@ -103,96 +113,338 @@ class Product(LifecycleModelMixin, models.Model):
     def is_public(self):
         return self.status in {self.PUBLIC}
 
+    def render_page_content(self):
+        self.page_content_html = markdownify(self.page_content)
+
+    def get_page_content_html(self):
+        """The stored HTML, or the Markdown rendered now if none is stored."""
+        if not self.page_content_html and self.page_content:
+            return markdownify(self.page_content)
+        return self.page_content_html
+
     @hook(BEFORE_CREATE)
-    def add_product_to_stripe(self):
+    @hook(BEFORE_UPDATE, when="page_content", has_changed=True)
+    def update_page_content_html(self):
         """
-        Send basic product info to Stripe account.
+        Render the Markdown once on save so detail views don't have to.
         """
-        stripe.api_key = settings.STRIPE_SECRET_KEY
-        product = stripe.Product.create(
-            id=self.id,
-            name=self.name,
-            description=self.description,
-            type="good",
-        )
-        price = stripe.Price.create(
-            unit_amount_decimal=self.price * 100,
-            currency="usd",
-            product=self.id,
+        self.render_page_content()
+
+    def queue_stripe_sync(self, action):
+        """
+        Write a StripeSyncJob for this product. The job is picked up by the
+        `sync_stripe` management command, which talks to Stripe outside of the
+        request/response cycle.
+        """
+        job = StripeSyncJob.objects.create(
+            action=action,
+            content_type=ContentType.objects.get_for_model(self),
+            object_id=self.id,
+            payload={
+                "name": self.name,
+                "description": self.description,
+                "price": str(self.price),
+                "stripe_price_id": self.stripe_price_id,
+            },
         )
-        self.stripe_price_id = price.id  # save to database for easy reference
-        logger.info(f"Product {product} added to Stripe.")
-        logger.info(f"Price {price} added to Stripe.")
+        logger.info(f"Stripe sync job {job} queued.")
+        return job
+
+    @hook(AFTER_CREATE)
+    def add_product_to_stripe(self):
+        """
+        Queue basic product info to be sent to Stripe account.
+        """
+        self.queue_stripe_sync(StripeSyncJob.CREATE_PRODUCT)
 
     @hook(AFTER_UPDATE, when="name", has_changed=True)
     @hook(AFTER_UPDATE, when="description", has_changed=True)
     def update_product_in_stripe(self):
         """
-        Update changed product info in Stripe.
+        Queue changed product info to be updated in Stripe.
+        """
+        self.queue_stripe_sync(StripeSyncJob.UPDATE_PRODUCT)
+
+    @hook(AFTER_UPDATE, when="price", has_changed=True)
+    def update_price_in_stripe(self):
+        """
+        Queue a new Stripe Price for this product. The new price ID is saved
+        to `stripe_price_id` once the job has run.
+        """
+        self.queue_stripe_sync(StripeSyncJob.UPDATE_PRICE)
+
+    @hook(BEFORE_DELETE)
+    def delete_product_and_price_in_stripe(self):
+        """
+        Queue Product and Price to be marked as inactive in Stripe. Keeping the
+        item around in case it is needed in the future.
         """
-        stripe.api_key = settings.STRIPE_SECRET_KEY
+        self.queue_stripe_sync(StripeSyncJob.DEACTIVATE)
+
+    @hook(AFTER_CREATE)
+    @hook(
+        AFTER_UPDATE,
+        when_any=[
+            "name",
+            "slug",
+            "description",
+            "price",
+            "status",
+            "featured_image",
+            "page_content",
+        ],
+        has_changed=True,
+    )
+    @hook(AFTER_DELETE)
+    def refresh_storefront(self):
+        """
+        Drop cached storefront pages and product cards that show this product.
+        """
+        invalidate_storefront()
+
+    @hook(BEFORE_DELETE)
+    def remove_entitlements(self):
+        """
+        Entitlements point at products generically, so they are not removed by
+        a cascade.
+        """
+        Entitlement.objects.filter(
+            product_type=ContentType.objects.get_for_model(self),
+            product_id=self.id,
+        ).delete()
+
+
+class Entitlement(models.Model):
+    """
+    A user's access to a Program or Book.
+
+    Members of the "comped" group can view every product without needing an
+    Entitlement for each one.
+    """
+
+    PURCHASE = "purchase"
+    COMP = "comp"
+    MIGRATION = "migration"
+    SOURCE_CHOICES = [
+        (PURCHASE, "Purchase"),
+        (COMP, "Complimentary"),
+        (MIGRATION, "Migrated from permissions"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="entitlements",
+    )
+    product_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        limit_choices_to=models.Q(app_label="products", model__in=["program", "book"]),
+    )
+    product_id = models.UUIDField(_("Product ID"))
+    product = GenericForeignKey("product_type", "product_id")
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default=PURCHASE)
+    granted_at = models.DateTimeField(_("Time granted"), auto_now_add=True)
+
+    class Meta:
+        ordering = ["-granted_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "product_type", "product_id"],
+                name="unique_entitlement",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} can view {self.product_type.model} {self.product_id}"
+
+    @classmethod
+    def grant(cls, user, product, source=PURCHASE):
+        """Give a user access to a product. Granting twice is a no-op."""
+        entitlement, created = cls.objects.get_or_create(
+            user=user,
+            product_type=ContentType.objects.get_for_model(product),
+            product_id=product.id,
+            defaults={"source": source},
+        )
+        return entitlement
+
+
+class StripeSyncJob(models.Model):
+    """
+    An outbox row describing a change that needs to be sent to Stripe.
+
+    Rows are written by the Product lifecycle hooks and drained by the
+    `sync_stripe` management command. Failed jobs are retried with an
+    exponential backoff until MAX_ATTEMPTS is reached.
+    """
+
+    CREATE_PRODUCT = "create"
+    UPDATE_PRODUCT = "update"
+    UPDATE_PRICE = "price"
+    DEACTIVATE = "deactivate"
+    ACTION_CHOICES = [
+        (CREATE_PRODUCT, "Create product and price"),
+        (UPDATE_PRODUCT, "Update product"),
+        (UPDATE_PRICE, "Replace price"),
+        (DEACTIVATE, "Deactivate product and price"),
+    ]
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    MAX_ATTEMPTS = 8
+    BACKOFF_SECONDS = 30
+    MAX_BACKOFF_SECONDS = 60 * 60
+
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField(_("Product ID"))
+    payload = models.JSONField(_("Product data at time of change"), default=dict)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created = models.DateTimeField(_("Time created"), auto_now_add=True)
+    modified = models.DateTimeField(_("Time last modified"), auto_now=True)
+
+    class Meta:
+        ordering = ["created"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.object_id} ({self.status})"
+
+    def get_product(self):
+        """The product this job is for, or None if it has been deleted."""
+        model = self.content_type.model_class()
+        return model.objects.filter(id=self.object_id).first()
+
+    def run(self):
+        """
+        Send this job to Stripe. Stripe errors are recorded on the job and the
+        job is rescheduled, so one bad product does not hold up the rest.
+        """
+        self.attempts += 1
         try:
-            stripe.Product.modify(
-                sid=str(self.id),
-                name=self.name,
-                description=self.description,
+            getattr(self, f"_run_{self.action}")()
+        except stripe.error.StripeError as e:
+            self.last_error = str(e)
+            if self.attempts >= self.MAX_ATTEMPTS:
+                self.status = self.FAILED
+                logger.error(f"Stripe sync job {self} gave up: {e}")
+            else:
+                backoff = min(
+                    self.BACKOFF_SECONDS * 2 ** (self.attempts - 1),
+                    self.MAX_BACKOFF_SECONDS,
+                )
+                self.next_attempt_at = timezone.now() + timedelta(seconds=backoff)
+                logger.warning(f"Stripe sync job {self} failed, retrying in {backoff}s: {e}")
+        else:
+            self.status = self.DONE
+            self.last_error = ""
+            logger.info(f"Stripe sync job {self} finished.")
+        self.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "last_error",
+                "next_attempt_at",
+                "modified",
+            ]
+        )
+
+    def _create_product_and_price(self, product):
+        # An earlier attempt may have created the product before pricing it
+        # failed, and Stripe won't create the same ID twice.
+        try:
+            stripe_client.Product.retrieve(str(self.object_id))
+        except stripe.error.InvalidRequestError:
+            stripe_client.Product.create(
+                id=str(self.object_id),
+                name=product["name"],
+                description=product["description"],
+                type="good",
             )
-            logger.info(f"Product modified: id={self.id}")
+        return self._create_price(product)
+
+    def _create_price(self, product):
+        price = stripe_client.Price.create(
+            unit_amount_decimal=Decimal(product["price"]) * 100,
+            currency="usd",
+            product=str(self.object_id),
+        )
+        # Queryset update so the Product lifecycle hooks do not fire again.
+        self.content_type.model_class().objects.filter(id=self.object_id).update(
+            stripe_price_id=price.id
+        )
+        return price
+
+    def _current_data(self):
+        """Latest product data, or None if the product has since been deleted."""
+        product = self.get_product()
+        if product is None:
+            return None
+        return {
+            "name": product.name,
+            "description": product.description,
+            "price": str(product.price),
+            "stripe_price_id": product.stripe_price_id,
+        }
+
+    def _run_create(self):
+        product = self._current_data()
+        if product is None:
+            return
+        price = self._create_product_and_price(product)
+        logger.info(f"Product {self.object_id} and price {price.id} added to Stripe.")
+
+    def _run_update(self):
+        product = self._current_data()
+        if product is None:
+            return
+        try:
+            stripe_client.Product.modify(
+                sid=str(self.object_id),
+                name=product["name"],
+                description=product["description"],
+            )
+            logger.info(f"Product modified: id={self.object_id}")
         except stripe.error.InvalidRequestError as e:
             logger.error("ERROR: Product could not be modified.")
             logger.error("ERROR: Creating Product and Price instead.")
             logger.error(f"ERROR: {e}")
-            stripe.Product.create(
-                id=self.id,
-                name=self.name,
-                description=self.description,
-                type="good",
-            )
-            stripe.Price.create(
-                unit_amount_decimal=self.price * 100,
-                currency="usd",
-                product=self.id,
-            )
+            self._create_product_and_price(product)
 
-    @hook(BEFORE_UPDATE, when="price", has_changed=True)
-    def update_price_in_stripe(self):
-        stripe.api_key = settings.STRIPE_SECRET_KEY
+    def _run_price(self):
+        product = self._current_data()
+        if product is None:
+            return
         try:
-            old_price = stripe.Price.modify(self.stripe_price_id, active=False)
-            new_price = stripe.Price.create(
-                unit_amount_decimal=self.price * 100,
-                currency="usd",
-                product=self.id,
-            )
-            logger.info(f"Old price: {old_price}")
-            logger.info(f"New price: {new_price}")
-            self.stripe_price_id = new_price.id
+            if product["stripe_price_id"]:
+                stripe_client.Price.modify(product["stripe_price_id"], active=False)
+            new_price = self._create_price(product)
+            logger.info(f"New price: {new_price.id}")
         except stripe.error.InvalidRequestError as e:
             logger.error("ERROR: Price could not be modified.")
             logger.error("ERROR: Creating Product and Price instead.")
             logger.error(f"ERROR: {e}")
-            stripe.Product.create(
-                id=self.id, name=self.name, description=self.description, type="good"
-            )
-            price = stripe.Price.create(
-                unit_amount_decimal=self.price * 100,
-                currency="usd",
-                product=self.id,
-            )
-            self.stripe_price_id = price.id
+            self._create_product_and_price(product)
 
-    @hook(BEFORE_DELETE)
-    def delete_product_and_price_in_stripe(self):
-        """
-        Mark Product and Price as inactive in Stripe. Keeping the item around
-        in case it is needed in the future.
-        """
-        stripe.api_key = settings.STRIPE_SECRET_KEY
+    def _run_deactivate(self):
         try:
-            product = stripe.Product.modify(sid=str(self.id), active=False)
-            price = stripe.Price.modify(sid=str(self.id), active=False)
-            logger.info(f"Product {product} has been marked inactive in Stripe.")
-            logger.info(f"Price {price} has been marked inactive in Stripe.")
+            stripe_client.Product.modify(sid=str(self.object_id), active=False)
+            if self.payload.get("stripe_price_id"):
+                stripe_client.Price.modify(self.payload["stripe_price_id"], active=False)
+            logger.info(f"Product {self.object_id} has been marked inactive in Stripe.")
         except stripe.error.InvalidRequestError as e:
             logger.error(f"ERROR: {e}")
             logger.error("ERROR: Product and Price could not be marked inactive in Stripe.")
@@ -233,34 +485,6 @@ class Program(Product):
         """
         return reverse("products:program_detail", kwargs={"slug": self.slug})
 
-    @hook(AFTER_CREATE)
-    def add_program_permission(self):
-        """
-        Create a permission for users who have access to this program and add it
-        to the "comped" group.
-        """
-        permission = Permission.objects.create(
-            codename=f"can_view_{self.slug}",
-            name=f"Can view {self.name}",
-            content_type=ContentType.objects.get_for_model(Program),
-        )
-        logger.info(f"Permission {permission} created.")
-        comped_group, created = Group.objects.get_or_create(name="comped")
-        comped_group.permissions.add(permission)
-        logger.info(f"Permission {permission} added to comped_group.")
-
-    @hook(BEFORE_DELETE)
-    def remove_program_permission(self):
-        """
-        Remove the can_view_{program.slug} permission for associated program.
-        """
-        permission = Permission.objects.get(
-            codename=f"can_view_{self.slug}",
-            name=f"Can view {self.name}",
-            content_type=ContentType.objects.get_for_model(Program),
-        ).delete()
-        logger.info(f"Permission {permission} deleted.")
-
 
 class Book(Product):
     """A model for digital books. Extend Product model base functionality."""
@@ -272,31 +496,3 @@ class Book(Product):
 
     def get_absolute_url(self):
         return reverse('products:book_detail', kwargs={"slug": self.slug})
-
-    @hook(AFTER_CREATE)
-    def add_book_permission(self):
-        """
-        Create a permission for users who have access to this book and add it
-        to the "comped" group.
-        """
-        permission = Permission.objects.create(
-            codename=f"can_view_{self.slug}",
-            name=f"Can view {self.name}",
-            content_type=ContentType.objects.get_for_model(Book),
-        )
-        logger.info(f"Permission {permission} created.")
-        comped_group, created = Group.objects.get_or_create(name="comped")
-        comped_group.permissions.add(permission)
-        logger.info(f"Permission {permission} added to comped_group.")
-
-    @hook(BEFORE_DELETE)
-    def remove_book_permission(self):
-        """
-        Remove the can_view_{book.slug} permission for associated book.
-        """
-        permission = Permission.objects.get(
-            codename=f"can_view_{self.slug}",
-            name=f"Can view {self.name}",
-            content_type=ContentType.objects.get_for_model(Book),
-        ).delete()
-        logger.info(f"Permission {permission} deleted.")
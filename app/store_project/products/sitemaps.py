@@ -8,7 +8,7 @@ class BookSitemap(Sitemap):
     priority = 0.5
 
     def items(self):
-        return Book.objects.filter(status=Book.PUBLIC)
+        return Book.objects.filter(status=Book.PUBLIC).only("slug", "modified")
 
     def lastmod(self, obj):
         return obj.modified
@@ -19,7 +19,9 @@ class ProgramSitemap(Sitemap):
     priority = 0.5
 
     def items(self):
-        return Program.objects.filter(status=Program.PUBLIC)
+        return Program.objects.filter(status=Program.PUBLIC).only(
+            "slug", "modified"
+        )
 
     def lastmod(self, obj):
         return obj.modified
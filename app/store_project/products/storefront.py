@@ -0,0 +1,109 @@
+"""
+Caching for the public storefront.
+
+Anonymous visitors all see the same catalog pages, so those responses are
+cached whole. Logged-in users see which products they own, so they only get
+the cached product card fragments (see `_product_cards.html`).
+
+Every cache key includes the storefront version, which the Product lifecycle
+hooks bump whenever something shown in the store changes, as does saving a
+product's author. The version is bumped once the change is committed, so a
+request in between can't cache the old page under the new version. Old
+entries are never read again and simply expire. The product RSS feed is
+cached under the same version.
+"""
+
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+
+
+VERSION_KEY = "storefront:version"
+
+
+def storefront_version() -> int:
+    return cache.get_or_set(VERSION_KEY, 1, None)
+
+
+def _bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def invalidate_storefront():
+    transaction.on_commit(_bump_version)
+
+
+def cache_storefront_page(view):
+    """
+    Cache the response of a storefront view for anonymous GET requests.
+    Authenticated users, including staff, always get a fresh page.
+    """
+
+    @wraps(view)
+    def wrapped_view(request, *args, **kwargs):
+        if (
+            request.method != "GET"
+            or request.user.is_authenticated
+            or len(get_messages(request))
+        ):
+            return view(request, *args, **kwargs)
+
+        key = f"storefront:{storefront_version()}:page:{request.get_full_path()}"
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200 or response.cookies:
+            return response
+
+        def store(response):
+            cache.set(key, response, settings.DEFAULT_CACHE_TIMEOUT)
+
+        if hasattr(response, "render") and not response.is_rendered:
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
+
+    return wrapped_view
+
+
+def product_categories_changed(sender, action, **kwargs):
+    if action in {"post_add", "post_remove", "post_clear"}:
+        invalidate_storefront()
+
+
+def author_saved(sender, instance, update_fields=None, **kwargs):
+    """Product pages and the feed show their author's name and email."""
+    from store_project.products.models import Book, Program
+
+    if update_fields is not None and not {"name", "email"} & set(update_fields):
+        return
+    if (
+        Program.objects.filter(author=instance).exists()
+        or Book.objects.filter(author=instance).exists()
+    ):
+        invalidate_storefront()
+
+
+def connect_signals():
+    from django.contrib.auth import get_user_model
+    from django.db.models.signals import m2m_changed, post_save
+
+    from store_project.products.models import Program
+
+    m2m_changed.connect(
+        product_categories_changed,
+        sender=Program.categories.through,
+        dispatch_uid="storefront_program_categories",
+    )
+    post_save.connect(
+        author_saved, sender=get_user_model(), dispatch_uid="storefront_author_saved"
+    )
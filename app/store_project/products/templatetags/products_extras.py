@@ -1,5 +1,8 @@
 from django import template
 
+from store_project.products.entitlements import user_owns
+from store_project.products.storefront import storefront_version as _storefront_version
+
 
 register = template.Library()
 
@@ -10,3 +13,20 @@ def concat(arg1, arg2):
     Concatenate two strings in template.
     """
     return str(arg1) + str(arg2)
+
+
+@register.filter
+def owns(user, product):
+    """
+    Has the user bought this product? Usage: {% if user|owns:program %}
+    """
+    return user_owns(user, product)
+
+
+@register.simple_tag
+def storefront_version():
+    """
+    Current storefront cache version, for keying cached fragments.
+    Usage: {% storefront_version as version %}
+    """
+    return _storefront_version()
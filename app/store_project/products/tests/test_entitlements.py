@@ -0,0 +1,89 @@
+import pytest
+
+from django.contrib.auth.models import AnonymousUser, Group
+
+from store_project.products.entitlements import owned_product_ids, user_owns
+from store_project.products.factories import BookFactory
+from store_project.products.models import Book, Entitlement, Program
+from store_project.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def test_user_owns_nothing(user: User, program: Program):
+    assert not user_owns(user, program)
+    assert not user_owns(AnonymousUser(), program)
+
+
+def test_superuser_owns_everything(superuser: User, program: Program):
+    assert user_owns(superuser, program)
+
+
+def test_user_owns_purchased_product(
+    user: User, program: Program, book: Book, django_capture_on_commit_callbacks
+):
+    assert not user_owns(user, program)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Entitlement.grant(user, program)
+
+    user = User.objects.get(pk=user.pk)
+    assert user_owns(user, program)
+    assert not user_owns(user, book)
+
+
+def test_uncommitted_entitlement_keeps_the_cache(user: User, program: Program):
+    assert not user_owns(User.objects.get(pk=user.pk), program)
+
+    # The test's transaction is never committed
+    Entitlement.grant(user, program)
+
+    assert not user_owns(User.objects.get(pk=user.pk), program)
+
+
+def test_revoked_entitlement(
+    user: User, program: Program, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        entitlement = Entitlement.grant(user, program)
+    assert user_owns(User.objects.get(pk=user.pk), program)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        entitlement.delete()
+
+    assert not user_owns(User.objects.get(pk=user.pk), program)
+
+
+def test_comped_group_owns_every_product(
+    user: User, program: Program, book: Book, django_capture_on_commit_callbacks
+):
+    assert not user_owns(user, book)
+
+    comped, created = Group.objects.get_or_create(name="comped")
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.add(comped)
+
+    assert owned_product_ids(user) == {str(program.pk), str(book.pk)}
+
+
+def test_new_product_invalidates_comped_group(
+    user: User, program: Program, django_capture_on_commit_callbacks
+):
+    comped, created = Group.objects.get_or_create(name="comped")
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.add(comped)
+    assert user_owns(User.objects.get(pk=user.pk), program)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        book = BookFactory()
+
+    assert user_owns(User.objects.get(pk=user.pk), book)
+
+
+def test_owned_product_ids_is_cached(user: User, program: Program, django_assert_num_queries):
+    Entitlement.grant(user, program)
+    owned_product_ids(User.objects.get(pk=user.pk))
+
+    fresh_user = User.objects.get(pk=user.pk)
+    with django_assert_num_queries(0):
+        assert user_owns(fresh_user, program)
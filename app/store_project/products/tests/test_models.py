@@ -1,13 +1,39 @@
+import importlib
+from io import StringIO
+from unittest import mock
+
 import pytest
 
-from django.contrib.auth.models import Permission
+from django.apps import apps
+from django.core.management import call_command
+from django.utils import timezone
+
+import stripe
 
 from store_project.products.factories import BookFactory, ProgramFactory
-from store_project.products.models import Book, Product, Program
+from store_project.products.models import (
+    Book,
+    Entitlement,
+    Product,
+    Program,
+    StripeSyncJob,
+)
+from store_project.products.storefront import storefront_version
+from store_project.users.models import User
 
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture
+def new_stripe_product():
+    """Products aren't in Stripe until the sync job creates them."""
+    with mock.patch(
+        "stripe.Product.retrieve",
+        side_effect=stripe.error.InvalidRequestError("No such product", "id"),
+    ) as retrieve:
+        yield retrieve
+
+
 def test_program_get_absolute_url(program: Program):
     assert program.get_absolute_url() == f"/programs/{program.slug}/"
 
@@ -21,18 +47,10 @@ def test_program_is_public(program: Program):
     assert not private_program.is_public()
 
 
-def test_program_add_permission(program: Program):
-    """Has lifecycle hook created a Permission for this program?"""
-    assert Permission.objects.get(codename=f"can_view_{program.slug}")
-    assert Permission.objects.get(name=f"Can view {program.name}")
-
-
-def test_program_remove_permission(program: Program):
-    """Bypassing the lifecycle hook due to errors with Stripe."""
-    program.remove_program_permission()
-    with pytest.raises(Permission.DoesNotExist):
-        assert Permission.objects.get(codename=f"can_view_{program.slug}")
-        assert Permission.objects.get(name=f"Can view {program.name}")
+def test_program_delete_removes_entitlements(user: User, program: Program):
+    Entitlement.grant(user, program)
+    program.delete()
+    assert not Entitlement.objects.exists()
 
 
 def test_book_get_absolute_url(book: Book):
@@ -48,15 +66,159 @@ def test_book_is_public(book: Book):
     assert not private_book.is_public()
 
 
-def test_book_add_permission(book: Book):
-    """Has lifecycle hook created a Permission for this book?"""
-    assert Permission.objects.get(codename=f"can_view_{book.slug}")
-    assert Permission.objects.get(name=f"Can view {book.name}")
-
-
-def test_book_remove_permission(book: Book):
-    """Bypassing the lifecycle hook due to errors with Stripe."""
-    book.remove_book_permission()
-    with pytest.raises(Permission.DoesNotExist):
-        assert Permission.objects.get(codename=f"can_view_{book.slug}")
-        assert Permission.objects.get(name=f"Can view {book.name}")
+def test_page_content_rendered_on_save():
+    book = BookFactory(page_content="### Title")
+    assert book.page_content_html == "<h3>Title</h3>"
+    book.page_content = "Some *emphasis*"
+    book.save()
+    book.refresh_from_db()
+    assert book.page_content_html == "<p>Some <em>emphasis</em></p>"
+
+
+def test_render_markdown_command_backfills(
+    program: Program, django_capture_on_commit_callbacks
+):
+    Program.objects.filter(pk=program.pk).update(
+        page_content="# Heading", page_content_html=""
+    )
+    version = storefront_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("render_markdown", stdout=StringIO())
+
+    program.refresh_from_db()
+    assert program.page_content_html == "<h1>Heading</h1>"
+    assert storefront_version() > version
+
+
+def test_unrendered_page_content_falls_back_to_markdown(program: Program):
+    Program.objects.filter(pk=program.pk).update(
+        page_content="# Heading", page_content_html=""
+    )
+    program.refresh_from_db()
+    assert program.get_page_content_html() == "<h1>Heading</h1>"
+
+
+def test_render_markdown_migration(
+    program: Program, django_capture_on_commit_callbacks
+):
+    migration = importlib.import_module(
+        "store_project.products.migrations.0009_render_markdown"
+    )
+    Program.objects.filter(pk=program.pk).update(
+        page_content="# Heading", page_content_html=""
+    )
+    version = storefront_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        migration.render_page_content(apps, None)
+
+    program.refresh_from_db()
+    assert program.page_content_html == "<h1>Heading</h1>"
+    assert storefront_version() > version
+
+
+def test_entitlement_grant(user: User, book: Book):
+    entitlement = Entitlement.grant(user, book)
+    assert Entitlement.grant(user, book) == entitlement
+    assert entitlement.product == book
+    assert entitlement.source == Entitlement.PURCHASE
+
+
+def test_program_create_queues_stripe_sync(program: Program):
+    """Creating a product should not call Stripe, only queue a job."""
+    job = StripeSyncJob.objects.get(object_id=program.id)
+    assert job.action == StripeSyncJob.CREATE_PRODUCT
+    assert job.status == StripeSyncJob.PENDING
+    assert job.get_product() == program
+
+
+def test_program_price_change_queues_stripe_sync(program: Program):
+    program.price = 20
+    program.save()
+    assert StripeSyncJob.objects.filter(
+        object_id=program.id, action=StripeSyncJob.UPDATE_PRICE
+    ).exists()
+
+
+def test_program_delete_queues_stripe_sync(program: Program):
+    program_id = program.id
+    program.delete()
+    job = StripeSyncJob.objects.get(
+        object_id=program_id, action=StripeSyncJob.DEACTIVATE
+    )
+    assert job.get_product() is None
+
+
+def test_stripe_sync_job_run(program: Program, new_stripe_product):
+    job = StripeSyncJob.objects.get(object_id=program.id)
+    with mock.patch("stripe.Product.create") as product_create, mock.patch(
+        "stripe.Price.create", return_value=mock.Mock(id="price_123")
+    ):
+        job.run()
+
+    product_create.assert_called_once()
+    job.refresh_from_db()
+    program.refresh_from_db()
+    assert job.status == StripeSyncJob.DONE
+    assert job.attempts == 1
+    assert program.stripe_price_id == "price_123"
+
+
+def test_stripe_sync_job_retry(program: Program, new_stripe_product):
+    job = StripeSyncJob.objects.get(object_id=program.id)
+    with mock.patch(
+        "stripe.Product.create", side_effect=stripe.error.APIConnectionError("down")
+    ):
+        job.run()
+
+    job.refresh_from_db()
+    assert job.status == StripeSyncJob.PENDING
+    assert job.attempts == 1
+    assert job.next_attempt_at > timezone.now()
+    assert "down" in job.last_error
+
+
+def test_stripe_sync_job_retry_after_pricing_failed(program: Program):
+    job = StripeSyncJob.objects.get(object_id=program.id)
+    job.attempts = 1
+    # The product was created by the attempt whose price failed
+    with mock.patch("stripe.Product.retrieve") as product_retrieve, mock.patch(
+        "stripe.Product.create"
+    ) as product_create, mock.patch(
+        "stripe.Price.create", return_value=mock.Mock(id="price_123")
+    ):
+        job.run()
+
+    assert product_retrieve.call_args.args == (str(program.id),)
+    product_create.assert_not_called()
+    job.refresh_from_db()
+    program.refresh_from_db()
+    assert job.status == StripeSyncJob.DONE
+    assert program.stripe_price_id == "price_123"
+
+
+def test_stripe_sync_job_gives_up(program: Program, new_stripe_product):
+    job = StripeSyncJob.objects.get(object_id=program.id)
+    job.attempts = StripeSyncJob.MAX_ATTEMPTS - 1
+    with mock.patch(
+        "stripe.Product.create", side_effect=stripe.error.APIConnectionError("down")
+    ):
+        job.run()
+
+    job.refresh_from_db()
+    assert job.status == StripeSyncJob.FAILED
+
+
+def test_sync_stripe_command(new_stripe_product):
+    programs = ProgramFactory.create_batch(2)
+    stdout = StringIO()
+    with mock.patch("stripe.Product.create"), mock.patch(
+        "stripe.Price.create", return_value=mock.Mock(id="price_123")
+    ):
+        call_command("sync_stripe", "--once", stdout=stdout)
+
+    assert "Processed 2 Stripe sync jobs." in stdout.getvalue()
+    for program in programs:
+        job = StripeSyncJob.objects.get(object_id=program.id)
+        assert job.status == StripeSyncJob.DONE
@@ -0,0 +1,95 @@
+import pytest
+
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.test import Client
+
+from store_project.products.models import Program
+from store_project.products.storefront import storefront_version
+from store_project.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_anonymous_store_is_cached(program: Program, django_assert_num_queries):
+    client = Client()
+    first = client.get("/store/")
+    assert first.status_code == 200
+    assert program.name in first.content.decode()
+
+    with django_assert_num_queries(0):
+        second = client.get("/store/")
+    assert second.content == first.content
+
+
+def test_product_change_invalidates_store(
+    program: Program, django_capture_on_commit_callbacks
+):
+    client = Client()
+    client.get("/store/")
+    version = storefront_version()
+
+    program.name = "A Brand New Name"
+    with django_capture_on_commit_callbacks(execute=True):
+        program.save()
+
+    assert storefront_version() > version
+    assert "A Brand New Name" in client.get("/store/").content.decode()
+
+
+def test_uncommitted_change_keeps_store_cached(program: Program):
+    client = Client()
+    client.get("/store/")
+    version = storefront_version()
+
+    # The test's transaction is never committed
+    program.name = "A Brand New Name"
+    program.save()
+
+    assert storefront_version() == version
+    assert "A Brand New Name" not in client.get("/store/").content.decode()
+
+
+def test_unrelated_change_keeps_store_cached(
+    program: Program, django_capture_on_commit_callbacks
+):
+    version = storefront_version()
+    program.views = 10
+    with django_capture_on_commit_callbacks(execute=True):
+        program.save()
+    assert storefront_version() == version
+
+
+def test_staff_bypass_store_cache(superuser: User, program: Program):
+    Client().get(f"/programs/{program.slug}/")
+    program.status = Program.DRAFT
+    program.save(skip_hooks=True)
+
+    client = Client()
+    client.force_login(superuser)
+    response = client.get(f"/programs/{program.slug}/")
+    assert "DRAFT" in response.content.decode()
+
+
+def test_product_cards_use_default_cache_timeout(user: User, program: Program, settings):
+    settings.DEFAULT_CACHE_TIMEOUT = 60
+    client = Client()
+    client.force_login(user)
+
+    response = client.get("/store/")
+
+    assert response.context["cache_timeout"] == 60
+    assert program.name in response.content.decode()
+
+
+def test_author_login_keeps_store_cached(program: Program):
+    version = storefront_version()
+    update_last_login(None, program.author)
+    assert storefront_version() == version
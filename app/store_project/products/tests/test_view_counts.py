@@ -0,0 +1,67 @@
+import pytest
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client
+
+from store_project.products.factories import BookFactory, ProgramFactory
+from store_project.products.models import Book, Program, StripeSyncJob
+from store_project.products.view_counts import flush_views, record_view
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_detail_views_are_counted_without_writes(
+    program: Program, django_assert_num_queries
+):
+    client = Client()
+    client.get(f"/programs/{program.slug}/")
+    with django_assert_num_queries(0):
+        client.get(f"/programs/{program.slug}/")
+
+    program.refresh_from_db()
+    assert program.views == 0
+    assert flush_views() == 2
+    program.refresh_from_db()
+    assert program.views == 2
+
+
+def test_missing_products_are_not_counted(program: Program):
+    Client().get("/programs/does-not-exist/")
+    assert flush_views() == 0
+
+
+def test_flush_adds_to_existing_views(book: Book):
+    Book.objects.filter(pk=book.pk).update(views=5)
+    for _ in range(3):
+        record_view(Book, book.slug)
+    modified = book.modified
+    jobs = StripeSyncJob.objects.count()
+
+    call_command("flush_product_views")
+
+    book.refresh_from_db()
+    assert book.views == 8
+    assert book.modified == modified
+    assert StripeSyncJob.objects.count() == jobs
+    assert flush_views() == 0
+
+
+def test_flush_finds_every_counter(monkeypatch):
+    monkeypatch.setattr("store_project.products.view_counts.FLUSH_BATCH_SIZE", 2)
+    programs = ProgramFactory.create_batch(5)
+    book = BookFactory()
+    for product in [*programs, book]:
+        record_view(type(product), product.slug)
+
+    assert flush_views() == 6
+    assert list(Program.objects.values_list("views", flat=True)) == [1] * 5
+    book.refresh_from_db()
+    assert book.views == 1
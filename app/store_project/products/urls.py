@@ -1,5 +1,8 @@
 from django.urls import path
 
+from .models import Book, Program
+from .storefront import cache_storefront_page
+from .view_counts import count_product_views
 from .views import (
     BookDetailView,
     BookListView,
@@ -13,27 +16,31 @@ app_name = "products"
 urlpatterns = [
     path(
         "store/",
-        StoreView.as_view(),
+        cache_storefront_page(StoreView.as_view()),
         name="store"
     ),
     path(
         "books/<str:slug>/",
-        BookDetailView.as_view(),
+        count_product_views(Book)(
+            cache_storefront_page(BookDetailView.as_view())
+        ),
         name="book_detail"
     ),
     path(
         "books/",
-        BookListView.as_view(),
+        cache_storefront_page(BookListView.as_view()),
         name="book_list"
     ),
     path(
         "programs/<str:slug>/",
-        ProgramDetailView.as_view(),
+        count_product_views(Program)(
+            cache_storefront_page(ProgramDetailView.as_view())
+        ),
         name="program_detail"
     ),
     path(
         "programs/",
-        ProgramListView.as_view(),
+        cache_storefront_page(ProgramListView.as_view()),
         name="program_list"
     ),
 ]
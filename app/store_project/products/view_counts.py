@@ -0,0 +1,89 @@
+"""
+Product page view counting.
+
+Detail views don't write to the database. Each view adds one to a counter in
+the default cache, and the `flush_product_views` command periodically moves
+those counts onto `Product.views` with one `UPDATE ... SET views = views + n`
+per product. Queryset updates skip the lifecycle hooks and leave `modified`
+alone, so counting views never queues Stripe syncs or clears the storefront.
+
+There's no list of pending counters to keep in step between processes: the
+flush looks up the counter of every product in the catalog, which is small,
+with a few `get_many()` calls.
+"""
+
+from functools import wraps
+from itertools import islice
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import F
+
+
+KEY_PREFIX = "product_views"
+COUNTED_MODELS = ["products.program", "products.book"]
+# Counters read per get_many()
+FLUSH_BATCH_SIZE = 500
+
+
+def _counter_key(model_label: str, slug: str) -> str:
+    return f"{KEY_PREFIX}:{model_label}:{slug}"
+
+
+def record_view(model, slug: str):
+    key = _counter_key(model._meta.label_lower, slug)
+    # add() is a no-op if the key exists, so concurrent requests can't reset
+    # each other's counts.
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def count_product_views(model):
+    """
+    Count successful hits on a product detail view, including ones answered
+    from the storefront page cache, so wrap this outside the cache.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped_view(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if request.method == "GET" and response.status_code == 200:
+                record_view(model, kwargs["slug"])
+            return response
+
+        return wrapped_view
+
+    return decorator
+
+
+def flush_views() -> int:
+    """
+    Write pending view counts to the database. Returns the number of views
+    written.
+    """
+    total = 0
+    for model_label in COUNTED_MODELS:
+        model = apps.get_model(model_label)
+        slugs = model.objects.values_list("slug", flat=True).iterator(
+            chunk_size=FLUSH_BATCH_SIZE
+        )
+        while True:
+            keys = {
+                _counter_key(model_label, slug): slug
+                for slug in islice(slugs, FLUSH_BATCH_SIZE)
+            }
+            if not keys:
+                break
+            for key, count in cache.get_many(list(keys)).items():
+                if not count:
+                    continue
+                # Take away only what is being written, keeping views counted
+                # since.
+                cache.decr(key, count)
+                model.objects.filter(slug=keys[key]).update(views=F("views") + count)
+                total += count
+    return total
@@ -1,11 +1,11 @@
 from itertools import chain
 
+from django.conf import settings
 from django.views.generic.base import TemplateView
 from django.views.generic.detail import DetailView
 from django.views.generic.list import ListView
 
-from markdownx.utils import markdownify
-
+from .entitlements import user_owns
 from .models import Book, Program
 
 
@@ -26,6 +26,8 @@ class StoreView(TemplateView):
 
         context["programs"] = programs
         context["books"] = books
+        # How long the product card fragments are cached for
+        context["cache_timeout"] = settings.DEFAULT_CACHE_TIMEOUT
 
         return context
 
@@ -49,7 +51,8 @@ class ProgramDetailView(DetailView):
 
     def get_context_data(self, **kwargs):
         context = super(ProgramDetailView, self).get_context_data(**kwargs)
-        context["content"] = markdownify(self.object.page_content)
+        context["content"] = self.object.get_page_content_html()
+        context["owned"] = user_owns(self.request.user, self.object)
         return context
 
 
@@ -72,5 +75,6 @@ class BookDetailView(DetailView):
 
     def get_context_data(self, **kwargs):
         context = super(BookDetailView, self).get_context_data(**kwargs)
-        context["content"] = markdownify(self.object.page_content)
+        context["content"] = self.object.get_page_content_html()
+        context["owned"] = user_owns(self.request.user, self.object)
         return context
@@ -6,3 +6,11 @@ class TrackingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'store_project.tracking'
     verbose_name = _("Tracking")
+
+    def ready(self):
+        from store_project.tracking import leaderboard, progress
+        from store_project.tracking.measurement_types import register_measurement_types
+
+        register_measurement_types()
+        leaderboard.connect_signals()
+        progress.connect_signals()
@@ -0,0 +1,91 @@
+"""
+Exporting results as CSV, streamed to the browser.
+
+Rows are read as tuples with `values_list()`, so no models are created, and
+with `iterator()`, which uses a server-side cursor on PostgreSQL, so only one
+chunk of rows is in memory at a time however many results there are. The
+columns match what `tracking.importer` reads.
+"""
+
+import csv
+
+from store_project.tracking.models import Result
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Export:
+    def __init__(self, filename, columns, queryset):
+        """`columns` are (header, lookup) pairs."""
+        self.filename = filename
+        self.columns = columns
+        self.queryset = queryset
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    def rows(self):
+        lookups = [lookup for _, lookup in self.columns]
+        return self.queryset.order_by().values_list(*lookups).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+
+
+def measures_export(test, user=None) -> Export:
+    """A test's measurements, only `user`'s if given."""
+    model = test.measure_model
+    measures = model.objects.filter(test=test)
+    if user is not None:
+        measures = measures.filter(user=user)
+    return Export(
+        f"{test.slug}-results",
+        [
+            ("test", "test__slug"),
+            ("user", "user__username"),
+            ("value", "value"),
+            ("unit", "unit"),
+            (f"canonical_value_{model.CANONICAL_UNIT}", "canonical_value"),
+            ("date", "created"),
+        ],
+        measures,
+    )
+
+
+def results_export(athlete_id=None) -> Export:
+    """Exercise Results, only those of `athlete_id` if given."""
+    results = Result.objects.all()
+    if athlete_id is not None:
+        results = results.filter(athlete_id=athlete_id)
+    return Export(
+        "exercise-results",
+        [
+            ("exercise", "exercise__slug"),
+            ("athlete", "athlete_id"),
+            ("scheduled", "scheduled"),
+            ("completed", "completed"),
+            ("reps", "reps"),
+            ("weight", "weight"),
+            ("height", "height"),
+            ("distance", "distance"),
+            ("duration", "duration"),
+            ("notes", "notes"),
+        ],
+        results,
+    )
+
+
+class _Echo:
+    """A file that returns what's written to it, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(export: Export):
+    """The export as CSV, one line at a time."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(export.headers)
+    for row in export.rows():
+        yield writer.writerow(row)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from django.utils.text import slugify
+
+import factory
+from factory.django import DjangoModelFactory
+
+from store_project.exercises.factories import ExerciseFactory
+from store_project.users.factories import UserFactory
+from .models import (
+    Athlete,
+    DistanceMeasure,
+    DurationMeasure,
+    LoadMeasure,
+    PowerMeasure,
+    Result,
+    Test,
+    UnitsOfDistance,
+    UnitsOfLoad,
+    UnitsOfPower,
+    UnitsOfTime,
+)
+
+
+class TestFactory(DjangoModelFactory):
+    class Meta:
+        model = Test
+
+    name = factory.Sequence(lambda n: f"Test {n}")
+    slug = factory.LazyAttribute(lambda o: slugify(o.name))
+    video = ""
+    measurement_type = factory.LazyFunction(
+        lambda: ContentType.objects.get_for_model(LoadMeasure)
+    )
+
+
+class LoadMeasureFactory(DjangoModelFactory):
+    class Meta:
+        model = LoadMeasure
+
+    test = factory.SubFactory(TestFactory)
+    user = factory.SubFactory(UserFactory)
+    value = 100
+    unit = UnitsOfLoad.KILOS
+
+
+class PowerMeasureFactory(LoadMeasureFactory):
+    class Meta:
+        model = PowerMeasure
+
+    unit = UnitsOfPower.WATTS
+
+
+class DistanceMeasureFactory(LoadMeasureFactory):
+    class Meta:
+        model = DistanceMeasure
+
+    unit = UnitsOfDistance.METERS
+
+
+class DurationMeasureFactory(LoadMeasureFactory):
+    class Meta:
+        model = DurationMeasure
+
+    value = timedelta(minutes=5)
+    unit = UnitsOfTime.DURATION
+
+
+class AthleteFactory(DjangoModelFactory):
+    class Meta:
+        model = Athlete
+
+
+class ResultFactory(DjangoModelFactory):
+    class Meta:
+        model = Result
+
+    athlete = factory.SubFactory(AthleteFactory)
+    exercise = factory.SubFactory(ExerciseFactory)
+    completed = factory.LazyFunction(timezone.now)
+    reps = 5
+    weight = 100000
+    height = 0
+    distance = 0
+    duration = timedelta()
@@ -1,6 +1,12 @@
+import csv
+import io
+
 from django import forms
+from django.core.exceptions import ValidationError
 from django.forms.models import inlineformset_factory
 
+from store_project.users.models import User
+
 from .models import (
     DistanceMeasure,
     DurationMeasure,
@@ -10,6 +16,10 @@ from .models import (
 )
 
 
+# Blank rows shown for entering results in bulk
+BULK_RESULT_ROWS = 10
+
+
 class TestForm(forms.ModelForm):
     class Meta:
         model = Test
@@ -80,6 +90,7 @@ LoadMeasureTestFormSet = inlineformset_factory(
     Test,
     LoadMeasure,
     form=LoadMeasureStaffForm,
+    extra=BULK_RESULT_ROWS,
     can_delete=False,
 )
 
@@ -105,6 +116,7 @@ PowerMeasureTestFormSet = inlineformset_factory(
     Test,
     PowerMeasure,
     form=PowerMeasureStaffForm,
+    extra=BULK_RESULT_ROWS,
     can_delete=False,
 )
 
@@ -130,6 +142,7 @@ DistanceMeasureTestFormSet = inlineformset_factory(
     Test,
     DistanceMeasure,
     form=DistanceMeasureStaffForm,
+    extra=BULK_RESULT_ROWS,
     can_delete=False,
 )
 
@@ -155,5 +168,73 @@ DurationMeasureTestFormSet = inlineformset_factory(
     Test,
     DurationMeasure,
     form=DurationMeasureStaffForm,
+    extra=BULK_RESULT_ROWS,
     can_delete=False,
 )
+
+
+class BulkResultsCSVForm(forms.Form):
+    """
+    Results pasted as CSV, one `username,value,unit` row per line
+
+    The rows are turned into data for a MeasureTestFormSet, so each is
+    validated the same way as rows entered in the formset.
+    """
+
+    pasted = forms.CharField(
+        label="Paste results",
+        widget=forms.Textarea(attrs={"rows": BULK_RESULT_ROWS}),
+        help_text="One result per line: username, value, unit",
+    )
+
+    def clean_pasted(self):
+        rows = []
+        reader = csv.reader(io.StringIO(self.cleaned_data["pasted"].strip()))
+        for line, row in enumerate(reader, start=1):
+            row = [cell.strip() for cell in row]
+            if not any(row):
+                continue
+            if len(row) != 3:
+                raise ValidationError(
+                    "Line %(line)s should be: username, value, unit",
+                    params={"line": line},
+                )
+            rows.append(row)
+        if not rows:
+            raise ValidationError("Paste at least one result")
+
+        self.user_ids = dict(
+            User.objects.filter(
+                username__in={username for username, _, _ in rows}
+            ).values_list("username", "pk")
+        )
+        unknown = sorted({username for username, _, _ in rows} - set(self.user_ids))
+        if unknown:
+            raise ValidationError(
+                "Unknown usernames: %(usernames)s",
+                params={"usernames": ", ".join(unknown)},
+            )
+        return rows
+
+    def formset_data(self, prefix):
+        rows = self.cleaned_data["pasted"]
+        data = {
+            f"{prefix}-TOTAL_FORMS": len(rows),
+            f"{prefix}-INITIAL_FORMS": 0,
+        }
+        for i, (username, value, unit) in enumerate(rows):
+            data[f"{prefix}-{i}-user"] = self.user_ids[username]
+            data[f"{prefix}-{i}-value"] = value
+            data[f"{prefix}-{i}-unit"] = unit
+        return data
+
+
+class ResultImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV or JSON Lines, one result per row")
+    format = forms.ChoiceField(
+        choices=[("", "From the file name"), ("csv", "CSV"), ("jsonl", "JSON Lines")],
+        required=False,
+    )
+    dry_run = forms.BooleanField(
+        label="Only check the file", required=False
+    )
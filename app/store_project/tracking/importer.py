@@ -0,0 +1,347 @@
+"""
+Importing historical results from CSV or JSON Lines files.
+
+Each row is either a test measurement, with the columns
+
+    test, user, value, unit, date
+
+where `test` is a Test's slug, `user` a username and `date` optional, or an
+exercise Result, with the columns
+
+    exercise, athlete, completed, reps, weight, height, distance, duration, notes
+
+where `exercise` is an Exercise's slug and `athlete` an Athlete's ID. Result
+weights, heights and distances may end in a unit, e.g. "100 kg" or "5 km",
+and are converted to the grams and millimeters they're stored in; without
+one they're taken to be in those units already. Durations are seconds or
+"[HH:]MM:SS".
+
+Rows are read one at a time, and references are resolved with lookup tables
+loaded once per import, so checking a row doesn't query the database. Valid
+rows are inserted in batches with `bulk_create`, each batch in its own
+transaction along with the progress rollups it touched; invalid rows are
+skipped and reported by line number, so memory use stays the same however
+long the file is.
+"""
+
+from collections import defaultdict
+import csv
+from datetime import datetime, time
+import io
+import json
+import re
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_duration
+
+from store_project.exercises.models import Exercise
+from store_project.tracking import leaderboard, progress
+from store_project.tracking.models import (
+    Athlete,
+    DurationMeasure,
+    Result,
+    Test,
+)
+from store_project.users.models import User
+
+
+BATCH_SIZE = 1000
+# Errors kept for the report. Any more are only counted.
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ("csv", "jsonl")
+
+# Other ways spreadsheets spell the measure units
+UNIT_ALIASES = {
+    "lbs": "lb",
+    "pound": "lb",
+    "pounds": "lb",
+    "kgs": "kg",
+    "kilo": "kg",
+    "kilos": "kg",
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "w": "W",
+    "watt": "W",
+    "watts": "W",
+    "meter": "m",
+    "meters": "m",
+    "metre": "m",
+    "metres": "m",
+    "mile": "mi",
+    "miles": "mi",
+    "foot": "ft",
+    "feet": "ft",
+    "inch": "in",
+    "inches": "in",
+    "yard": "yd",
+    "yards": "yd",
+}
+# Result weights are stored in grams, and heights and distances in millimeters
+WEIGHT_UNITS = {"g": 1, "kg": 1000, "lb": 453.59237, "lbs": 453.59237}
+LENGTH_UNITS = {
+    "mm": 1,
+    "cm": 10,
+    "m": 1000,
+    "km": 1_000_000,
+    "in": 25.4,
+    "ft": 304.8,
+    "yd": 914.4,
+    "mi": 1_609_344,
+}
+QUANTITY_RE = re.compile(r"^(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[a-zA-Z]*)$")
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = defaultdict(int)
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def created_count(self):
+        return sum(self.created.values())
+
+
+def guess_format(filename):
+    if filename.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return "csv"
+
+
+def _read_csv(text):
+    reader = csv.DictReader(text)
+    try:
+        for row in reader:
+            yield reader.line_num, {
+                # Values past the header's columns are under None
+                key.strip().lower(): (value or "").strip()
+                for key, value in row.items()
+                if key is not None
+            }
+    except csv.Error as exc:
+        yield reader.line_num, RowError(f"Malformed CSV, stopped reading: {exc}")
+
+
+def _read_jsonl(text):
+    for line, data in enumerate(text, start=1):
+        if not data.strip():
+            continue
+        if line == 1 and data.lstrip().startswith("["):
+            yield line, RowError(
+                "Expected JSON Lines, one object per line, not a JSON array"
+            )
+            return
+        try:
+            row = json.loads(data)
+        except ValueError as exc:
+            yield line, exc
+            continue
+        if not isinstance(row, dict):
+            yield line, RowError("Each line should be a JSON object")
+            continue
+        yield line, {
+            key.strip().lower(): "" if value is None else str(value).strip()
+            for key, value in row.items()
+        }
+
+
+def read_rows(file, format):
+    """
+    (line number, row) pairs from the binary `file`, with lowercase column
+    names and stripped values. Rows that can't be read are RowErrors
+    instead, and reading stops at text that isn't UTF-8.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}")
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    rows = _read_csv(text) if format == "csv" else _read_jsonl(text)
+    line = 0
+    try:
+        for line, row in rows:
+            yield line, row
+    except UnicodeDecodeError as exc:
+        yield line + 1, RowError(f"Not UTF-8 text, stopped reading: {exc}")
+
+
+def _datetime(value, column):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise RowError(f"{column} should be a date or date and time: {value!r}")
+        parsed = datetime.combine(day, time())
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _duration(value, column):
+    parsed = parse_duration(value)
+    if parsed is None:
+        raise RowError(f"{column} should be seconds or [HH:]MM:SS: {value!r}")
+    return parsed
+
+
+def _whole_number(value, column):
+    try:
+        number = int(value)
+    except ValueError:
+        raise RowError(f"{column} should be a whole number: {value!r}")
+    if number < 0:
+        raise RowError(f"{column} can't be negative: {value!r}")
+    return number
+
+
+def _quantity(value, column, units):
+    """`value` in the smallest of `units`, rounded to a whole number."""
+    if not value:
+        return 0
+    match = QUANTITY_RE.match(value)
+    if not match:
+        raise RowError(f"{column} should be a number and unit: {value!r}")
+    unit = match["unit"].lower()
+    if unit and unit not in units:
+        raise RowError(
+            f"{column} unit should be one of {', '.join(units)}: {value!r}"
+        )
+    return round(float(match["number"]) * units.get(unit, 1))
+
+
+class ResultImporter:
+    def __init__(self, batch_size=BATCH_SIZE, dry_run=False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.report = ImportReport()
+        self.pending = defaultdict(list)
+        self.pending_count = 0
+        self.imported_tests = set()
+
+    def load_lookups(self):
+        self.tests = {
+            test.slug: test
+            for test in Test.objects.select_related("measurement_type").only(
+                "pk", "slug", "measurement_type"
+            )
+        }
+        self.exercises = dict(Exercise.objects.values_list("slug", "pk"))
+        self.users = dict(User.objects.values_list("username", "pk"))
+        self.athletes = {str(pk) for pk in Athlete.objects.values_list("pk", flat=True)}
+
+    def run(self, rows) -> ImportReport:
+        """Import the (line number, row) pairs from `read_rows()`."""
+        self.load_lookups()
+        for line, row in rows:
+            self.report.rows += 1
+            try:
+                if isinstance(row, Exception):
+                    raise RowError(str(row))
+                obj = self.build(row)
+            except RowError as exc:
+                self.report.add_error(line, str(exc))
+                continue
+            self.pending[type(obj)].append(obj)
+            self.pending_count += 1
+            if self.pending_count >= self.batch_size:
+                self.flush()
+        self.flush()
+        self.finish()
+        return self.report
+
+    def build(self, row):
+        if row.get("test"):
+            return self.build_measure(row)
+        if row.get("exercise"):
+            return self.build_result(row)
+        raise RowError("Each row needs a test or an exercise")
+
+    def build_measure(self, row):
+        test = self.tests.get(row["test"])
+        if test is None:
+            raise RowError(f"Unknown test: {row['test']!r}")
+        user_id = self.users.get(row.get("user", ""))
+        if user_id is None:
+            raise RowError(f"Unknown user: {row.get('user', '')!r}")
+
+        model = test.measure_model
+        unit = row.get("unit", "")
+        unit = UNIT_ALIASES.get(unit.lower(), unit)
+        unit_field = model._meta.get_field("unit")
+        if not unit and unit_field.has_default():
+            unit = unit_field.get_default()
+        units = [choice for choice, _ in unit_field.choices]
+        if unit not in units:
+            raise RowError(
+                f"unit for {test.slug} should be one of {', '.join(units)}: {unit!r}"
+            )
+        if model is DurationMeasure:
+            value = _duration(row.get("value", ""), "value")
+        else:
+            value = _whole_number(row.get("value", ""), "value")
+
+        measure = model(
+            test_id=test.pk,
+            user_id=user_id,
+            value=value,
+            unit=unit,
+            # bulk_create() skips save(), which sets this
+            canonical_value=model.to_canonical(value, unit),
+        )
+        if row.get("date"):
+            measure.created = _datetime(row["date"], "date")
+        self.imported_tests.add(test)
+        return measure
+
+    def build_result(self, row):
+        exercise_id = self.exercises.get(row["exercise"])
+        if exercise_id is None:
+            raise RowError(f"Unknown exercise: {row['exercise']!r}")
+        try:
+            athlete_id = str(uuid.UUID(row.get("athlete", "")))
+        except ValueError:
+            athlete_id = None
+        if athlete_id not in self.athletes:
+            raise RowError(f"Unknown athlete: {row.get('athlete', '')!r}")
+        return Result(
+            athlete_id=athlete_id,
+            exercise_id=exercise_id,
+            completed=(
+                _datetime(row["completed"], "completed") if row.get("completed") else None
+            ),
+            reps=_whole_number(row.get("reps") or "0", "reps"),
+            weight=_quantity(row.get("weight", ""), "weight", WEIGHT_UNITS),
+            height=_quantity(row.get("height", ""), "height", LENGTH_UNITS),
+            distance=_quantity(row.get("distance", ""), "distance", LENGTH_UNITS),
+            duration=_duration(row.get("duration") or "0", "duration"),
+            notes=row.get("notes", ""),
+        )
+
+    def flush(self):
+        if not self.dry_run:
+            with transaction.atomic():
+                for model, objs in self.pending.items():
+                    model.objects.bulk_create(objs)
+                # bulk_create() sends no signals to update these
+                progress.rebuild_rollups_of(self.pending.get(Result, []))
+        for model, objs in self.pending.items():
+            self.report.created[model.__name__] += len(objs)
+        self.pending.clear()
+        self.pending_count = 0
+
+    def finish(self):
+        """Update what bulk_create() skipped the signals for."""
+        if self.dry_run:
+            return
+        for test in self.imported_tests:
+            leaderboard.invalidate_summary(test)
@@ -0,0 +1,170 @@
+"""
+Leaderboards and summary statistics for tests, computed in SQL on the
+measures' `canonical_value`, so results recorded in different units compare
+correctly.
+
+Summary statistics are cached per test, under a version that changes once a
+measurement of the test is added, changed or deleted and the change is
+committed. Statistics computed while a change commits are stored under the
+version they were computed for, so they're never read.
+"""
+
+import math
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Max, Min, Sum, Window
+from django.db.models.functions import PercentRank, Rank
+
+from store_project.tracking.models import MEASURE_MODELS
+
+
+LEADERBOARD_PAGE_SIZE = 50
+
+
+def _best(model):
+    return Max("canonical_value") if model.HIGHER_IS_BETTER else Min("canonical_value")
+
+
+def _ordering(model, expression, worst_first=False):
+    if model.HIGHER_IS_BETTER != worst_first:
+        return expression.desc()
+    return expression.asc()
+
+
+def athlete_bests(test):
+    """Each athlete's best result for `test`, as `best`, grouped by user."""
+    model = test.measure_model
+    return (
+        model.objects.filter(test=test, user__isnull=False)
+        .values("user_id", "user__name", "user__username")
+        .annotate(best=_best(model))
+    )
+
+
+def leaderboard(test, page=1, page_size=LEADERBOARD_PAGE_SIZE):
+    """
+    One page of athletes ranked by their best result, with `rank` (ties share
+    a rank) and `percentile` (the share of other athletes they beat, 0-100).
+    """
+    model = test.measure_model
+    ranked = athlete_bests(test).annotate(
+        rank=Window(Rank(), order_by=_ordering(model, F("best"))),
+        # Worst first, so the best athlete is at the 100th percentile
+        percent_rank=Window(
+            PercentRank(), order_by=_ordering(model, F("best"), worst_first=True)
+        ),
+    ).order_by("rank", "user__username")
+    start = (page - 1) * page_size
+    return [
+        {
+            "user_id": row["user_id"],
+            "name": row["user__name"] or row["user__username"],
+            "best": row["best"],
+            "rank": row["rank"],
+            "percentile": round(row["percent_rank"] * 100, 1),
+        }
+        for row in ranked[start:start + page_size]
+    ]
+
+
+def percentile(test, value):
+    """
+    The share of athletes, 0-100, whose best result for `test` is worse than
+    `value` in canonical units. `None` if nobody has done the test.
+    """
+    model = test.measure_model
+    bests = athlete_bests(test)
+    total = bests.count()
+    if not total:
+        return None
+    lookup = "best__lt" if model.HIGHER_IS_BETTER else "best__gt"
+    worse = bests.filter(**{lookup: value}).count()
+    return round(worse / total * 100, 1)
+
+
+def _version_key(test_id):
+    return f"tracking:stats:{test_id}:version"
+
+
+def _stats_key(test_id):
+    version = cache.get_or_set(_version_key(test_id), uuid.uuid4().hex, None)
+    return f"tracking:stats:{test_id}:{version}"
+
+
+def _load_stats(test):
+    model = test.measure_model
+    return model.objects.filter(test=test, canonical_value__isnull=False).aggregate(
+        count=Count("pk"),
+        total=Sum("canonical_value"),
+        total_squares=Sum(
+            F("canonical_value") * F("canonical_value"), output_field=FloatField()
+        ),
+        minimum=Min("canonical_value"),
+        maximum=Max("canonical_value"),
+        athletes=Count("user", distinct=True),
+    )
+
+
+def summary(test):
+    """
+    Count, mean, standard deviation, minimum and maximum of every result for
+    `test`, plus the number of athletes, in canonical units.
+    """
+    key = _stats_key(test.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = _load_stats(test)
+        cache.set(key, stats, settings.DEFAULT_CACHE_TIMEOUT)
+
+    count = stats["count"]
+    if not count:
+        return {"count": 0, "athletes": 0}
+    mean = stats["total"] / count
+    variance = max(stats["total_squares"] / count - mean * mean, 0)
+    return {
+        "count": count,
+        "athletes": stats["athletes"],
+        "mean": mean,
+        "stddev": math.sqrt(variance),
+        "minimum": stats["minimum"],
+        "maximum": stats["maximum"],
+        "unit": test.measure_model.CANONICAL_UNIT,
+    }
+
+
+def _invalidate(test_id):
+    transaction.on_commit(
+        lambda: cache.set(_version_key(test_id), uuid.uuid4().hex, None)
+    )
+
+
+def invalidate_summary(test):
+    """
+    Recompute the statistics for `test` once the current transaction
+    commits, after measures are written without sending signals, e.g. with
+    `bulk_create`.
+    """
+    _invalidate(test.pk)
+
+
+def measure_changed(sender, instance, **kwargs):
+    _invalidate(instance.test_id)
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save
+
+    for model in MEASURE_MODELS:
+        post_save.connect(
+            measure_changed,
+            sender=model,
+            dispatch_uid=f"leaderboard_{model._meta.model_name}_saved",
+        )
+        post_delete.connect(
+            measure_changed,
+            sender=model,
+            dispatch_uid=f"leaderboard_{model._meta.model_name}_deleted",
+        )
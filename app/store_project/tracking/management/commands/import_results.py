@@ -0,0 +1,58 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from store_project.tracking.importer import (
+    BATCH_SIZE,
+    FORMATS,
+    ResultImporter,
+    guess_format,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Imports test measurements and exercise results from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='The file to import, or "-" for stdin')
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Defaults to jsonl for .json, .jsonl and .ndjson files, else csv",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Check every row without saving anything",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        format = options["format"] or guess_format(path)
+        importer = ResultImporter(
+            batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        if path == "-":
+            report = importer.run(read_rows(sys.stdin.buffer, format))
+        else:
+            try:
+                file = open(path, "rb")
+            except OSError as exc:
+                raise CommandError(f"Could not open {path}: {exc}")
+            with file:
+                report = importer.run(read_rows(file, format))
+
+        for line, message in report.errors:
+            self.stdout.write(self.style.WARNING(f"Line {line}: {message}"))
+        if report.error_count > len(report.errors):
+            self.stdout.write(
+                f"...and {report.error_count - len(report.errors)} more errors."
+            )
+        verb = "Checked" if options["dry_run"] else "Imported"
+        for model, count in report.created.items():
+            self.stdout.write(f"{verb} {count} {model} rows.")
+        self.stdout.write(
+            f"Read {report.rows} rows, skipped {report.error_count} with errors."
+        )
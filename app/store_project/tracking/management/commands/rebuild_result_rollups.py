@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from store_project.tracking.models import RollupPeriod
+from store_project.tracking.progress import rebuild_rollups
+
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Recalculates the athletes' progress rollups from every completed result"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period",
+            choices=RollupPeriod.values,
+            action="append",
+            help="Only rebuild this period. May be given more than once.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        for period in options["period"] or RollupPeriod.values:
+            written = rebuild_rollups(period, batch_size=options["batch_size"])
+            self.stdout.write(f"Wrote {written} {period} rollups.")
@@ -0,0 +1,89 @@
+"""
+The registry of measurement types a Test can record.
+
+Each measure model is registered with its forms once, when the app is ready,
+so a request resolves a Test's measurement type with a dictionary lookup
+rather than a query for its ContentType or an instance of the model.
+
+Entries are keyed by the ContentType's natural key, `app_label.model`, which
+a Test has without a query once `measurement_type` is loaded with
+`select_related()`, and which doesn't need the database when registering.
+"""
+
+from typing import NamedTuple, Type
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.forms import BaseFormSet, ModelForm
+
+
+class MeasurementType(NamedTuple):
+    model: Type[models.Model]
+    base_form: Type[ModelForm]
+    staff_form: Type[ModelForm]
+    athlete_form: Type[ModelForm]
+    bulk_formset: Type[BaseFormSet]
+
+
+_registry = {}
+
+
+def register(measurement_type: MeasurementType):
+    _registry[measurement_type.model._meta.label_lower] = measurement_type
+
+
+def get_measurement_type(content_type: ContentType) -> MeasurementType:
+    try:
+        return _registry[f"{content_type.app_label}.{content_type.model}"]
+    except KeyError:
+        raise LookupError(
+            f"{content_type.app_label}.{content_type.model} is not a "
+            f"registered measurement type"
+        )
+
+
+def register_measurement_types():
+    from store_project.tracking import forms
+    from store_project.tracking.models import (
+        DistanceMeasure,
+        DurationMeasure,
+        LoadMeasure,
+        PowerMeasure,
+    )
+
+    register(
+        MeasurementType(
+            LoadMeasure,
+            forms.LoadMeasureBaseForm,
+            forms.LoadMeasureStaffForm,
+            forms.LoadMeasureTestForm,
+            forms.LoadMeasureTestFormSet,
+        )
+    )
+    register(
+        MeasurementType(
+            PowerMeasure,
+            forms.PowerMeasureBaseForm,
+            forms.PowerMeasureStaffForm,
+            forms.PowerMeasureTestForm,
+            forms.PowerMeasureTestFormSet,
+        )
+    )
+    register(
+        MeasurementType(
+            DurationMeasure,
+            forms.DurationMeasureBaseForm,
+            forms.DurationMeasureStaffForm,
+            forms.DurationMeasureTestForm,
+            forms.DurationMeasureTestFormSet,
+        )
+    )
+    register(
+        MeasurementType(
+            DistanceMeasure,
+            forms.DistanceMeasureBaseForm,
+            forms.DistanceMeasureStaffForm,
+            forms.DistanceMeasureTestForm,
+            forms.DistanceMeasureTestFormSet,
+        )
+    )
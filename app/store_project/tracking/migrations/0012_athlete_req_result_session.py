@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-18 19:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('exercises', '0005_exercise_video_ids'),
+        ('tracking', '0011_alter_test_video'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Athlete',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Session',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Result',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('scheduled', models.DateTimeField(auto_now_add=True)),
+                ('completed', models.DateTimeField(default=None, null=True)),
+                ('reps', models.IntegerField(blank=True, help_text='Number of reps')),
+                ('weight', models.IntegerField(blank=True, help_text='Weight in grams')),
+                ('height', models.IntegerField(blank=True, help_text='Height in millimeters')),
+                ('distance', models.IntegerField(blank=True, help_text='Distance in millimeters')),
+                ('duration', models.DurationField(blank=True)),
+                ('notes', models.TextField(blank=True)),
+                ('athlete', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, to='tracking.athlete')),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='exercises.exercise')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Req',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('of_type', models.ForeignKey(default=None, limit_choices_to=models.Q(('model', 'loadmeasure'), ('model', 'powermeasure'), ('model', 'distancemeasure'), ('model', 'durationmeasure'), _connector='OR'), null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='Type of measurement')),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tracking.test')),
+            ],
+        ),
+    ]
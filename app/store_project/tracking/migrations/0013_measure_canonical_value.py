@@ -0,0 +1,78 @@
+# Generated by Django 3.2 on 2026-10-18 19:30
+
+from django.db import migrations, models
+
+
+# Copied from the models at the time of this migration
+UNIT_FACTORS = {
+    "loadmeasure": {"lb": 0.45359237, "kg": 1},
+    "powermeasure": {"W": 1},
+    "distancemeasure": {
+        "mi": 1609.344,
+        "m": 1,
+        "ft": 0.3048,
+        "in": 0.0254,
+        "yd": 0.9144,
+    },
+}
+
+
+def fill_canonical_values(apps, schema_editor):
+    for model_name, factors in UNIT_FACTORS.items():
+        model = apps.get_model("tracking", model_name)
+        for unit, factor in factors.items():
+            model.objects.filter(unit=unit).update(
+                canonical_value=models.F("value") * factor
+            )
+    DurationMeasure = apps.get_model("tracking", "DurationMeasure")
+    measures = list(DurationMeasure.objects.only("value"))
+    for measure in measures:
+        measure.canonical_value = measure.value.total_seconds()
+    DurationMeasure.objects.bulk_update(measures, ["canonical_value"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0012_athlete_req_result_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distancemeasure',
+            name='canonical_value',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='durationmeasure',
+            name='canonical_value',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='loadmeasure',
+            name='canonical_value',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='powermeasure',
+            name='canonical_value',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='distancemeasure',
+            index=models.Index(fields=['test', 'canonical_value'], name='tracking_distancemeasure_canon'),
+        ),
+        migrations.AddIndex(
+            model_name='durationmeasure',
+            index=models.Index(fields=['test', 'canonical_value'], name='tracking_durationmeasure_canon'),
+        ),
+        migrations.AddIndex(
+            model_name='loadmeasure',
+            index=models.Index(fields=['test', 'canonical_value'], name='tracking_loadmeasure_canon'),
+        ),
+        migrations.AddIndex(
+            model_name='powermeasure',
+            index=models.Index(fields=['test', 'canonical_value'], name='tracking_powermeasure_canon'),
+        ),
+        migrations.RunPython(fill_canonical_values, migrations.RunPython.noop),
+    ]
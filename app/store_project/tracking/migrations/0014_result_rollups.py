@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-18 19:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0005_exercise_video_ids'),
+        ('tracking', '0013_measure_canonical_value'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5)),
+                ('start', models.DateField(verbose_name='First day of the period')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('reps_total', models.FloatField(default=0)),
+                ('reps_max', models.FloatField(default=0)),
+                ('weight_total', models.FloatField(default=0)),
+                ('weight_max', models.FloatField(default=0)),
+                ('height_total', models.FloatField(default=0)),
+                ('height_max', models.FloatField(default=0)),
+                ('distance_total', models.FloatField(default=0)),
+                ('distance_max', models.FloatField(default=0)),
+                ('duration_total', models.FloatField(default=0)),
+                ('duration_max', models.FloatField(default=0)),
+                ('volume', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['athlete', 'exercise', 'completed'], name='tracking_result_progress'),
+        ),
+        migrations.AddField(
+            model_name='resultrollup',
+            name='athlete',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tracking.athlete'),
+        ),
+        migrations.AddField(
+            model_name='resultrollup',
+            name='exercise',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='exercises.exercise'),
+        ),
+        migrations.AddConstraint(
+            model_name='resultrollup',
+            constraint=models.UniqueConstraint(fields=('athlete', 'exercise', 'period', 'start'), name='tracking_rollup_unique'),
+        ),
+    ]
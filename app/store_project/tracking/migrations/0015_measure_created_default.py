@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 19:41
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0014_result_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='distancemeasure',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Time created'),
+        ),
+        migrations.AlterField(
+            model_name='durationmeasure',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Time created'),
+        ),
+        migrations.AlterField(
+            model_name='loadmeasure',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Time created'),
+        ),
+        migrations.AlterField(
+            model_name='powermeasure',
+            name='created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Time created'),
+        ),
+    ]
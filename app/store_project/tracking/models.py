@@ -3,6 +3,7 @@ import uuid
 from django.contrib.contenttypes.fields import ContentType
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from embed_video.fields import EmbedVideoField
@@ -25,6 +26,231 @@ class Category(models.Model):
         return self.name
 
 
+class Test(models.Model):
+    """
+    Fitness tests
+    """
+
+    name = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=200, unique=True)
+    description = models.TextField(null=True, default=None)
+    video = EmbedVideoField(blank=True, default=None)
+    measurement_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_("Type of measurement"),
+        null=True,
+        default=None,
+        limit_choices_to=models.Q(model="loadmeasure")
+        | models.Q(model="powermeasure")
+        | models.Q(model="distancemeasure")
+        | models.Q(model="durationmeasure"),
+    )
+    created = models.DateTimeField(_("Time created"), auto_now_add=True)
+    modified = models.DateTimeField(_("Time last modified"), auto_now=True)
+    author = models.ForeignKey(
+        User,
+        verbose_name=_("Person who added the test"),
+        null=True,
+        on_delete=models.SET_NULL,
+        limit_choices_to={"is_staff": True},
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_DEFAULT,
+        null=True,
+        default=None,
+    )
+
+    def __str__(self):
+        return f"{self.name}"
+
+    def get_absolute_url(self):
+        return reverse("tracking:test_detail", kwargs={"pk": self.pk})
+
+    @property
+    def measure_type(self):
+        """
+        The registered model and forms for `measurement_type`. Load the Test
+        with `select_related("measurement_type")` to avoid a query.
+        """
+        from .measurement_types import get_measurement_type
+
+        return get_measurement_type(self.measurement_type)
+
+    @property
+    def measure_model(self):
+        return self.measure_type.model
+
+    def get_measure_base_form_cls(self):
+        return self.measure_type.base_form
+
+    def get_measure_staff_form_cls(self):
+        return self.measure_type.staff_form
+
+    def get_measure_athlete_form_cls(self):
+        return self.measure_type.athlete_form
+
+    def get_measure_test_bulk_form_cls(self):
+        return self.measure_type.bulk_formset
+
+
+class Req(models.Model):
+    """
+    A test requirement
+    """
+
+    test = models.ForeignKey(Test, on_delete=models.CASCADE)
+
+    of_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_("Type of measurement"),
+        null=True,
+        default=None,
+        limit_choices_to=models.Q(model="loadmeasure")
+        | models.Q(model="powermeasure")
+        | models.Q(model="distancemeasure")
+        | models.Q(model="durationmeasure"),
+    )
+
+
+class AbstractMeasure(models.Model):
+    """
+    A point of performance occuring at a particular time and body
+    """
+
+    test = models.ForeignKey(Test, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
+    value = models.PositiveIntegerField(help_text="Whole number")
+    unit = models.CharField(max_length=3)
+    # `value` converted to CANONICAL_UNIT, so results recorded in different
+    # units can be compared in SQL
+    canonical_value = models.FloatField(null=True, editable=False)
+    # Not auto_now_add, so imported historical results keep their dates
+    created = models.DateTimeField(
+        _("Time created"), default=timezone.now, editable=False
+    )
+    modified = models.DateTimeField(_("Time last modified"), auto_now=True)
+
+    # The SI unit canonical_value is stored in
+    CANONICAL_UNIT = ""
+    # Whether a bigger value is a better result
+    HIGHER_IS_BETTER = True
+    # How many of CANONICAL_UNIT make one of each unit
+    UNIT_FACTORS = {}
+
+    class Meta:
+        abstract = True
+        indexes = [
+            models.Index(
+                fields=["test", "canonical_value"],
+                name="%(app_label)s_%(class)s_canon",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.canonical_value = self.to_canonical(self.value, self.unit)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "canonical_value"}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def to_canonical(cls, value, unit):
+        """
+        `value` in `unit` converted to CANONICAL_UNIT. Call it for rows written
+        with `bulk_create` or `update`, which skip `save()`.
+        """
+        if value is None:
+            return None
+        return value * cls.UNIT_FACTORS[unit]
+
+    def __str__(self):
+        return f"{self.test} for {self.user} - {self.value} {self.unit}"
+
+
+class UnitsOfLoad(models.TextChoices):
+    POUNDS = "lb", _("Pounds")
+    KILOS = "kg", _("Kilograms")
+
+
+class LoadMeasure(AbstractMeasure):
+    unit = models.CharField(max_length=2, choices=UnitsOfLoad.choices)
+
+    CANONICAL_UNIT = "kg"
+    UNIT_FACTORS = {
+        UnitsOfLoad.POUNDS: 0.45359237,
+        UnitsOfLoad.KILOS: 1,
+    }
+
+
+class UnitsOfPower(models.TextChoices):
+    WATTS = "W", _("Watts")
+
+
+class PowerMeasure(AbstractMeasure):
+    unit = models.CharField(max_length=2, choices=UnitsOfPower.choices)
+
+    CANONICAL_UNIT = "W"
+    UNIT_FACTORS = {
+        UnitsOfPower.WATTS: 1,
+    }
+
+
+class UnitsOfTime(models.TextChoices):
+    DURATION = "d", _("Duration")
+    SECONDS = "s", _("Seconds")
+    MICROSECONDS = "μs", _("Microseconds")
+
+
+class DurationMeasure(AbstractMeasure):
+    """A period of time"""
+
+    value = models.DurationField()
+    unit = models.CharField(
+        max_length=10,
+        choices=UnitsOfTime.choices,
+        default=UnitsOfTime.DURATION,
+    )
+
+    CANONICAL_UNIT = "s"
+    HIGHER_IS_BETTER = False
+
+    @classmethod
+    def to_canonical(cls, value, unit):
+        # The value is always a timedelta, whatever the unit says
+        if value is None:
+            return None
+        return value.total_seconds()
+
+
+class UnitsOfDistance(models.TextChoices):
+    MILES = "mi", _("Miles")
+    METERS = "m", _("Meters")
+    FEET = "ft", _("Feet")
+    INCHES = "in", _("Inches")
+    YARDS = "yd", _("Yards")
+
+
+class DistanceMeasure(AbstractMeasure):
+    """Distance traveled"""
+
+    unit = models.CharField(max_length=2, choices=UnitsOfDistance.choices)
+
+    CANONICAL_UNIT = "m"
+    UNIT_FACTORS = {
+        UnitsOfDistance.MILES: 1609.344,
+        UnitsOfDistance.METERS: 1,
+        UnitsOfDistance.FEET: 0.3048,
+        UnitsOfDistance.INCHES: 0.0254,
+        UnitsOfDistance.YARDS: 0.9144,
+    }
+
+
+MEASURE_MODELS = [LoadMeasure, PowerMeasure, DurationMeasure, DistanceMeasure]
+
+
 class Athlete(models.Model):
     """
     The person performing the tests
@@ -51,6 +277,59 @@ class Result(models.Model):
     duration = models.DurationField(blank=True)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["athlete", "exercise", "completed"],
+                name="tracking_result_progress",
+            ),
+        ]
+
+
+class RollupPeriod(models.TextChoices):
+    DAY = "day", _("Day")
+    WEEK = "week", _("Week")
+    MONTH = "month", _("Month")
+
+
+class ResultRollup(models.Model):
+    """
+    An athlete's completed results for an exercise, summed over a day, week
+    or month
+
+    Kept up to date as results are saved, so progress charts read a few rows
+    per period instead of every result. Durations are in seconds, and
+    `volume` is reps times weight.
+    """
+
+    athlete = models.ForeignKey("Athlete", on_delete=models.CASCADE)
+    exercise = models.ForeignKey("exercises.Exercise", on_delete=models.CASCADE)
+    period = models.CharField(max_length=5, choices=RollupPeriod.choices)
+    start = models.DateField(_("First day of the period"))
+    count = models.PositiveIntegerField(default=0)
+    reps_total = models.FloatField(default=0)
+    reps_max = models.FloatField(default=0)
+    weight_total = models.FloatField(default=0)
+    weight_max = models.FloatField(default=0)
+    height_total = models.FloatField(default=0)
+    height_max = models.FloatField(default=0)
+    distance_total = models.FloatField(default=0)
+    distance_max = models.FloatField(default=0)
+    duration_total = models.FloatField(default=0)
+    duration_max = models.FloatField(default=0)
+    volume = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["athlete", "exercise", "period", "start"],
+                name="tracking_rollup_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.athlete_id} {self.exercise_id} {self.period} of {self.start}"
+
 
 class Session(models.Model):
     """
@@ -0,0 +1,247 @@
+"""
+Athletes' progress on an exercise over time, from ResultRollup rows.
+
+Each completed Result is added to its day, week and month rollups as it's
+saved, so a chart over years of training reads one row per point instead of
+aggregating every result. An edited or deleted result can't be taken back
+out of a maximum, so the rollups it was in are recalculated from its
+period's results, which the (athlete, exercise, completed) index finds.
+"""
+
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Max, Sum, Value
+from django.db.models.functions import Greatest, Trunc
+from django.utils import timezone
+
+from store_project.tracking.models import Result, ResultRollup, RollupPeriod
+
+
+# Result fields summed in rollups, with the units they're stored in
+METRICS = {
+    "reps": "",
+    "weight": "g",
+    "height": "mm",
+    "distance": "mm",
+    "duration": "s",
+}
+
+
+def period_start(day: date, period) -> date:
+    if period == RollupPeriod.WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == RollupPeriod.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def period_end(start: date, period) -> date:
+    """The first day of the next period."""
+    if period == RollupPeriod.WEEK:
+        return start + timedelta(weeks=1)
+    if period == RollupPeriod.MONTH:
+        return (start + timedelta(days=31)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _result_values(result: Result) -> dict:
+    values = {metric: getattr(result, metric) or 0 for metric in METRICS}
+    if values["duration"]:
+        values["duration"] = values["duration"].total_seconds()
+    values["volume"] = values["reps"] * values["weight"]
+    return values
+
+
+def _aggregates() -> dict:
+    aggregates = {"count": Count("pk"), "volume": Sum(F("reps") * F("weight"))}
+    for metric in METRICS:
+        aggregates[f"{metric}_total"] = Sum(metric)
+        aggregates[f"{metric}_max"] = Max(metric)
+    return aggregates
+
+
+def _rollup_values(stats: dict) -> dict:
+    values = {}
+    for field, value in stats.items():
+        if isinstance(value, timedelta):
+            value = value.total_seconds()
+        values[field] = value or 0
+    return values
+
+
+def _rollup_keys(result: Result):
+    day = timezone.localdate(result.completed)
+    for period in RollupPeriod:
+        yield {
+            "athlete_id": result.athlete_id,
+            "exercise_id": result.exercise_id,
+            "period": period,
+            "start": period_start(day, period),
+        }
+
+
+def add_result(result: Result):
+    """Add a new completed `result` to its rollups."""
+    values = _result_values(result)
+    updates = {"count": F("count") + 1, "volume": F("volume") + values["volume"]}
+    for metric in METRICS:
+        updates[f"{metric}_total"] = F(f"{metric}_total") + values[metric]
+        updates[f"{metric}_max"] = Greatest(F(f"{metric}_max"), Value(values[metric]))
+    created = {"count": 1, "volume": values["volume"]}
+    for metric in METRICS:
+        created[f"{metric}_total"] = created[f"{metric}_max"] = values[metric]
+
+    for key in _rollup_keys(result):
+        if ResultRollup.objects.filter(**key).update(**updates):
+            continue
+        try:
+            with transaction.atomic():
+                ResultRollup.objects.create(**key, **created)
+        except IntegrityError:
+            # Another request created it first
+            ResultRollup.objects.filter(**key).update(**updates)
+
+
+def rebuild_rollup(athlete_id, exercise_id, period, start: date):
+    """Recalculate one rollup from its period's results."""
+    tz = timezone.get_current_timezone()
+    begin = timezone.make_aware(datetime.combine(start, time()), tz)
+    end = timezone.make_aware(datetime.combine(period_end(start, period), time()), tz)
+    stats = Result.objects.filter(
+        athlete_id=athlete_id,
+        exercise_id=exercise_id,
+        completed__gte=begin,
+        completed__lt=end,
+    ).aggregate(**_aggregates())
+    key = {
+        "athlete_id": athlete_id,
+        "exercise_id": exercise_id,
+        "period": period,
+        "start": start,
+    }
+    if not stats["count"]:
+        ResultRollup.objects.filter(**key).delete()
+        return
+    ResultRollup.objects.update_or_create(**key, defaults=_rollup_values(stats))
+
+
+def rebuild_rollups_of(results):
+    """
+    Recalculate the rollups that any of `results` count towards, once each,
+    e.g. after they're written without sending signals.
+    """
+    keys = {
+        tuple(key.values())
+        for result in results
+        if _counted(result)
+        for key in _rollup_keys(result)
+    }
+    for key in keys:
+        rebuild_rollup(*key)
+
+
+def rebuild_rollups(period, batch_size=1000):
+    """
+    Replace every rollup for `period` with ones aggregated from all completed
+    results. Returns how many were written.
+    """
+    grouped = (
+        Result.objects.filter(completed__isnull=False, athlete__isnull=False)
+        .annotate(start=Trunc("completed", period, output_field=DateField()))
+        .order_by()
+        .values("athlete_id", "exercise_id", "start")
+        .annotate(**_aggregates())
+    )
+    rows = grouped.iterator(chunk_size=batch_size)
+    count = 0
+    with transaction.atomic():
+        ResultRollup.objects.filter(period=period).delete()
+        # Only one batch of rollups is in memory at a time
+        while True:
+            rollups = [
+                ResultRollup(
+                    athlete_id=row.pop("athlete_id"),
+                    exercise_id=row.pop("exercise_id"),
+                    period=period,
+                    start=row.pop("start"),
+                    **_rollup_values(row),
+                )
+                for row in islice(rows, batch_size)
+            ]
+            if not rollups:
+                break
+            ResultRollup.objects.bulk_create(rollups)
+            count += len(rollups)
+    return count
+
+
+def progress(athlete_id, exercise_id, period, metric, start=None, end=None):
+    """
+    Points for a chart of `metric`: each period's `count` of results, `best`
+    and `mean` value, and training `volume`, oldest first.
+    """
+    rollups = ResultRollup.objects.filter(
+        athlete_id=athlete_id, exercise_id=exercise_id, period=period
+    )
+    if start:
+        rollups = rollups.filter(start__gte=period_start(start, period))
+    if end:
+        rollups = rollups.filter(start__lte=end)
+    return [
+        {
+            "start": rollup_start.isoformat(),
+            "count": count,
+            "best": best,
+            "mean": total / count,
+            "volume": volume,
+        }
+        for rollup_start, count, best, total, volume in rollups.order_by(
+            "start"
+        ).values_list("start", "count", f"{metric}_max", f"{metric}_total", "volume")
+    ]
+
+
+def _counted(result: Result) -> bool:
+    return result.completed is not None and result.athlete_id is not None
+
+
+def result_pre_save(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = None
+    if raw or instance._state.adding:
+        return
+    instance._rollup_previous = (
+        Result.objects.filter(pk=instance.pk)
+        .only("athlete", "exercise", "completed")
+        .first()
+    )
+
+
+def result_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_rollup_previous", None)
+    if created or previous is None:
+        if _counted(instance):
+            add_result(instance)
+        return
+    rebuild_rollups_of([previous, instance])
+
+
+def result_deleted(sender, instance, **kwargs):
+    rebuild_rollups_of([instance])
+
+
+def connect_signals():
+    from django.db.models.signals import post_delete, post_save, pre_save
+
+    pre_save.connect(
+        result_pre_save, sender=Result, dispatch_uid="progress_result_pre_save"
+    )
+    post_save.connect(
+        result_saved, sender=Result, dispatch_uid="progress_result_saved"
+    )
+    post_delete.connect(
+        result_deleted, sender=Result, dispatch_uid="progress_result_deleted"
+    )
@@ -0,0 +1,103 @@
+import csv
+from datetime import timedelta
+import io
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import Client
+
+from store_project.tracking.export import measures_export, stream_csv
+from store_project.tracking.factories import (
+    DurationMeasureFactory,
+    LoadMeasureFactory,
+    ResultFactory,
+    TestFactory,
+)
+from store_project.tracking.importer import ResultImporter, read_rows
+from store_project.tracking.models import (
+    DurationMeasure,
+    LoadMeasure,
+    Test,
+)
+from store_project.users.factories import SuperAdminFactory
+from store_project.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def load_test() -> Test:
+    return TestFactory(slug="deadlift")
+
+
+@pytest.fixture
+def coach() -> Client:
+    client = Client()
+    client.force_login(SuperAdminFactory())
+    return client
+
+
+def read_csv(response):
+    content = b"".join(response.streaming_content).decode()
+    return list(csv.reader(io.StringIO(content)))
+
+
+def test_export_test_results_as_csv(
+    coach: Client, load_test: Test, django_assert_max_num_queries
+):
+    LoadMeasureFactory.create_batch(3, test=load_test, value=100, unit="lb")
+
+    with django_assert_max_num_queries(4):
+        response = coach.get(f"/tracking/{load_test.pk}/export/")
+        rows = read_csv(response)
+
+    disposition = 'attachment; filename="deadlift-results.csv"'
+    assert response["Content-Disposition"] == disposition
+    assert rows[0] == ["test", "user", "value", "unit", "canonical_value_kg", "date"]
+    assert len(rows) == 4
+    assert rows[1][:4] == ["deadlift", rows[1][1], "100", "lb"]
+
+
+def test_athletes_export_their_own_results(user: User, load_test: Test):
+    LoadMeasureFactory(test=load_test, user=user)
+    LoadMeasureFactory(test=load_test)
+    client = Client()
+    client.force_login(user)
+
+    rows = read_csv(client.get(f"/tracking/{load_test.pk}/export/"))
+
+    assert [row[1] for row in rows[1:]] == [user.username]
+    assert client.get("/tracking/results/export/").status_code == 403
+
+
+def test_exported_csv_can_be_imported_again(load_test: Test):
+    LoadMeasureFactory(test=load_test, value=100, unit="lb")
+    duration_test = TestFactory(
+        measurement_type=ContentType.objects.get_for_model(DurationMeasure)
+    )
+    DurationMeasureFactory(test=duration_test, value=timedelta(minutes=6, seconds=5))
+
+    for test, model in [(load_test, LoadMeasure), (duration_test, DurationMeasure)]:
+        lines = "".join(stream_csv(measures_export(test))).encode()
+        report = ResultImporter().run(read_rows(io.BytesIO(lines), "csv"))
+        assert report.error_count == 0
+        first, second = model.objects.filter(test=test)
+        assert (first.value, first.unit, first.created) == (
+            second.value,
+            second.unit,
+            second.created,
+        )
+
+
+def test_export_exercise_results(coach: Client):
+    result = ResultFactory(duration=timedelta(seconds=90))
+    ResultFactory()
+
+    response = coach.get("/tracking/results/export/", {"athlete": result.athlete_id})
+    rows = read_csv(response)
+
+    assert len(rows) == 2
+    assert rows[1][:2] == [result.exercise.slug, str(result.athlete_id)]
+    assert rows[1][8] == "0:01:30"
+    assert coach.get("/tracking/results/export/", {"athlete": "x"}).status_code == 400
@@ -0,0 +1,201 @@
+from datetime import timedelta
+import io
+import json
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client
+
+from store_project.exercises.factories import ExerciseFactory
+from store_project.tracking import leaderboard
+from store_project.tracking.factories import AthleteFactory, TestFactory
+from store_project.tracking.importer import ResultImporter, read_rows
+from store_project.tracking.models import (
+    DurationMeasure,
+    LoadMeasure,
+    Result,
+    ResultRollup,
+    Test,
+)
+from store_project.users.factories import SuperAdminFactory, UserFactory
+from store_project.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def load_test() -> Test:
+    return TestFactory(slug="deadlift")
+
+
+def import_csv(text, **kwargs):
+    rows = read_rows(io.BytesIO(text.encode()), "csv")
+    return ResultImporter(**kwargs).run(rows)
+
+
+def test_import_measures_in_batches(
+    load_test: Test, django_assert_max_num_queries, django_capture_on_commit_callbacks
+):
+    UserFactory(username="ann")
+    UserFactory(username="bob")
+    lines = ["test,user,value,unit,date"]
+    lines += [f"deadlift,ann,{100 + i},kg,2021-01-{i + 1:02}" for i in range(10)]
+    lines += ["deadlift,bob,225,lbs,2021-02-01T09:30:00"]
+    assert leaderboard.summary(load_test)["count"] == 0
+
+    # Four lookups, then each batch in a transaction
+    with django_assert_max_num_queries(4 + 4 * 3), django_capture_on_commit_callbacks(
+        execute=True
+    ):
+        report = import_csv("\n".join(lines), batch_size=4)
+
+    assert report.created == {"LoadMeasure": 11}
+    assert report.error_count == 0
+    bob = LoadMeasure.objects.get(user__username="bob")
+    assert bob.unit == "lb"
+    assert bob.canonical_value == pytest.approx(102.0582833)
+    assert bob.created.isoformat() == "2021-02-01T09:30:00+00:00"
+    assert LoadMeasure.objects.filter(created__year=2021).count() == 11
+    assert leaderboard.summary(load_test)["count"] == 11
+
+
+def test_import_reports_bad_rows(load_test: Test):
+    UserFactory(username="ann")
+
+    report = import_csv(
+        "test,user,value,unit\n"
+        "deadlift,ann,100,kg\n"
+        "squat,ann,100,kg\n"
+        "deadlift,nobody,100,kg\n"
+        "deadlift,ann,heavy,kg\n"
+        "deadlift,ann,100,stone\n"
+        ",,,\n"
+    )
+
+    assert report.created == {"LoadMeasure": 1}
+    assert [line for line, _ in report.errors] == [3, 4, 5, 6, 7]
+    assert "Unknown test" in report.errors[0][1]
+    assert "should be one of lb, kg" in report.errors[3][1]
+    assert LoadMeasure.objects.count() == 1
+
+
+def test_dry_run_saves_nothing(load_test: Test):
+    UserFactory(username="ann")
+
+    report = import_csv("test,user,value,unit\ndeadlift,ann,100,kg\n", dry_run=True)
+
+    assert report.created == {"LoadMeasure": 1}
+    assert not LoadMeasure.objects.exists()
+
+
+def test_import_exercise_results_from_json_lines():
+    athlete = AthleteFactory()
+    ExerciseFactory(slug="back-squat")
+    running = ExerciseFactory(slug="run")
+    # Rollups the import doesn't touch aren't rebuilt
+    untouched = ResultRollup.objects.create(
+        athlete=AthleteFactory(), exercise=running, period="day", start="2022-08-01"
+    )
+    rows = [
+        {
+            "exercise": "back-squat",
+            "athlete": str(athlete.pk),
+            "completed": "2022-08-29",
+            "reps": 5,
+            "weight": "100 kg",
+        },
+        {
+            "exercise": "run",
+            "athlete": str(athlete.pk),
+            "completed": "2022-08-30",
+            "distance": "5 km",
+            "duration": "25:30",
+        },
+        {"exercise": "run", "athlete": "not-an-id"},
+    ]
+    data = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+
+    report = ResultImporter().run(read_rows(io.BytesIO(data.encode()), "jsonl"))
+
+    assert report.created == {"Result": 2}
+    assert [line for line, _ in report.errors] == [3, 4]
+    squat = Result.objects.get(exercise__slug="back-squat")
+    assert squat.weight == 100_000
+    run = Result.objects.get(exercise__slug="run")
+    assert run.distance == 5_000_000
+    assert run.duration == timedelta(minutes=25, seconds=30)
+    # Rollups are rebuilt, since bulk_create() sends no signals
+    assert ResultRollup.objects.filter(athlete=athlete, period="day").count() == 2
+    assert ResultRollup.objects.filter(pk=untouched.pk).exists()
+
+
+def test_unreadable_files_are_reported(load_test: Test):
+    UserFactory(username="ann")
+
+    latin1 = "test,user,value,unit\ndeadlift,ann,100,kg,Säge\n".encode("latin-1")
+    report = ResultImporter().run(read_rows(io.BytesIO(latin1), "csv"))
+    assert not report.created
+    assert report.errors[0][1].startswith("Not UTF-8 text, stopped reading")
+
+    report = import_csv("test,user,value,unit\ndeadlift,ann," + "1" * 200_000)
+    assert report.errors[0][1].startswith("Malformed CSV, stopped reading")
+
+    array = json.dumps([{"test": "deadlift", "user": "ann", "value": 100}])
+    report = ResultImporter().run(read_rows(io.BytesIO(array.encode()), "jsonl"))
+    assert report.errors == [
+        (1, "Expected JSON Lines, one object per line, not a JSON array")
+    ]
+
+
+def test_import_durations():
+    test = TestFactory(
+        slug="mile", measurement_type=ContentType.objects.get_for_model(DurationMeasure)
+    )
+    UserFactory(username="ann")
+
+    report = import_csv("test,user,value\nmile,ann,6:05\n")
+
+    assert report.error_count == 0
+    measure = DurationMeasure.objects.get(test=test)
+    assert measure.unit == "d"
+    assert measure.canonical_value == 365
+
+
+def test_import_command(load_test: Test, tmp_path):
+    UserFactory(username="ann")
+    path = tmp_path / "results.csv"
+    path.write_text("test,user,value,unit\ndeadlift,ann,100,kg\ndeadlift,bob,1,kg\n")
+    out = io.StringIO()
+
+    call_command("import_results", str(path), stdout=out)
+
+    assert "Line 3: Unknown user: 'bob'" in out.getvalue()
+    assert "Imported 1 LoadMeasure rows." in out.getvalue()
+    assert LoadMeasure.objects.count() == 1
+
+
+def test_import_view(load_test: Test, user: User):
+    UserFactory(username="ann")
+    upload = SimpleUploadedFile(
+        "results.csv", b"test,user,value,unit\ndeadlift,ann,100,kg\n"
+    )
+    client = Client()
+    client.force_login(user)
+    assert client.get("/tracking/import/").status_code == 403
+
+    client.force_login(SuperAdminFactory())
+    response = client.post("/tracking/import/", {"file": upload})
+
+    assert response.context["report"].created_count == 1
+    assert LoadMeasure.objects.count() == 1
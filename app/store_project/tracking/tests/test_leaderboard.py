@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import Client
+
+from store_project.tracking import leaderboard
+from store_project.tracking.factories import (
+    DurationMeasureFactory,
+    LoadMeasureFactory,
+    TestFactory,
+)
+from store_project.tracking.models import DurationMeasure, Test
+from store_project.users.factories import UserFactory
+from store_project.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def load_test() -> Test:
+    return TestFactory()
+
+
+def test_leaderboard_ranks_best_per_athlete(load_test: Test):
+    strong, average, weak = UserFactory.create_batch(3)
+    LoadMeasureFactory(test=load_test, user=strong, value=100, unit="kg")
+    LoadMeasureFactory(test=load_test, user=strong, value=80, unit="kg")
+    # 200 lb is about 90.7 kg
+    LoadMeasureFactory(test=load_test, user=average, value=200, unit="lb")
+    LoadMeasureFactory(test=load_test, user=weak, value=50, unit="kg")
+
+    rows = leaderboard.leaderboard(load_test)
+
+    assert [(row["user_id"], row["rank"]) for row in rows] == [
+        (strong.pk, 1),
+        (average.pk, 2),
+        (weak.pk, 3),
+    ]
+    assert [row["percentile"] for row in rows] == [100, 50, 0]
+    assert leaderboard.leaderboard(load_test, page=2, page_size=2)[0]["rank"] == 3
+
+
+def test_leaderboard_lower_is_better_for_durations():
+    test = TestFactory(
+        measurement_type=ContentType.objects.get_for_model(DurationMeasure)
+    )
+    fast = DurationMeasureFactory(test=test, value=timedelta(minutes=4))
+    DurationMeasureFactory(test=test, value=timedelta(minutes=6))
+
+    assert leaderboard.leaderboard(test)[0]["user_id"] == fast.user_id
+    assert leaderboard.percentile(test, 5 * 60) == 50
+
+
+def test_summary_is_recomputed_after_commit(
+    load_test: Test, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    LoadMeasureFactory(test=load_test, value=100)
+    assert leaderboard.summary(load_test)["count"] == 1
+    with django_assert_num_queries(0):
+        leaderboard.summary(load_test)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        measure = LoadMeasureFactory(test=load_test, value=50)
+    stats = leaderboard.summary(load_test)
+    assert stats["count"] == 2
+    assert stats["athletes"] == 2
+    assert stats["mean"] == 75
+    assert stats["stddev"] == 25
+    assert stats["minimum"] == 50
+
+    with django_capture_on_commit_callbacks(execute=True):
+        measure.delete()
+    assert leaderboard.summary(load_test)["count"] == 1
+
+
+def test_uncommitted_measures_keep_the_summary(
+    load_test: Test, django_capture_on_commit_callbacks
+):
+    LoadMeasureFactory(test=load_test, value=100)
+    assert leaderboard.summary(load_test)["count"] == 1
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        LoadMeasureFactory(test=load_test, value=50)
+
+    # Rolled back measures never reach the cached statistics
+    assert callbacks
+    assert leaderboard.summary(load_test)["count"] == 1
+
+
+def test_leaderboard_view_hides_other_athletes(user: User, load_test: Test):
+    LoadMeasureFactory(test=load_test, user=user, value=60)
+    LoadMeasureFactory(test=load_test, value=100)
+    client = Client()
+    client.force_login(user)
+
+    data = client.get(f"/tracking/{load_test.pk}/leaderboard/").json()
+
+    assert data["results"][0]["name"] is None
+    assert data["results"][1]["user_id"] == str(user.pk)
+    assert data["you"] == {"best": 60, "percentile": 0}
+    assert data["summary"]["count"] == 2
+
+
+def test_leaderboard_view_shows_your_best(user: User, load_test: Test):
+    for value in (60, 90, 70):
+        LoadMeasureFactory(test=load_test, user=user, value=value)
+    LoadMeasureFactory(test=load_test, value=80)
+    client = Client()
+    client.force_login(user)
+
+    data = client.get(f"/tracking/{load_test.pk}/leaderboard/").json()
+
+    # Better than the other athlete, who is half of those ranked
+    assert data["you"] == {"best": 90, "percentile": 50}
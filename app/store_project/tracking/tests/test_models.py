@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+
+from store_project.tracking.factories import (
+    DistanceMeasureFactory,
+    DurationMeasureFactory,
+    LoadMeasureFactory,
+    PowerMeasureFactory,
+    TestFactory,
+)
+from store_project.tracking.forms import DurationMeasureStaffForm, LoadMeasureStaffForm
+from store_project.tracking.models import (
+    DistanceMeasure,
+    DurationMeasure,
+    LoadMeasure,
+    Test,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    "factory, value, unit, canonical",
+    [
+        (LoadMeasureFactory, 100, "lb", 45.359237),
+        (LoadMeasureFactory, 100, "kg", 100),
+        (PowerMeasureFactory, 250, "W", 250),
+        (DistanceMeasureFactory, 2, "mi", 3218.688),
+        (DistanceMeasureFactory, 10, "ft", 3.048),
+        (DistanceMeasureFactory, 10, "in", 0.254),
+        (DistanceMeasureFactory, 10, "yd", 9.144),
+        (DurationMeasureFactory, timedelta(minutes=1, seconds=30), "d", 90),
+    ],
+)
+def test_canonical_value_on_save(factory, value, unit, canonical):
+    measure = factory(value=value, unit=unit)
+    measure.refresh_from_db()
+    assert measure.canonical_value == pytest.approx(canonical)
+
+
+def test_canonical_value_follows_unit_change():
+    measure = DistanceMeasureFactory(value=100, unit="m")
+    measure.unit = "yd"
+    measure.save(update_fields=["unit"])
+    measure.refresh_from_db()
+    assert measure.canonical_value == pytest.approx(91.44)
+
+
+def test_compare_across_units():
+    kilos = LoadMeasureFactory(value=50, unit="kg")
+    pounds = LoadMeasureFactory(test=kilos.test, value=100, unit="lb")
+
+    strongest = LoadMeasure.objects.filter(test=kilos.test).order_by(
+        "-canonical_value"
+    )
+
+    assert list(strongest) == [kilos, pounds]
+    assert DistanceMeasure.to_canonical(None, "m") is None
+
+
+@pytest.mark.parametrize(
+    "model, staff_form",
+    [
+        (LoadMeasure, LoadMeasureStaffForm),
+        (DurationMeasure, DurationMeasureStaffForm),
+    ],
+)
+def test_measurement_type_resolves_without_queries(
+    model, staff_form, django_assert_num_queries
+):
+    TestFactory(measurement_type=ContentType.objects.get_for_model(model))
+    test = Test.objects.select_related("measurement_type").get()
+
+    with django_assert_num_queries(0):
+        assert test.measure_model is model
+        assert test.get_measure_staff_form_cls() is staff_form
+        assert test.get_measure_test_bulk_form_cls().model is model
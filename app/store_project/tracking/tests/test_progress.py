@@ -0,0 +1,137 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from store_project.exercises.factories import ExerciseFactory
+from store_project.tracking.factories import AthleteFactory, ResultFactory
+from store_project.tracking.models import ResultRollup, RollupPeriod
+from store_project.users.factories import SuperAdminFactory
+from store_project.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def on(year, month, day):
+    return timezone.make_aware(datetime(year, month, day, 12))
+
+
+@pytest.fixture
+def athlete():
+    return AthleteFactory()
+
+
+@pytest.fixture
+def exercise():
+    return ExerciseFactory()
+
+
+def add(athlete, exercise, completed, **kwargs):
+    return ResultFactory(
+        athlete=athlete, exercise=exercise, completed=completed, **kwargs
+    )
+
+
+def rollups(period):
+    return list(
+        ResultRollup.objects.filter(period=period)
+        .order_by("start")
+        .values("start", "count", "weight_max", "weight_total", "volume")
+    )
+
+
+def test_results_are_rolled_up_as_they_are_saved(athlete, exercise):
+    # Monday and Wednesday of one week, then the next Monday
+    add(athlete, exercise, on(2022, 8, 29), weight=100)
+    add(athlete, exercise, on(2022, 8, 31), weight=120)
+    add(athlete, exercise, on(2022, 9, 5), weight=110)
+
+    assert rollups(RollupPeriod.WEEK) == [
+        {
+            "start": date(2022, 8, 29),
+            "count": 2,
+            "weight_max": 120,
+            "weight_total": 220,
+            "volume": 1100,
+        },
+        {
+            "start": date(2022, 9, 5),
+            "count": 1,
+            "weight_max": 110,
+            "weight_total": 110,
+            "volume": 550,
+        },
+    ]
+    assert [row["start"] for row in rollups(RollupPeriod.MONTH)] == [
+        date(2022, 8, 1),
+        date(2022, 9, 1),
+    ]
+    assert len(rollups(RollupPeriod.DAY)) == 3
+
+
+def test_unfinished_results_are_not_rolled_up(athlete, exercise):
+    result = ResultFactory(athlete=athlete, exercise=exercise, completed=None)
+    assert not ResultRollup.objects.exists()
+
+    result.completed = on(2022, 8, 29)
+    result.save()
+
+    assert rollups(RollupPeriod.DAY)[0]["count"] == 1
+
+
+def test_edits_and_deletes_recalculate_rollups(athlete, exercise):
+    best = add(athlete, exercise, on(2022, 8, 29), weight=200)
+    add(athlete, exercise, on(2022, 8, 30), weight=100)
+
+    best.completed = on(2022, 9, 5)
+    best.save()
+    weeks = rollups(RollupPeriod.WEEK)
+    assert [(row["start"], row["weight_max"]) for row in weeks] == [
+        (date(2022, 8, 29), 100),
+        (date(2022, 9, 5), 200),
+    ]
+
+    best.delete()
+    assert [row["start"] for row in rollups(RollupPeriod.WEEK)] == [date(2022, 8, 29)]
+
+
+def test_rebuild_matches_incremental_rollups(athlete, exercise):
+    start = on(2021, 1, 1)
+    for day in range(0, 400, 3):
+        ResultFactory(
+            athlete=athlete,
+            exercise=exercise,
+            completed=start + timedelta(days=day),
+            weight=100 + day,
+            duration=timedelta(seconds=day),
+        )
+    incremental = {period: rollups(period) for period in RollupPeriod}
+
+    # Small batches, so rollups are written across several of them
+    call_command("rebuild_result_rollups", "--batch-size", "7", stdout=StringIO())
+
+    assert {period: rollups(period) for period in RollupPeriod} == incremental
+
+
+def test_progress_view(athlete, exercise, user: User):
+    add(athlete, exercise, on(2022, 8, 29), weight=100)
+    add(athlete, exercise, on(2022, 8, 31), weight=120)
+    add(athlete, exercise, on(2022, 7, 1), weight=90)
+    url = f"/tracking/athletes/{athlete.pk}/exercises/{exercise.slug}/progress/"
+    client = Client()
+    client.force_login(user)
+    assert client.get(url).status_code == 403
+
+    client.force_login(SuperAdminFactory())
+    data = client.get(url, {"period": "week", "start": "2022-08-30"}).json()
+
+    assert data["unit"] == "g"
+    assert data["points"] == [
+        {"start": "2022-08-29", "count": 2, "best": 120, "mean": 110, "volume": 1100},
+    ]
+    assert client.get(url, {"period": "year"}).status_code == 400
+    assert client.get(url, {"metric": "notes"}).status_code == 400
@@ -0,0 +1,153 @@
+import pytest
+
+from django.core.cache import cache
+from django.test import Client
+
+from store_project.tracking import leaderboard
+from store_project.tracking.factories import LoadMeasureFactory, TestFactory
+from store_project.tracking.models import LoadMeasure, Test
+from store_project.tracking.views import RESULTS_PAGE_SIZE
+from store_project.users.factories import SuperAdminFactory, UserFactory
+from store_project.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def load_test() -> Test:
+    return TestFactory()
+
+
+@pytest.fixture
+def coach() -> Client:
+    client = Client()
+    client.force_login(SuperAdminFactory())
+    return client
+
+
+def bulk_data(*rows):
+    data = {"results-TOTAL_FORMS": len(rows), "results-INITIAL_FORMS": 0}
+    for i, (user, value, unit) in enumerate(rows):
+        data[f"results-{i}-user"] = user
+        data[f"results-{i}-value"] = value
+        data[f"results-{i}-unit"] = unit
+    return data
+
+
+def test_detail_resolves_measurement_type_in_one_query(
+    coach: Client, load_test: Test, django_assert_num_queries
+):
+    LoadMeasureFactory.create_batch(3, test=load_test)
+
+    # User, test with its measurement type, count, results
+    with django_assert_num_queries(4):
+        response = coach.get(f"/tracking/{load_test.pk}/")
+
+    assert len(response.context["page_obj"]) == 3
+
+
+def test_bulk_page_shows_one_page_of_results(coach: Client, load_test: Test):
+    LoadMeasureFactory.create_batch(RESULTS_PAGE_SIZE + 1, test=load_test)
+
+    response = coach.get(f"/tracking/{load_test.pk}/results/bulk/")
+
+    assert len(response.context["test_results"]) == RESULTS_PAGE_SIZE
+    assert response.context["page_obj"].has_next()
+
+
+def test_bulk_formset_saves_every_row(
+    coach: Client, load_test: Test, django_capture_on_commit_callbacks
+):
+    first, second = UserFactory.create_batch(2)
+    LoadMeasureFactory(test=load_test, value=10, unit="kg")
+    assert leaderboard.summary(load_test)["count"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = coach.post(
+            f"/tracking/{load_test.pk}/results/bulk/",
+            bulk_data((first.pk, 100, "kg"), (second.pk, 200, "lb"), ("", "", "")),
+        )
+
+    assert response.status_code == 200
+    assert response.content.decode().count("<tr>") == 2
+    measures = LoadMeasure.objects.filter(test=load_test, user__in=[first, second])
+    assert sorted(measures.values_list("canonical_value", flat=True)) == [
+        pytest.approx(90.718474),
+        100,
+    ]
+    assert leaderboard.summary(load_test)["count"] == 3
+
+
+def test_bulk_formset_saves_nothing_if_a_row_is_invalid(coach: Client, load_test: Test):
+    athlete = UserFactory()
+
+    response = coach.post(
+        f"/tracking/{load_test.pk}/results/bulk/",
+        bulk_data((athlete.pk, 100, "kg"), (athlete.pk, 100, "stone")),
+    )
+
+    assert response.headers["HX-Retarget"] == "#resultforms"
+    assert "Select a valid choice" in response.content.decode()
+    assert not LoadMeasure.objects.exists()
+
+
+def test_bulk_csv_paste(coach: Client, load_test: Test):
+    UserFactory(username="ann")
+    UserFactory(username="bob")
+
+    response = coach.post(
+        f"/tracking/{load_test.pk}/results/bulk/",
+        {"pasted": "ann, 100, kg\n\nbob,150,lb\n"},
+    )
+
+    assert response.status_code == 200
+    assert sorted(
+        LoadMeasure.objects.values_list("user__username", "value", "unit")
+    ) == [("ann", 100, "kg"), ("bob", 150, "lb")]
+
+
+def test_bulk_csv_paste_rejects_unknown_users(coach: Client, load_test: Test):
+    UserFactory(username="ann")
+
+    response = coach.post(
+        f"/tracking/{load_test.pk}/results/bulk/",
+        {"pasted": "ann,100,kg\nnobody,100,kg"},
+    )
+
+    assert "Unknown usernames: nobody" in response.content.decode()
+    assert not LoadMeasure.objects.exists()
+
+
+def test_bulk_csv_paste_rejects_malformed_lines(coach: Client, load_test: Test):
+    response = coach.post(
+        f"/tracking/{load_test.pk}/results/bulk/", {"pasted": "ann,100"}
+    )
+
+    assert "Line 1 should be" in response.content.decode()
+
+
+def test_bulk_is_for_coaches_only(user: User, load_test: Test):
+    client = Client()
+    client.force_login(user)
+
+    response = client.post(
+        f"/tracking/{load_test.pk}/results/bulk/",
+        bulk_data((user.pk, 100, "kg")),
+    )
+
+    assert response.status_code == 302
+    assert not LoadMeasure.objects.exists()
+
+
+def test_bulk_page_shows_blank_rows(coach: Client, load_test: Test):
+    response = coach.get(f"/tracking/{load_test.pk}/results/bulk/")
+
+    assert response.status_code == 200
+    assert response.context["formset"].total_form_count() == 10
@@ -7,6 +7,19 @@ app_name = "tracking"
 urlpatterns = [
     path("", views.test_list, name="test_list"),
     path("<int:pk>/", views.test_detail, name="test_detail"),
+    path("<int:pk>/export/", views.test_export_csv, name="test_export_csv"),
+    path("import/", views.import_results, name="import_results"),
+    path("results/export/", views.results_export_csv, name="results_export_csv"),
+    path(
+        "athletes/<uuid:athlete_id>/exercises/<slug:slug>/progress/",
+        views.athlete_progress,
+        name="athlete_progress",
+    ),
+    path(
+        "<int:pk>/leaderboard/",
+        views.test_leaderboard,
+        name="test_leaderboard",
+    ),
     path(
         "<int:pk>/results/add/",
         views.test_result_create,
@@ -1,9 +1,37 @@
+from datetime import date
+import uuid
+
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse
-from django.shortcuts import redirect, render
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_GET
+
+from store_project.exercises.models import Exercise
+from store_project.tracking import export, leaderboard, progress
+from store_project.tracking.forms import (
+    BulkResultsCSVForm,
+    ResultImportForm,
+)
+from store_project.tracking.importer import ResultImporter, guess_format, read_rows
+from store_project.tracking.models import Athlete, RollupPeriod, Test
+
+
+RESULTS_PAGE_SIZE = 50
+BULK_RESULTS_PREFIX = "results"
 
-from store_project.tracking.models import Test
+
+def get_test(pk):
+    """The Test, with what's needed to resolve its measurement type."""
+    return get_object_or_404(Test.objects.select_related("measurement_type"), pk=pk)
 
 
 def test_list(request):
@@ -13,22 +41,174 @@ def test_list(request):
     return render(request, "tracking/test_list.html", context)
 
 
+def results_page(request, test):
+    """The requested page of results for `test`, only the user's own unless staff."""
+    test_results = test.measure_model.objects.filter(test=test)
+    if not request.user.is_staff:
+        test_results = test_results.filter(user=request.user)
+    test_results = test_results.select_related("user").order_by("-created")
+    return Paginator(test_results, RESULTS_PAGE_SIZE).get_page(request.GET.get("page"))
+
+
 @login_required
 def test_detail(request, pk):
-    test = Test.objects.get(pk=pk)
-    user = request.user
-    if user.is_staff:
-        test_results = test.measurement_type.model_class().objects.filter(test=test)
-    else:
-        test_results = test.measurement_type.model_class().objects.filter(test=test, user=user)
+    test = get_test(pk)
+    page = results_page(request, test)
 
     context = {
         "test": test,
-        "test_results": test_results,
+        "test_results": page,
+        "page_obj": page,
     }
     return render(request, "tracking/test_detail.html", context)
 
 
+@login_required
+@require_GET
+def test_leaderboard(request, pk):
+    """
+    One page of the athletes' best results for a test, ranked, with summary
+    statistics. Only coaches see other athletes' names.
+    """
+    test = get_test(pk)
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+
+    rows = leaderboard.leaderboard(test, page=page)
+    if not request.user.is_staff:
+        for row in rows:
+            if row["user_id"] != request.user.pk:
+                row["user_id"] = row["name"] = None
+
+    data = {
+        "test": test.name,
+        "unit": test.measure_model.CANONICAL_UNIT,
+        "page": page,
+        "results": rows,
+        "summary": leaderboard.summary(test),
+    }
+    # No ordering, which would be added to the GROUP BY
+    best = next(
+        iter(
+            leaderboard.athlete_bests(test)
+            .filter(user=request.user)
+            .order_by()
+            .values_list("best", flat=True)
+        ),
+        None,
+    )
+    if best is not None:
+        data["you"] = {
+            "best": best,
+            "percentile": leaderboard.percentile(test, best),
+        }
+    return JsonResponse(data)
+
+
+def _csv_response(result_export):
+    return StreamingHttpResponse(
+        export.stream_csv(result_export),
+        content_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{result_export.filename}.csv"'
+        },
+    )
+
+
+@login_required
+@require_GET
+def test_export_csv(request, pk):
+    """A test's results as CSV. Athletes only get their own."""
+    test = get_test(pk)
+    user = None if request.user.is_staff else request.user
+    return _csv_response(export.measures_export(test, user=user))
+
+
+@login_required
+@require_GET
+def results_export_csv(request):
+    """Every exercise result as CSV, or one athlete's with `?athlete=<id>`."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    athlete_id = request.GET.get("athlete")
+    if athlete_id:
+        try:
+            athlete_id = uuid.UUID(athlete_id)
+        except ValueError:
+            return HttpResponseBadRequest("athlete must be an athlete's ID")
+    return _csv_response(export.results_export(athlete_id=athlete_id or None))
+
+
+@login_required
+def import_results(request):
+    """
+    Lets a coach upload a spreadsheet of historical results. Very large files
+    are better imported with the import_results command.
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied
+    form = ResultImportForm(request.POST or None, request.FILES or None)
+    report = None
+    if request.method == "POST" and form.is_valid():
+        upload = form.cleaned_data["file"]
+        format = form.cleaned_data["format"] or guess_format(upload.name)
+        report = ResultImporter(dry_run=form.cleaned_data["dry_run"]).run(
+            read_rows(upload, format)
+        )
+
+    context = {
+        "form": form,
+        "report": report,
+        "dry_run": form.is_bound and form.cleaned_data.get("dry_run"),
+    }
+    return render(request, "tracking/import_results.html", context)
+
+
+@login_required
+@require_GET
+def athlete_progress(request, athlete_id, slug):
+    """
+    An athlete's results for an exercise as chart points, one per `period`,
+    for coaches. `metric` picks which Result field `best` and `mean` are of,
+    and `start` and `end` are optional ISO dates.
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied
+    athlete = get_object_or_404(Athlete, pk=athlete_id)
+    exercise = get_object_or_404(Exercise.objects.only("pk", "slug"), slug=slug)
+
+    period = request.GET.get("period", RollupPeriod.WEEK)
+    if period not in RollupPeriod.values:
+        return HttpResponseBadRequest("period must be day, week or month")
+    metric = request.GET.get("metric", "weight")
+    if metric not in progress.METRICS:
+        return HttpResponseBadRequest(
+            f"metric must be one of {', '.join(progress.METRICS)}"
+        )
+    try:
+        start, end = (
+            date.fromisoformat(request.GET[name]) if request.GET.get(name) else None
+            for name in ("start", "end")
+        )
+    except ValueError:
+        return HttpResponseBadRequest("start and end must be dates, YYYY-MM-DD")
+
+    return JsonResponse(
+        {
+            "athlete": athlete.pk,
+            "exercise": exercise.slug,
+            "period": period,
+            "metric": metric,
+            "unit": progress.METRICS[metric],
+            "points": progress.progress(
+                athlete.pk, exercise.pk, period, metric, start=start, end=end
+            ),
+        }
+    )
+
+
 @login_required
 def test_result_create(request, pk):
     """
@@ -38,7 +218,7 @@ def test_result_create(request, pk):
 
     The test is given, so should be hidden from user.
     """
-    test = Test.objects.get(pk=pk)
+    test = get_test(pk)
 
     if request.method == "POST":
         if request.user.is_staff:
@@ -70,36 +250,66 @@ def test_result_create(request, pk):
 
 @login_required
 def test_result_bulk(request, pk):
-    """Allows a coach to bulk add results for a single test"""
-    test = Test.objects.get(pk=pk)
+    """
+    Allows a coach to add many results for a single test at once, entered in
+    a formset or pasted as CSV. Every row is validated before any are saved,
+    then they're inserted together and returned as table rows.
+    """
+    test = get_test(pk)
     if not request.user.is_staff:
-        messages.error("Only coaches have access to bulk add test results")
+        messages.error(request, "Only coaches have access to bulk add test results")
         return redirect(test)
 
-    test_results = test.measurement_type.model_class().objects.filter(test=test)
-    form = test.get_measure_staff_form_cls()(request.POST or None)
+    model = test.measure_model
+    FormSet = test.get_measure_test_bulk_form_cls()
+    csv_form = BulkResultsCSVForm(request.POST if "pasted" in request.POST else None)
+    formset = FormSet(
+        instance=test, queryset=model.objects.none(), prefix=BULK_RESULTS_PREFIX
+    )
 
     if request.method == "POST":
-        if form.is_valid():
-            result = form.save(commit=False)
-            result.test = test
-            result.save()
-            return render(
-                request,
-                "tracking/partials/result_row.html",
-                context={"result": result},
-            )
+        if csv_form.is_bound:
+            data = csv_form.formset_data(BULK_RESULTS_PREFIX) if csv_form.is_valid() else None
         else:
-            return render(
-                request,
-                "tracking/partials/result_form.html",
-                context={"form": form},
+            data = request.POST
+        if data is not None:
+            formset = FormSet(
+                data,
+                instance=test,
+                queryset=model.objects.none(),
+                prefix=BULK_RESULTS_PREFIX,
             )
+            if formset.is_valid():
+                results = formset.save(commit=False)
+                # bulk_create() skips save() and the post_save signals
+                for result in results:
+                    result.canonical_value = model.to_canonical(result.value, result.unit)
+                with transaction.atomic():
+                    model.objects.bulk_create(results)
+                leaderboard.invalidate_summary(test)
+                return render(
+                    request,
+                    "tracking/partials/result_rows.html",
+                    context={"results": results},
+                )
+
+        response = render(
+            request,
+            "tracking/partials/result_formset.html",
+            context={"test": test, "formset": formset, "csv_form": csv_form},
+        )
+        # Show the errors in place of the forms rather than in the table
+        response["HX-Retarget"] = "#resultforms"
+        response["HX-Reswap"] = "innerHTML"
+        return response
 
+    page = results_page(request, test)
     context = {
         "test": test,
-        "test_results": test_results,
-        "form": form,
+        "test_results": page,
+        "page_obj": page,
+        "formset": formset,
+        "csv_form": csv_form,
     }
     return render(
         request,
@@ -109,7 +319,7 @@ def test_result_bulk(request, pk):
 
 
 def result_create_form(request, pk):
-    test = Test.objects.get(pk=pk)
+    test = get_test(pk)
     form = test.get_measure_staff_form_cls()()
 
     context = {